@@ -7,11 +7,18 @@ Usage:
     python main.py generate             # Generate one story now
     python main.py generate --post      # Generate one post now
     python main.py generate --series    # Generate story series (3-7 connected stories)
+    python main.py generate --series --profile preview  # Fast low-res series check
     python main.py stats                # Show system statistics
+    python main.py transcode-music      # Pre-transcode music library to AAC
+    python main.py prepare-photos       # Pre-build story-sized photo derivatives
+    python main.py probe-library        # Probe durations/streams of the music library
+    python main.py probe-library --loudness  # ... and measure track loudness
+    python main.py worker               # Render queued series (RENDER_QUEUE=true)
     python main.py test                 # Run integration test
 """
 
 import sys
+import socket
 import asyncio
 import logging
 import argparse
@@ -28,7 +35,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 load_dotenv(PROJECT_ROOT / ".env")
 
 from src.orchestrator import Orchestrator
-from src.modules.video_composer import VideoConfig
+from src.modules.video_composer import VideoConfig, RENDER_PROFILES
 from src.modules.telegram_bot import ModerationBot
 from src.scheduler import ContentScheduler, create_default_scheduler
 
@@ -63,15 +70,32 @@ def create_orchestrator(
         output_dir=PROJECT_ROOT / "output",
         history_path=PROJECT_ROOT / "data" / "content_history.json",
         fonts_dir=PROJECT_ROOT / "assets" / "fonts",
-        video_config=VideoConfig(
-            duration=int(os.getenv("STORY_DURATION_SECONDS", "15")),
-            preset="medium",
+        render_cache_dir=PROJECT_ROOT / "data" / "render_cache",
+        render_metrics_path=PROJECT_ROOT / "data" / "render_metrics.jsonl",
+        photo_store_dir=PROJECT_ROOT / "data" / "photo_store",
+        media_probe_path=PROJECT_ROOT / "data" / "media_probe.json",
+        ffmpeg_capabilities_path=PROJECT_ROOT / "data" / "ffmpeg_capabilities.json",
+        music_cache_dir=(
+            PROJECT_ROOT / "data" / "music_cache"
+            if os.getenv("MUSIC_CACHE", "false").lower() == "true" else None
         ),
+        render_queue_path=(
+            PROJECT_ROOT / "data" / "render_queue.db"
+            if os.getenv("RENDER_QUEUE", "false").lower() == "true" else None
+        ),
+        photo_store_max_mb=int(os.getenv("PHOTO_STORE_MAX_MB", "1024")),
+        render_cache_max_mb=int(os.getenv("RENDER_CACHE_MAX_MB", "2048")),
+        video_config=VideoConfig.from_env(),
         subtopic_cooldown_days=int(os.getenv("SUBTOPIC_COOLDOWN_DAYS", "7")),
         photo_cooldown_days=int(os.getenv("PHOTO_COOLDOWN_DAYS", "30")),
         music_cooldown_days=int(os.getenv("MUSIC_COOLDOWN_DAYS", "14")),
         use_image_search=False,
         use_text_overlay=use_text_overlay,
+        preload_fonts=os.getenv("FONT_PRELOAD", "false").lower() == "true",
+        prerender=os.getenv("RENDER_PRERENDER", "false").lower() == "true",
+        cpu_cores=int(os.getenv("RENDER_CPU_CORES", "0")) or None,
+        cpu_pin=os.getenv("RENDER_CPU_PIN", "false").lower() == "true",
+        render_niceness=int(os.getenv("RENDER_NICENESS", "0")),
     )
 
 
@@ -98,12 +122,13 @@ def create_telegram_bot(orchestrator: Orchestrator) -> ModerationBot:
 
     async def on_reject(content_id: str):
         logger.info(f"Content rejected via Telegram: {content_id}")
+        orchestrator.cancel_prerender(content_id)
         for pub in orchestrator.history.publications:
             if pub.subtopic in content_id:
                 orchestrator.reject_content(pub)
                 break
 
-    async def on_finish_moderation(content_id: str, approved_stories: list, prepared_result):
+    async def on_finish_moderation(content_id: str, approved_stories: list, prepared_result, progress_callback=None):
         """Called when moderation is finished - render videos and send to moderator."""
         logger.info(f"Moderation finished for {content_id}: {len(approved_stories)} stories approved")
 
@@ -111,30 +136,20 @@ def create_telegram_bot(orchestrator: Orchestrator) -> ModerationBot:
             logger.warning("No approved stories to render")
             return
 
-        # Render videos for approved stories only
-        result = orchestrator.render_approved_stories(prepared_result, approved_stories)
-
-        if result and result.success:
-            logger.info(f"Rendered {result.story_count} videos for {result.topic.subtopic}")
+        # Render workers pick the series up; results are delivered by deliver_render_results
+        if orchestrator.render_queue:
+            job_id = await orchestrator.enqueue_render(prepared_result, approved_stories, content_id)
+            logger.info(f"Series {content_id} queued for rendering (job {job_id})")
+            return
 
-            # Send videos to moderator for manual Instagram publishing
-            if bot_ref[0]:
-                await bot_ref[0].send_videos_for_manual_publish(
-                    subtopic=result.topic.subtopic,
-                    story_count=result.story_count,
-                    video_paths=result.video_paths,
-                )
-        else:
-            logger.error(f"Failed to render videos for {content_id}")
-            # Notify about failure
-            if bot_ref[0] and bot_ref[0].app:
-                try:
-                    await bot_ref[0].app.bot.send_message(
-                        chat_id=int(chat_id),
-                        text=f"❌ ОШИБКА РЕНДЕРИНГА\n\nНе удалось отрендерить видео для: {content_id}"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send error notification: {e}")
+        # Render videos for approved stories only
+        # Async render: FFmpeg runs as asyncio subprocesses, the bot stays responsive
+        result = await orchestrator.render_approved_stories_async(
+            prepared_result, approved_stories, content_id=content_id,
+            progress_callback=progress_callback,
+        )
+        if bot_ref[0]:
+            await send_series_result(bot_ref[0], content_id, result)
 
     bot = ModerationBot(
         token=token,
@@ -142,6 +157,7 @@ def create_telegram_bot(orchestrator: Orchestrator) -> ModerationBot:
         on_approve=on_approve,
         on_reject=on_reject,
         on_finish_moderation=on_finish_moderation,
+        photo_store=orchestrator.photo_store,
     )
 
     # Store bot reference for use in callback
@@ -150,6 +166,49 @@ def create_telegram_bot(orchestrator: Orchestrator) -> ModerationBot:
     return bot
 
 
+async def send_series_result(bot: ModerationBot, content_id: str, result) -> None:
+    """Send rendered videos to the moderator, or a failure notice."""
+    if result and result.success:
+        logger.info(f"Rendered {result.story_count} videos for {result.topic.subtopic}")
+
+        # Send videos to moderator for manual Instagram publishing
+        await bot.send_videos_for_manual_publish(
+            subtopic=result.topic.subtopic,
+            story_count=result.story_count,
+            video_paths=result.video_paths,
+            reel_path=result.reel_path,
+        )
+        return
+
+    logger.error(f"Failed to render videos for {content_id}")
+    # Notify about failure
+    if bot.app:
+        try:
+            await bot.app.bot.send_message(
+                chat_id=bot.moderator_chat_id,
+                text=f"❌ ОШИБКА РЕНДЕРИНГА\n\nНе удалось отрендерить видео для: {content_id}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to send error notification: {e}")
+
+
+async def deliver_render_results(orchestrator: Orchestrator, bot: ModerationBot, poll_interval: float = 10):
+    """Send series finished by render workers to the moderator (runs with the bot)."""
+    queue = orchestrator.render_queue
+    while True:
+        try:
+            for job in await asyncio.to_thread(queue.finished):
+                # Taken before recording: a crash below must not record the series twice
+                if not await asyncio.to_thread(queue.start_delivery, job.id):
+                    continue
+                result = await asyncio.to_thread(orchestrator.record_queued_result, job)
+                await send_series_result(bot, job.content_id, result)
+                await asyncio.to_thread(queue.mark_delivered, job.id)
+        except Exception as e:
+            logger.error(f"Render result delivery failed: {e}")
+        await asyncio.sleep(poll_interval)
+
+
 def cmd_generate(args):
     """Generate content now."""
     setup_logging(os.getenv("LOG_LEVEL", "INFO"))
@@ -233,6 +292,7 @@ def cmd_generate(args):
                 motion_effects=not args.static,
                 min_count=getattr(args, "min_stories", 3),
                 max_count=getattr(args, "max_stories", 7),
+                profile=getattr(args, "profile", "final"),
             )
             if result and result.success:
                 print(f"\n{'=' * 60}")
@@ -313,11 +373,178 @@ def cmd_stats(args):
     for status, count in stats['history'].get('by_status', {}).items():
         print(f"    - {status}: {count}")
 
+    if stats['render_queue']:
+        print("\nRender queue:")
+        for status, count in stats['render_queue'].items():
+            print(f"    - {status}: {count}")
+
+    cpu = stats['cpu']
+    print("\nRender CPU budget:")
+    extras = (", pinned" if cpu['pinned'] else "") + (f", nice +{cpu['niceness']}" if cpu['niceness'] else "")
+    print(f"  {cpu['total_cores']} cores, {cpu['max_jobs']} concurrent jobs{extras}")
+    for slot in cpu['slots']:
+        cores = f" on cores {','.join(map(str, slot['cores']))}" if slot['cores'] else ""
+        label = "background" if slot['priority'] == "background" else f"job {slot['slot'] + 1}"
+        print(f"    - {label}: {slot['threads']} threads{cores}")
+    for priority, waits in cpu['waits_by_priority'].items():
+        print(f"  {priority} waits: {waits['waits']} ({waits['wait_seconds']}s total, "
+              f"longest {waits['max_wait_seconds']}s, {waits['waiting']} waiting now)")
+
+    ffmpeg = stats['ffmpeg']
+    print("\nFFmpeg:")
+    print(f"  {ffmpeg['version']}: {ffmpeg['encoders']} encoders, {ffmpeg['filters']} filters")
+    print(f"  ffprobe: {ffmpeg['ffprobe_path'] or 'not found (probing via ffmpeg)'}")
+    print(f"  Motion engine: {ffmpeg['motion_engine']}")
+
+    probe = stats['media_probe']
+    print("\nMedia probe cache:")
+    print(f"  Entries: {probe['entries']} ({probe['backend']}), loudness measured: {probe['loudness']}")
+
+    fonts = stats['fonts']
+    print("\nFonts (this process):")
+    print(f"  Loaded: {fonts['pil_loads']} PIL, {fonts['imagetext_loads']} imagetext in {fonts['load_seconds']:.2f}s")
+    print(f"  Reused: {fonts['hits']} times, failed: {fonts['failures']}")
+
     print("\n" + "=" * 60)
 
     orchestrator.close()
 
 
+def cmd_transcode_music(args):
+    """Transcode every music track to AAC once (stream-copied during renders)."""
+    setup_logging(os.getenv("LOG_LEVEL", "INFO"))
+
+    orchestrator = create_orchestrator()
+    if not orchestrator.music_cache:
+        print("Music cache is disabled (MUSIC_CACHE=false)")
+        orchestrator.close()
+        return
+
+    tracks = [t.path for t in orchestrator.media_manager.get_music_files()]
+    print(f"Transcoding {len(tracks)} tracks to {orchestrator.music_cache.cache_dir}...")
+    # Normalisation gain is baked into the derivatives (offline: measures loudness of new tracks)
+    composer = orchestrator.video_composer
+    ready = orchestrator.music_cache.transcode_all(
+        tracks, gain_db=lambda track: composer.music_gain_db(track, analyze=True),
+    )
+    removed = orchestrator.music_cache.prune(tracks)
+
+    print(f"Ready: {ready}/{len(tracks)} tracks")
+    if removed:
+        print(f"Removed {removed} stale derivatives")
+
+    orchestrator.close()
+
+
+def cmd_prepare_photos(args):
+    """Create story-sized derivatives of every library photo."""
+    setup_logging(os.getenv("LOG_LEVEL", "INFO"))
+
+    orchestrator = create_orchestrator()
+    if not orchestrator.photo_store:
+        print("Photo store is disabled")
+        orchestrator.close()
+        return
+
+    photos = [p.path for p in orchestrator.media_manager.get_photo_files()]
+    fits = ("cover", "contain") if args.static else ("cover",)
+    print(f"Preparing {len(photos)} photos in {orchestrator.photo_store.store_dir}...")
+    ready = orchestrator.photo_store.build_all(photos, fits=fits, max_workers=args.workers)
+
+    stats = orchestrator.photo_store.get_stats()
+    print(f"Ready: {ready}/{len(photos) * len(fits)} derivatives ({stats['size_mb']} MB)")
+
+    orchestrator.close()
+
+
+def cmd_probe_library(args):
+    """Probe every music track once (durations and loudness are then read from data/media_probe.json)."""
+    setup_logging(os.getenv("LOG_LEVEL", "INFO"))
+
+    orchestrator = create_orchestrator()
+    probe = orchestrator.media_probe
+
+    tracks = [t.path for t in orchestrator.media_manager.get_music_files()]
+    print(f"Probing {len(tracks)} tracks{' (with loudness)' if args.loudness else ''}...")
+    ready = probe.probe_all(tracks, max_workers=args.workers, loudness=args.loudness)
+    removed = probe.prune(tracks)
+
+    print(f"Ready: {ready}/{len(tracks)} tracks")
+    if removed:
+        print(f"Removed {removed} stale entries")
+    if args.verbose:
+        for track in tracks:
+            info = probe.get(track)
+            if not info:
+                print(f"  {track.name}: unreadable")
+                continue
+            audio = info.audio
+            layout = f"{audio.codec} {audio.sample_rate} Hz {audio.channel_layout}" if audio else "no audio"
+            duration = f"{info.duration:.1f}s" if info.duration else "unknown duration"
+            bitrate = f", {info.bit_rate // 1000} kb/s" if info.bit_rate else ""
+            loudness = info.loudness
+            if loudness:
+                gain = orchestrator.video_composer.music_gain_db(track)
+                bitrate += (
+                    f", {loudness.integrated:.1f} LUFS, peak {loudness.true_peak:.1f} dBTP, "
+                    f"LRA {loudness.lra:.1f} LU (gain {gain:+.1f} dB)"
+                )
+            print(f"  {track.name}: {duration}, {layout}{bitrate}")
+
+    orchestrator.close()
+
+
+async def process_render_job(orchestrator: Orchestrator, job, worker_id: str) -> None:
+    """Render one claimed job, renewing its lease until the render finishes."""
+    queue = orchestrator.render_queue
+    render = asyncio.create_task(orchestrator.render_queued_job(job))
+
+    while not render.done():
+        await asyncio.wait({render}, timeout=queue.lease_seconds / 3)
+        if not render.done() and not await asyncio.to_thread(queue.heartbeat, job.id, worker_id):
+            logger.warning(f"Lost lease on render job {job.id}, stopping")
+            render.cancel()
+
+    try:
+        result = render.result()
+    except asyncio.CancelledError:
+        return
+    except Exception as e:
+        await asyncio.to_thread(queue.fail, job.id, worker_id, str(e) or type(e).__name__)
+        return
+    await asyncio.to_thread(queue.complete, job.id, worker_id, result)
+
+
+async def cmd_worker(args):
+    """Claim and render queued series until stopped."""
+    setup_logging(os.getenv("LOG_LEVEL", "INFO"))
+
+    orchestrator = create_orchestrator()
+    if not orchestrator.render_queue:
+        print("Render queue is disabled (RENDER_QUEUE=false)")
+        orchestrator.close()
+        return
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Render worker {worker_id} started")
+
+    try:
+        while True:
+            job = await asyncio.to_thread(orchestrator.render_queue.claim, worker_id)
+            if job:
+                await process_render_job(orchestrator, job, worker_id)
+            elif args.once:
+                break
+            else:
+                await asyncio.sleep(args.poll_interval)
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+    finally:
+        orchestrator.close()
+
+    logger.info(f"Render worker {worker_id} stopped")
+
+
 def cmd_test(args):
     """Run integration test."""
     setup_logging("INFO")
@@ -386,11 +613,16 @@ async def cmd_run(args):
     logger.info(f"Scheduled generation at {gen_time}")
 
     # Start Telegram bot if configured
+    delivery = None
     if bot:
         bot.build_app()
         await bot.start()
         logger.info("Telegram bot started")
 
+        # Series rendered by workers come back through the queue
+        if orchestrator.render_queue:
+            delivery = asyncio.create_task(deliver_render_results(orchestrator, bot))
+
     # Run scheduler
     try:
         await scheduler.run_loop()
@@ -398,6 +630,8 @@ async def cmd_run(args):
         logger.info("Shutting down...")
     finally:
         scheduler.stop()
+        if delivery:
+            delivery.cancel()
         if bot:
             await bot.stop()
         orchestrator.close()
@@ -424,10 +658,33 @@ def main():
     gen_parser.add_argument("--static", action="store_true", help="Disable motion effects (static image)")
     gen_parser.add_argument("--no-overlay", action="store_true", help="Disable text overlay on video")
     gen_parser.add_argument("--send-telegram", action="store_true", help="Send to Telegram for moderation")
+    gen_parser.add_argument(
+        "--profile", choices=list(RENDER_PROFILES), default="final",
+        help="Render profile for series videos (default: final; preview = fast low-res check)",
+    )
 
     # stats command
     subparsers.add_parser("stats", help="Show system statistics")
 
+    # transcode-music command
+    subparsers.add_parser("transcode-music", help="Pre-transcode music library to AAC")
+
+    # prepare-photos command
+    photos_parser = subparsers.add_parser("prepare-photos", help="Pre-build story-sized photo derivatives")
+    photos_parser.add_argument("--static", action="store_true", help="Also build fit-inside versions for static stories")
+    photos_parser.add_argument("--workers", type=int, default=4, help="Parallel decode threads (default: 4)")
+
+    # probe-library command
+    probe_parser = subparsers.add_parser("probe-library", help="Probe durations/streams of the music library")
+    probe_parser.add_argument("--workers", type=int, default=4, help="Parallel probe processes (default: 4)")
+    probe_parser.add_argument("--loudness", action="store_true", help="Also measure loudness (decodes every track once)")
+    probe_parser.add_argument("-v", "--verbose", action="store_true", help="Print the probe result of every track")
+
+    # worker command
+    worker_parser = subparsers.add_parser("worker", help="Render queued story series (RENDER_QUEUE=true)")
+    worker_parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    worker_parser.add_argument("--poll-interval", type=float, default=5, help="Seconds between queue checks (default: 5)")
+
     # test command
     subparsers.add_parser("test", help="Run integration test")
 
@@ -443,6 +700,14 @@ def main():
         cmd_generate(args)
     elif args.command == "stats":
         cmd_stats(args)
+    elif args.command == "transcode-music":
+        cmd_transcode_music(args)
+    elif args.command == "prepare-photos":
+        cmd_prepare_photos(args)
+    elif args.command == "probe-library":
+        cmd_probe_library(args)
+    elif args.command == "worker":
+        asyncio.run(cmd_worker(args))
     elif args.command == "test":
         cmd_test(args)
     elif args.command == "run":
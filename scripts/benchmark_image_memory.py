@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of photo decoding before/after reduced decoding.
+
+Runs every case in a fresh Python process and reports its peak RSS
+(VmHWM on Linux, ru_maxrss elsewhere), so decode buffers of one case
+cannot hide in another.
+
+"before" decodes at full resolution and then shrinks (the old code
+paths); "after" uses src.modules.image_loader.load_image.
+
+Cases:
+- overlay: cover crop to 1080x1920 (overlay base image, photo store)
+- exif: EXIF-rotated motion source (1350x2400 stretch)
+- telegram: moderation preview (fit inside 1280x1280)
+
+Usage:
+    python scripts/benchmark_image_memory.py
+    python scripts/benchmark_image_memory.py --photo media/photos/x/big.jpg
+    python scripts/benchmark_image_memory.py --megapixels 12 48
+"""
+
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image, ImageChops, ImageOps, ImageStat
+
+from src.modules.image_loader import fit_image, load_image
+
+CASES = {
+    # name: (target size, fit)
+    "overlay": ((1080, 1920), "cover"),
+    "exif": ((1350, 2400), "stretch"),
+    "telegram": ((1280, 1280), "contain"),
+}
+
+
+def make_photo(work_dir: Path, megapixels: float) -> Path:
+    """Create a synthetic 4:3 JPEG of the given size with EXIF orientation 6."""
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = width * 3 // 4
+    path = work_dir / f"photo_{megapixels:g}mp.jpg"
+
+    img = Image.radial_gradient("L").resize((width, height)).convert("RGB")
+    noise = Image.effect_noise((width, height), 40).convert("RGB")
+    img = Image.blend(img, noise, 0.3)
+
+    exif = Image.Exif()
+    exif[274] = 6  # Rotated 90 degrees, as phone portrait shots
+    img.save(path, "JPEG", quality=90, exif=exif)
+    return path
+
+
+def process(photo: Path, case: str, mode: str) -> Image.Image:
+    """Produce the case's output image with the old or the new decoding."""
+    size, fit = CASES[case]
+    if mode == "before":
+        with Image.open(photo) as img:
+            img = ImageOps.exif_transpose(img)
+    else:
+        img = load_image(photo, size, fit)
+
+    img = img.convert("RGB")
+    if case == "telegram":
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        return img
+    return fit_image(img, size, fit)
+
+
+def peak_rss_kb() -> int:
+    """
+    Peak RSS of this process in KB.
+
+    Linux keeps ru_maxrss across exec (it would include the parent's
+    memory at fork time), so VmHWM of the current image is preferred.
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_child(photo: Path, case: str, mode: str) -> None:
+    """Child process: run one case and print peak RSS as JSON."""
+    baseline_kb = peak_rss_kb()
+    start = time.perf_counter()
+    process(photo, case, mode)
+    elapsed = time.perf_counter() - start
+    peak_kb = peak_rss_kb()
+    print(json.dumps({"peak_mb": peak_kb / 1024, "baseline_mb": baseline_kb / 1024, "time": elapsed}))
+
+
+def measure(photo: Path, case: str, mode: str) -> dict:
+    """Run one case in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", case, mode, str(photo)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def mean_diff(photo: Path, case: str) -> float:
+    """Mean absolute pixel difference between old and new output (0-255)."""
+    before = process(photo, case, "before")
+    after = process(photo, case, "after")
+    if before.size != after.size:
+        after = after.resize(before.size)
+    return sum(ImageStat.Stat(ImageChops.difference(before, after)).mean) / 3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peak RSS of photo decoding")
+    parser.add_argument("--photo", type=Path, nargs="+", help="Photos to use (synthetic if omitted)")
+    parser.add_argument("--megapixels", type=float, nargs="+", default=[12, 48],
+                        help="Sizes of synthetic photos")
+    parser.add_argument("--child", nargs=3, metavar=("CASE", "MODE", "PHOTO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        case, mode, photo = args.child
+        run_child(Path(photo), case, mode)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        photos = args.photo or [make_photo(Path(tmp), mp) for mp in args.megapixels]
+
+        print(f"{'photo':<22} | {'case':<8} | {'before':>17} | {'after':>17} | {'diff':>5}")
+        print("-" * 82)
+        for photo in photos:
+            with Image.open(photo) as img:
+                label = f"{photo.name[:14]} {img.width * img.height / 1e6:.0f}MP"
+            for case in CASES:
+                before = measure(photo, case, "before")
+                after = measure(photo, case, "after")
+                print(
+                    f"{label:<22} | {case:<8} | "
+                    f"{before['peak_mb']:>6.0f} MB {before['time']:>5.2f}s | "
+                    f"{after['peak_mb']:>6.0f} MB {after['time']:>5.2f}s | "
+                    f"{mean_diff(photo, case):>5.2f}"
+                )
+        print(f"\nBaseline RSS (interpreter + imports): {before['baseline_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Render benchmark suite for VideoComposer.
+
+Renders one story per case (photo fixture x effect x preset x resolution)
+and records wall time, CPU time (Python + FFmpeg), peak RSS and output
+size. Cases start from the production config (VideoConfig.from_env(),
+i.e. defaults plus .env); --set overrides fields on top of it. Every render runs in a fresh Python process, so caches, loaded
+fonts and decode buffers of one case cannot affect another.
+
+Fixtures are generated locally: synthetic photos of several sizes,
+EXIF orientations and formats (JPEG, PNG, AVIF, HEIC when pillow-heif
+is installed) and a synthetic music track. Nothing is downloaded and no
+GPU is used.
+
+Results are written as JSON (data/benchmarks/render_<timestamp>.json by
+default); --compare diffs two result files case by case and exits with
+status 1 when a metric got worse by more than --threshold percent.
+
+Usage:
+    python scripts/benchmark_render.py
+    python scripts/benchmark_render.py --effects static zoom_in_center --presets ultrafast medium
+    python scripts/benchmark_render.py --photos all --resolutions 1080x1920 540x960 --repeat 3
+    python scripts/benchmark_render.py --set motion_engine=frames --set still_image_encode=true
+    python scripts/benchmark_render.py --compare data/benchmarks/render_old.json
+    python scripts/benchmark_render.py --compare old.json new.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+from dataclasses import asdict, fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from dotenv import load_dotenv
+from PIL import Image, features
+
+from src.modules.ffmpeg_capabilities import get_ffmpeg_capabilities
+from src.modules.video_composer import MOTION_EFFECTS, VideoComposer, VideoConfig
+
+try:
+    import pillow_heif
+    pillow_heif.register_heif_opener()
+    HEIF_AVAILABLE = True
+except ImportError:
+    HEIF_AVAILABLE = False
+
+load_dotenv(PROJECT_ROOT / ".env")
+
+RESULTS_FORMAT_VERSION = 2
+
+# name: (Pillow format, megapixels, EXIF orientation)
+PHOTO_FIXTURES = {
+    "jpeg_2mp": ("JPEG", 2, 1),  # Smaller than the story frame (upscaled)
+    "jpeg_12mp": ("JPEG", 12, 1),
+    "jpeg_12mp_rot90": ("JPEG", 12, 6),  # Phone portrait shot
+    "jpeg_48mp_rot270": ("JPEG", 48, 8),
+    "png_12mp": ("PNG", 12, 1),
+    "avif_12mp_rot90": ("AVIF", 12, 6),
+    "heic_12mp_rot90": ("HEIF", 12, 6),
+}
+
+EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "AVIF": ".avif", "HEIF": ".heic"}
+
+EFFECTS = ["static"] + [effect.name for effect in MOTION_EFFECTS]
+
+# Compared by --compare (all lower is better). Python and FFmpeg run
+# concurrently, so peak memory of a render is reported per process rather
+# than as one combined number.
+METRICS = ("wall_s", "cpu_s", "python_peak_mb", "ffmpeg_peak_mb", "size_kb")
+
+
+def fixture_supported(name: str) -> bool:
+    """Check that this Pillow build can write the fixture's format."""
+    fmt = PHOTO_FIXTURES[name][0]
+    if fmt == "AVIF":
+        return features.check("avif") or HEIF_AVAILABLE
+    if fmt == "HEIF":
+        return HEIF_AVAILABLE
+    return True
+
+
+def make_photo(work_dir: Path, name: str) -> Path:
+    """Create a synthetic 4:3 photo (gradient + noise) for a fixture."""
+    fmt, megapixels, orientation = PHOTO_FIXTURES[name]
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = width * 3 // 4
+    path = work_dir / f"{name}{EXTENSIONS[fmt]}"
+
+    img = Image.radial_gradient("L").resize((width, height)).convert("RGB")
+    noise = Image.effect_noise((width, height), 40).convert("RGB")
+    img = Image.blend(img, noise, 0.3)
+
+    exif = Image.Exif()
+    exif[274] = orientation
+    options = {"quality": 90} if fmt in ("JPEG", "AVIF", "HEIF") else {}
+    img.save(path, fmt, exif=exif.tobytes(), **options)
+    return path
+
+
+def make_music(work_dir: Path, ffmpeg_path: str, duration: float) -> Path:
+    """Create a synthetic stereo track (tone + pink noise)."""
+    music_path = work_dir / "music.mp3"
+    subprocess.run(
+        [
+            ffmpeg_path, "-y", "-v", "error",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+            "-f", "lavfi", "-i", f"anoisesrc=color=pink:amplitude=0.1:duration={duration}",
+            "-filter_complex", "[0:a][1:a]amix=inputs=2,aformat=channel_layouts=stereo",
+            "-c:a", "libmp3lame", "-b:a", "192k",
+            str(music_path),
+        ],
+        check=True,
+    )
+    return music_path
+
+
+def parse_overrides(items: list[str]) -> dict:
+    """Parse --set key=value pairs into VideoConfig field values."""
+    types = {f.name: f.type for f in fields(VideoConfig)}
+    overrides = {}
+    for item in items:
+        key, _, value = item.partition("=")
+        if key not in types or key == "text_overlay":
+            raise SystemExit(f"Unknown VideoConfig field: {key}")
+        field_type = str(types[key])
+        if "bool" in field_type:
+            overrides[key] = value.lower() in ("1", "true", "yes")
+        elif value.lower() == "none":
+            overrides[key] = None
+        elif "int" in field_type:
+            overrides[key] = int(value)
+        elif "float" in field_type:
+            overrides[key] = float(value)
+        else:
+            overrides[key] = value
+    return overrides
+
+
+def peak_rss_kb() -> int:
+    """
+    Peak RSS of this process in KB.
+
+    Linux keeps ru_maxrss across exec (it would include the parent's
+    memory at fork time), so VmHWM of the current image is preferred.
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def cpu_seconds(who: int) -> float:
+    """User + system CPU time of this process or its finished children."""
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_child(case: dict) -> None:
+    """Child process: render one case and print its measurements as JSON."""
+    work_dir = Path(case["work_dir"])
+    width, height = map(int, case["resolution"].split("x"))
+    config = replace(
+        VideoConfig.from_env(),
+        width=width,
+        height=height,
+        preset=case["preset"],
+        duration=case["duration"],
+        **case["overrides"],
+    )
+    out_dir = Path(tempfile.mkdtemp(dir=work_dir))
+    composer = VideoComposer(
+        output_dir=out_dir,
+        config=config,
+        capabilities=get_ffmpeg_capabilities(work_dir / "ffmpeg_capabilities.json"),
+    )
+    photo = Path(case["photo_path"])
+    music = Path(case["music_path"])
+    output_path = out_dir / "story.mp4"
+
+    self_cpu = cpu_seconds(resource.RUSAGE_SELF)
+    children_cpu = cpu_seconds(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    if case["text"]:
+        composer.compose_story_with_overlay(
+            photo, music, case["text"],
+            output_path=output_path,
+            duration=case["duration"],
+            motion_effect=case["effect"],
+        )
+    else:
+        composer.compose_story(
+            photo, music,
+            output_path=output_path,
+            duration=case["duration"],
+            motion_effect=case["effect"],
+        )
+    wall = time.perf_counter() - start
+    python_cpu = cpu_seconds(resource.RUSAGE_SELF) - self_cpu
+    ffmpeg_cpu = cpu_seconds(resource.RUSAGE_CHILDREN) - children_cpu
+
+    metrics = composer.render_metrics[-1] if composer.render_metrics else None
+    python_peak_mb = peak_rss_kb() / 1024
+    ffmpeg_peak_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(json.dumps({
+        "wall_s": round(wall, 3),
+        "cpu_s": round(python_cpu + ffmpeg_cpu, 3),
+        "python_cpu_s": round(python_cpu, 3),
+        "ffmpeg_cpu_s": round(ffmpeg_cpu, 3),
+        "python_peak_mb": round(python_peak_mb, 1),
+        "ffmpeg_peak_mb": round(ffmpeg_peak_mb, 1),
+        "size_kb": round(output_path.stat().st_size / 1024, 1),
+        "frames": metrics.frames if metrics else None,
+        "encode_fps": metrics.encode_fps if metrics else None,
+    }))
+
+    output_path.unlink()
+
+
+def measure(case: dict, repeat: int) -> dict:
+    """Run a case `repeat` times in fresh interpreters (median times, max memory)."""
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", json.dumps(case)],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    summary = dict(runs[-1])
+    for key in ("wall_s", "cpu_s", "python_cpu_s", "ffmpeg_cpu_s", "encode_fps"):
+        values = [run[key] for run in runs if run[key] is not None]
+        summary[key] = round(statistics.median(values), 3) if values else None
+    for key in ("python_peak_mb", "ffmpeg_peak_mb"):
+        summary[key] = max(run[key] for run in runs)
+    summary["runs"] = len(runs)
+    return summary
+
+
+def case_id(result: dict) -> str:
+    """Stable key of a case across result files."""
+    text = "+text" if result.get("text") else ""
+    return f"{result['photo']}/{result['effect']}{text}/{result['preset']}/{result['resolution']}"
+
+
+def git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit (None outside a git checkout)."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(baseline_path: Path, current: dict, threshold: float) -> int:
+    """
+    Print per-case changes against a baseline result file.
+
+    Returns:
+        Number of metrics that got worse by more than threshold percent
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    old = {case_id(r): r for r in baseline["results"] if "error" not in r}
+    new = {case_id(r): r for r in current["results"] if "error" not in r}
+
+    print(f"\nCompared with {baseline_path} "
+          f"({baseline['meta'].get('commit')} -> {current['meta'].get('commit')}):")
+    print(f"{'case':<52} | " + " | ".join(f"{m:>18}" for m in METRICS))
+    print("-" * (55 + 21 * len(METRICS)))
+
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        cells = []
+        for metric in METRICS:
+            before, after = old[key].get(metric), new[key].get(metric)
+            if not before or after is None:
+                cells.append(f"{'-':>18}")
+                continue
+            change = (after - before) / before * 100
+            flag = " !" if change > threshold else "  "
+            regressions += change > threshold
+            cells.append(f"{after:>8g} {change:>+6.1f}%{flag}")
+        print(f"{key:<52} | " + " | ".join(cells))
+
+    for key in sorted(old.keys() - new.keys()):
+        print(f"{key:<52} | only in baseline")
+    for key in sorted(new.keys() - old.keys()):
+        print(f"{key:<52} | new case")
+
+    print(f"\n{regressions} metric(s) worse by more than {threshold:g}%")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark story renders on synthetic fixtures")
+    parser.add_argument("--photos", nargs="+", default=["jpeg_12mp"],
+                        help=f"Photo fixtures or 'all' ({', '.join(PHOTO_FIXTURES)})")
+    parser.add_argument("--effects", nargs="+", default=EFFECTS,
+                        help=f"Effects to render (default: all; {', '.join(EFFECTS)})")
+    parser.add_argument("--presets", nargs="+", default=["ultrafast", "medium"])
+    parser.add_argument("--resolutions", nargs="+", default=["1080x1920"])
+    parser.add_argument("--duration", type=float, default=5, help="Story length in seconds")
+    parser.add_argument("--text", help="Render with this text overlay")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="FIELD=VALUE",
+                        help="VideoConfig override for every case (repeatable)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case (median time is reported)")
+    parser.add_argument("--output", type=Path, help="Results JSON (default: data/benchmarks/render_<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, nargs="+", metavar="RESULTS",
+                        help="Baseline results; with two files, compare them without rendering")
+    parser.add_argument("--threshold", type=float, default=10, help="Regression threshold, percent")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(json.loads(args.child))
+        return
+
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1], "r", encoding="utf-8") as f:
+            current = json.load(f)
+        sys.exit(1 if compare(args.compare[0], current, args.threshold) else 0)
+
+    photos = list(PHOTO_FIXTURES) if args.photos == ["all"] else args.photos
+    for name in photos:
+        if name not in PHOTO_FIXTURES:
+            parser.error(f"Unknown photo fixture: {name}")
+    for name in args.effects:
+        if name not in EFFECTS:
+            parser.error(f"Unknown effect: {name}")
+    skipped = [name for name in photos if not fixture_supported(name)]
+    if skipped:
+        print(f"Skipping {', '.join(skipped)}: format not supported by this Pillow build (install pillow-heif)")
+        photos = [name for name in photos if name not in skipped]
+
+    overrides = parse_overrides(args.overrides)
+    capabilities = get_ffmpeg_capabilities()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        music = make_music(work_dir, capabilities.ffmpeg_path, args.duration + 5)
+        photo_paths = {name: make_photo(work_dir, name) for name in photos}
+
+        cases = [
+            {
+                "photo": photo, "effect": effect, "preset": preset, "resolution": resolution,
+                "text": args.text, "duration": args.duration, "overrides": overrides,
+                "photo_path": str(photo_paths[photo]), "music_path": str(music), "work_dir": tmp,
+            }
+            for photo in photos
+            for resolution in args.resolutions
+            for preset in args.presets
+            for effect in args.effects
+        ]
+
+        print(f"{len(cases)} cases, {args.duration:g}s stories, {args.repeat} run(s) each\n")
+        print(f"{'case':<52} | {'wall':>7} | {'cpu':>7} | {'py rss':>8} | {'ff rss':>8} | {'size':>8}")
+        print("-" * 107)
+        for case in cases:
+            measured = measure(case, args.repeat)
+            result = {k: case[k] for k in ("photo", "effect", "preset", "resolution", "text")}
+            result.update(measured)
+            results.append(result)
+            if "error" in measured:
+                print(f"{case_id(result):<52} | error: {measured['error']}")
+                continue
+            print(
+                f"{case_id(result):<52} | {measured['wall_s']:>6.2f}s | {measured['cpu_s']:>6.2f}s | "
+                f"{measured['python_peak_mb']:>5.0f} MB | {measured['ffmpeg_peak_mb']:>5.0f} MB | "
+                f"{measured['size_kb']:>5.0f} KB"
+            )
+
+    current = {
+        "version": RESULTS_FORMAT_VERSION,
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "ffmpeg": capabilities.version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "duration": args.duration,
+            "repeat": args.repeat,
+            "overrides": overrides,
+            "config": asdict(VideoConfig.from_env()),
+        },
+        "results": results,
+    }
+
+    output = args.output or (
+        PROJECT_ROOT / "data" / "benchmarks" / f"render_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(current, f, ensure_ascii=False, indent=2)
+    print(f"\nResults: {output}")
+
+    if args.compare:
+        sys.exit(1 if compare(args.compare[0], current, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the still-image encode path for static stories.
+
+Renders the same static story with the regular command (25 fps image
+loop, generic preset) and with VideoConfig.still_image_encode, then
+prints wall time and file size for each duration.
+
+Usage:
+    python scripts/benchmark_static_encode.py
+    python scripts/benchmark_static_encode.py --photo media/photos/x.jpg --music media/music/y.mp3
+    python scripts/benchmark_static_encode.py --durations 5 6.5 8 --runs 3
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image, ImageDraw
+
+from src.modules.video_composer import VideoComposer, VideoConfig, _get_ffmpeg_path
+
+
+def make_fixtures(work_dir: Path) -> tuple[Path, Path]:
+    """Create a synthetic photo (gradient + shapes) and a 20 s music track."""
+    photo_path = work_dir / "photo.jpg"
+    img = Image.new("RGB", (3000, 4000))
+    draw = ImageDraw.Draw(img)
+    for y in range(0, 4000, 8):
+        shade = y * 255 // 4000
+        draw.rectangle((0, y, 3000, y + 8), fill=(shade, 120, 255 - shade))
+    for i in range(40):
+        x, y = (i * 613) % 2800, (i * 997) % 3800
+        draw.ellipse((x, y, x + 200, y + 200), fill=(255, (i * 37) % 255, 60))
+    img.save(photo_path, "JPEG", quality=92)
+
+    music_path = work_dir / "music.mp3"
+    subprocess.run(
+        [
+            _get_ffmpeg_path(), "-y", "-v", "error",
+            "-f", "lavfi", "-i", "sine=frequency=440:duration=20",
+            "-c:a", "libmp3lame", "-b:a", "192k",
+            str(music_path),
+        ],
+        check=True,
+    )
+    return photo_path, music_path
+
+
+def bench(still: bool, photo: Path, music: Path, duration: float, runs: int, out_dir: Path) -> tuple[float, int]:
+    """Render a static story `runs` times, return (best wall time, file size)."""
+    composer = VideoComposer(
+        output_dir=out_dir,
+        config=VideoConfig(still_image_encode=still),
+    )
+    output_path = out_dir / f"{'still' if still else 'regular'}_{duration:g}.mp4"
+
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        composer.compose_story(
+            photo_path=photo,
+            music_path=music,
+            output_path=output_path,
+            duration=duration,
+            motion_effect="static",
+        )
+        best = min(best, time.perf_counter() - start)
+
+    return best, output_path.stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark still-image story encoding")
+    parser.add_argument("--photo", type=Path, help="Photo to use (synthetic if omitted)")
+    parser.add_argument("--music", type=Path, help="Music track to use (synthetic if omitted)")
+    parser.add_argument("--durations", type=float, nargs="+", default=[5, 6.5, 8])
+    parser.add_argument("--runs", type=int, default=2, help="Runs per case (best time is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        photo, music = args.photo, args.music
+        if not photo or not music:
+            synth_photo, synth_music = make_fixtures(work_dir)
+            photo = photo or synth_photo
+            music = music or synth_music
+
+        print(f"Photo: {photo.name}, music: {music.name}, runs: {args.runs}")
+        print(f"{'duration':>8} | {'regular':>16} | {'still':>16} | {'speedup':>7} | {'size':>6}")
+        print("-" * 66)
+
+        for duration in args.durations:
+            reg_time, reg_size = bench(False, photo, music, duration, args.runs, work_dir)
+            still_time, still_size = bench(True, photo, music, duration, args.runs, work_dir)
+            print(
+                f"{duration:>7g}s | "
+                f"{reg_time:>6.2f}s {reg_size / 1024:>6.0f} KB | "
+                f"{still_time:>6.2f}s {still_size / 1024:>6.0f} KB | "
+                f"{reg_time / still_time:>6.1f}x | "
+                f"{still_size / reg_size:>5.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
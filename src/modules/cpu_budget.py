@@ -0,0 +1,375 @@
+"""
+CPU budget for concurrent FFmpeg jobs.
+
+Without thread limits every x264 instance sizes its thread pool to all
+cores, so N parallel renders run N x cores threads that evict each
+other's caches and lookahead state. The budget splits the cores of the
+host (or container) into fixed slots, one per concurrent job:
+
+- a job waits for a free slot, so no more than max_jobs encode at once
+- each slot owns total_cores / max_jobs threads; the composer passes
+  them to FFmpeg as encoder (-threads) and filter graph thread counts
+- optionally each slot is pinned to its own cores (sched_setaffinity)
+  and FFmpeg processes get a raised niceness
+
+Fixed slots trade single-job latency for total throughput: one job on
+an idle host still only uses its share of the cores.
+
+Background jobs (speculative pre-renders) never take these slots: they
+run in separate background slots on the same cores with raised
+niceness, so a foreground render never waits for one and the kernel
+gives it the CPU first. Jobs of one priority get slots in arrival order
+(FIFO tickets), so a steady stream of jobs cannot starve an earlier one.
+
+Core count honours the process affinity mask and cgroup CPU quotas
+(Docker --cpus), so a container does not size itself to the host.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job priorities: foreground jobs use the regular slots, background jobs
+# their own slots (see CpuBudget)
+PRIORITIES = ("foreground", "background")
+
+
+@dataclass(frozen=True)
+class CpuAllocation:
+    """CPU share of one running job."""
+    slot: int  # Slot index (0-based, background slots follow the foreground ones)
+    threads: int  # Threads the job may use
+    cores: Optional[tuple[int, ...]] = None  # CPU ids to pin to (None = not pinned)
+    priority: str = "foreground"
+
+
+class _Waiter:
+    """Place in line for a slot; async waiters are woken on their event loop."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.event = asyncio.Event() if loop else None
+
+    def wake(self) -> None:
+        if self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+def available_cores() -> list[int]:
+    """CPU ids this process may run on (affinity mask, or all CPUs)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """
+    CPU quota of the container in cores (cgroup v2 or v1).
+
+    Returns:
+        Quota in cores, or None if unlimited or unknown
+    """
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class CpuBudget:
+    """
+    Splits the available cores between a fixed number of concurrent jobs.
+
+    Usable from threads (acquire) and from asyncio tasks (acquire_async)
+    at the same time; both draw from the same slots. Background jobs draw
+    from background_jobs extra slots instead, which overlap the regular
+    ones (unpinned, meant for processes with raised niceness).
+    """
+
+    def __init__(
+        self,
+        max_jobs: int = 1,
+        total_cores: Optional[int] = None,
+        pin: bool = False,
+        niceness: int = 0,
+        background_jobs: int = 1,
+    ):
+        """
+        Initialize CPU budget.
+
+        Args:
+            max_jobs: Concurrent FFmpeg jobs (slots)
+            total_cores: Cores to split (None = detect from affinity and cgroup quota)
+            pin: Pin each slot's processes to its own cores
+            niceness: Niceness added to every FFmpeg process (0 = unchanged)
+            background_jobs: Concurrent background jobs, on top of max_jobs
+        """
+        cores = available_cores()
+        if total_cores is None:
+            total_cores = len(cores)
+            quota = cgroup_cpu_limit()
+            if quota:
+                total_cores = min(total_cores, max(1, math.ceil(quota)))
+
+        self.total_cores = max(1, total_cores)
+        self.max_jobs = max(1, max_jobs)
+        self.pin = pin and hasattr(os, "sched_setaffinity")
+        self.niceness = niceness
+        self.background_jobs = max(1, background_jobs)
+        self._slots = self._split(cores)
+        # Background slots: a foreground slot's share, on any core
+        self._slots += [
+            CpuAllocation(slot=self.max_jobs + i, threads=self._slots[0].threads, priority="background")
+            for i in range(self.background_jobs)
+        ]
+
+        self._cond = threading.Condition()
+        # Free slots per priority (stacks, lowest slot on top)
+        self._free = {
+            priority: [s.slot for s in reversed(self._slots) if s.priority == priority]
+            for priority in PRIORITIES
+        }
+        self._jobs = [0] * len(self._slots)
+        self._busy_seconds = [0.0] * len(self._slots)
+        # Waiting jobs per priority, in arrival order
+        self._waiting: dict[str, deque[_Waiter]] = {priority: deque() for priority in PRIORITIES}
+        # Per priority: [jobs that had to wait, total seconds, longest wait]
+        self._waits = {priority: [0, 0.0, 0.0] for priority in PRIORITIES}
+        self.peak_active = 0
+
+        logger.info(f"CPU budget: {self.describe()}")
+
+    def _split(self, cores: list[int]) -> list[CpuAllocation]:
+        """Divide total_cores into max_jobs slots (remainder to the first slots)."""
+        base, extra = divmod(self.total_cores, self.max_jobs)
+        slots = []
+        start = 0
+        for slot in range(self.max_jobs):
+            threads = max(1, base + (1 if slot < extra else 0))
+            pinned = None
+            if self.pin:
+                # More slots than cores: slots share cores round-robin
+                pinned = tuple(sorted({cores[(start + i) % len(cores)] for i in range(threads)}))
+            slots.append(CpuAllocation(slot=slot, threads=threads, cores=pinned))
+            start += threads
+        return slots
+
+    def describe(self) -> str:
+        """One-line summary of the split."""
+        threads = sorted({s.threads for s in self._slots}, reverse=True)
+        share = "/".join(str(t) for t in threads)
+        extras = []
+        if self.pin:
+            extras.append("pinned")
+        if self.niceness:
+            extras.append(f"nice +{self.niceness}")
+        suffix = f" ({', '.join(extras)})" if extras else ""
+        return (
+            f"{self.total_cores} cores, {self.max_jobs} jobs x {share} threads{suffix}, "
+            f"{self.background_jobs} background"
+        )
+
+    def _try_take(self, priority: str) -> Optional[CpuAllocation]:
+        """Take a free slot without waiting (caller holds the condition)."""
+        free = self._free[priority]
+        if not free:
+            return None
+        slot = free.pop()
+        self._jobs[slot] += 1
+        self.peak_active = max(self.peak_active, self.max_jobs - len(self._free["foreground"]))
+        return self._slots[slot]
+
+    def _take_turn(self, priority: str, waiter: "_Waiter") -> Optional[CpuAllocation]:
+        """Take a slot if the waiter is first in line (caller holds the condition)."""
+        queue = self._waiting[priority]
+        if queue[0] is not waiter:
+            return None
+        allocation = self._try_take(priority)
+        if allocation is not None:
+            queue.popleft()
+            self._wake_next(priority)
+        return allocation
+
+    def _leave(self, priority: str, waiter: "_Waiter") -> None:
+        """Drop a waiter that gave up (caller holds the condition)."""
+        self._waiting[priority].remove(waiter)
+        self._wake_next(priority)
+
+    def _wake_next(self, priority: str) -> None:
+        """Let the first waiter retry if a slot is free (caller holds the condition)."""
+        queue = self._waiting[priority]
+        if queue and self._free[priority]:
+            queue[0].wake()
+            self._cond.notify_all()
+
+    def _release(self, allocation: CpuAllocation, held: float) -> None:
+        with self._cond:
+            self._busy_seconds[allocation.slot] += held
+            self._free[allocation.priority].append(allocation.slot)
+            self._wake_next(allocation.priority)
+
+    @staticmethod
+    def _check_priority(priority: str) -> None:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}' (available: {', '.join(PRIORITIES)})")
+
+    def _record_wait(self, priority: str, waited: float) -> None:
+        with self._cond:
+            stats = self._waits[priority]
+            stats[0] += 1
+            stats[1] += waited
+            stats[2] = max(stats[2], waited)
+
+    @contextmanager
+    def acquire(self, priority: str = "foreground") -> Iterator[CpuAllocation]:
+        """
+        Hold a slot for one job (blocks until one is free and earlier
+        jobs of the same priority got theirs).
+
+        Raises:
+            ValueError: If the priority is unknown
+        """
+        self._check_priority(priority)
+        start = time.monotonic()
+        waited = False
+        with self._cond:
+            allocation = None if self._waiting[priority] else self._try_take(priority)
+            if allocation is None:
+                waited = True
+                waiter = _Waiter()
+                self._waiting[priority].append(waiter)
+                try:
+                    allocation = self._take_turn(priority, waiter)
+                    while allocation is None:
+                        self._cond.wait()
+                        allocation = self._take_turn(priority, waiter)
+                except BaseException:
+                    self._leave(priority, waiter)
+                    raise
+        taken = time.monotonic()
+        if waited:
+            self._record_wait(priority, taken - start)
+
+        try:
+            yield allocation
+        finally:
+            self._release(allocation, time.monotonic() - taken)
+
+    @asynccontextmanager
+    async def acquire_async(self, priority: str = "foreground"):
+        """
+        Async version of acquire (cancellation while waiting is safe).
+
+        Waiting tasks are woken by the releasing job, not by polling.
+        """
+        self._check_priority(priority)
+        start = time.monotonic()
+        waiter = None
+        with self._cond:
+            allocation = None if self._waiting[priority] else self._try_take(priority)
+            if allocation is None:
+                waiter = _Waiter(asyncio.get_running_loop())
+                self._waiting[priority].append(waiter)
+                allocation = self._take_turn(priority, waiter)
+        try:
+            while allocation is None:
+                await waiter.event.wait()
+                with self._cond:
+                    waiter.event.clear()
+                    allocation = self._take_turn(priority, waiter)
+        except BaseException:
+            with self._cond:
+                self._leave(priority, waiter)
+            raise
+        taken = time.monotonic()
+        if waiter:
+            self._record_wait(priority, taken - start)
+
+        try:
+            yield allocation
+        finally:
+            self._release(allocation, time.monotonic() - taken)
+
+    def apply(self, pid: int, allocation: Optional[CpuAllocation], extra_niceness: int = 0) -> None:
+        """
+        Apply pinning and niceness to a started FFmpeg process (POSIX only).
+
+        FFmpeg creates its worker threads after startup, so they inherit
+        the affinity and priority set here.
+
+        Args:
+            pid: FFmpeg process id
+            allocation: Slot the process runs in (None = no pinning)
+            extra_niceness: Niceness added on top of the budget's (background jobs)
+        """
+        if allocation and allocation.cores:
+            try:
+                os.sched_setaffinity(pid, allocation.cores)
+            except OSError as e:
+                logger.debug(f"Could not pin FFmpeg to cores {allocation.cores}: {e}")
+
+        niceness = self.niceness + extra_niceness
+        if niceness > 0 and hasattr(os, "setpriority"):
+            try:
+                current = os.getpriority(os.PRIO_PROCESS, pid)
+                os.setpriority(os.PRIO_PROCESS, pid, min(19, current + niceness))
+            except OSError as e:
+                logger.debug(f"Could not lower FFmpeg priority: {e}")
+
+    def get_stats(self) -> dict:
+        """How the budget is split and how the slots were used."""
+        with self._cond:
+            return {
+                "total_cores": self.total_cores,
+                "max_jobs": self.max_jobs,
+                "background_jobs": self.background_jobs,
+                "pinned": self.pin,
+                "niceness": self.niceness,
+                "active": self.max_jobs - len(self._free["foreground"]),
+                "background_active": self.background_jobs - len(self._free["background"]),
+                "peak_active": self.peak_active,
+                "waits": sum(w[0] for w in self._waits.values()),
+                "wait_seconds": round(sum(w[1] for w in self._waits.values()), 1),
+                "waits_by_priority": {
+                    priority: {
+                        "waits": count,
+                        "wait_seconds": round(total, 1),
+                        "max_wait_seconds": round(longest, 1),
+                        "waiting": len(self._waiting[priority]),
+                    }
+                    for priority, (count, total, longest) in self._waits.items()
+                },
+                "slots": [
+                    {
+                        "slot": s.slot,
+                        "priority": s.priority,
+                        "threads": s.threads,
+                        "cores": list(s.cores) if s.cores else None,
+                        "jobs": self._jobs[s.slot],
+                        "busy_seconds": round(self._busy_seconds[s.slot], 1),
+                    }
+                    for s in self._slots
+                ],
+            }
@@ -0,0 +1,205 @@
+"""
+FFmpeg binary discovery and capability probe.
+
+Every VideoComposer used to import imageio_ffmpeg to find the binary,
+and ffprobe was looked up on the filesystem per call. Nothing checked
+what the binary can do, so a build without a filter failed only when a
+render used it.
+
+Discovery runs once per process: binary paths, version and the lists of
+encoders and filters. The result is cached on disk
+(data/ffmpeg_capabilities.json) keyed by binary path, size and mtime,
+so later starts skip the three FFmpeg invocations until the binary is
+upgraded.
+"""
+
+import json
+import logging
+import re
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .json_index import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored fields change
+CAPABILITIES_FORMAT_VERSION = 1
+
+_VERSION_RE = re.compile(r"ffmpeg version (\S+)")
+# " V....D libx264   libx264 H.264 ..." (flags, name, description)
+_ENCODER_RE = re.compile(r"^\s*[VAS][\w.]{5}\s+(\S+)")
+# " TSC zoompan   V->V   Apply Zoom & Pan effect."
+_FILTER_RE = re.compile(r"^\s*[T.][S.][C.]\s+(\S+)\s+\S+->\S+")
+
+_lock = threading.Lock()
+_capabilities: Optional["FFmpegCapabilities"] = None
+
+
+@dataclass
+class FFmpegCapabilities:
+    """What the FFmpeg binary in use supports."""
+    ffmpeg_path: str
+    ffprobe_path: Optional[str] = None  # None = not available
+    version: str = "unknown"
+    encoders: list[str] = field(default_factory=list)
+    filters: list[str] = field(default_factory=list)
+    mtime_ns: int = 0  # Of the FFmpeg binary (cache key)
+    size: int = 0
+
+    def has_encoder(self, name: str) -> bool:
+        """Check for an encoder (True if the lists could not be read)."""
+        return not self.encoders or name in self.encoders
+
+    def has_filter(self, name: str) -> bool:
+        """Check for a filter (True if the lists could not be read)."""
+        return not self.filters or name in self.filters
+
+    @property
+    def major_version(self) -> Optional[int]:
+        """Major version number (None for git builds like "N-112345-g...")."""
+        match = re.match(r"n?(\d+)\.", self.version)
+        return int(match.group(1)) if match else None
+
+    def summary(self) -> str:
+        """One-line description for logs."""
+        probe = "ffprobe" if self.ffprobe_path else "no ffprobe"
+        return f"FFmpeg {self.version} ({len(self.encoders)} encoders, {len(self.filters)} filters, {probe})"
+
+
+def find_ffmpeg() -> str:
+    """
+    Get path to FFmpeg executable.
+
+    Tries imageio-ffmpeg first (bundled with full codecs),
+    falls back to system FFmpeg.
+    """
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except ImportError:
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg:
+            return ffmpeg
+        raise RuntimeError(
+            "FFmpeg not found. Install via:\n"
+            "  pip install imageio-ffmpeg\n"
+            "  or: sudo apt install ffmpeg"
+        )
+
+
+def find_ffprobe(ffmpeg_path: str) -> Optional[str]:
+    """ffprobe next to FFmpeg, then on PATH (None if missing)."""
+    sibling = Path(ffmpeg_path).parent / "ffprobe"
+    if sibling.exists():
+        return str(sibling)
+    return shutil.which("ffprobe")
+
+
+def _run(ffmpeg_path: str, *args: str) -> str:
+    """Run FFmpeg with informational options and return stdout."""
+    result = subprocess.run(
+        [ffmpeg_path, "-hide_banner", *args],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    return result.stdout
+
+
+def detect_capabilities(ffmpeg_path: str) -> FFmpegCapabilities:
+    """
+    Probe an FFmpeg binary (version, encoders, filters).
+
+    Lists stay empty if FFmpeg cannot be run; has_encoder/has_filter
+    then report everything as available (render errors surface as before).
+    """
+    stat = Path(ffmpeg_path).stat()
+    caps = FFmpegCapabilities(
+        ffmpeg_path=ffmpeg_path,
+        ffprobe_path=find_ffprobe(ffmpeg_path),
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+    )
+    try:
+        version = _VERSION_RE.search(_run(ffmpeg_path, "-version"))
+        if version:
+            caps.version = version.group(1)
+        caps.encoders = sorted(
+            m.group(1) for line in _run(ffmpeg_path, "-encoders").splitlines()
+            if (m := _ENCODER_RE.match(line)) and m.group(1) != "="
+        )
+        caps.filters = sorted(
+            m.group(1) for line in _run(ffmpeg_path, "-filters").splitlines()
+            if (m := _FILTER_RE.match(line))
+        )
+    except (subprocess.TimeoutExpired, OSError) as e:
+        logger.warning(f"FFmpeg capability probe failed: {e}")
+    return caps
+
+
+def _load_cached(cache_path: Path, ffmpeg_path: str) -> Optional[FFmpegCapabilities]:
+    """Read the on-disk result if it belongs to the current binary."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        stat = Path(ffmpeg_path).stat()
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if (
+        data.pop("version_format", None) != CAPABILITIES_FORMAT_VERSION
+        or data.get("ffmpeg_path") != ffmpeg_path
+        or data.get("mtime_ns") != stat.st_mtime_ns
+        or data.get("size") != stat.st_size
+    ):
+        return None
+    caps = FFmpegCapabilities(**data)
+    # ffprobe may have been installed or removed independently of FFmpeg
+    if caps.ffprobe_path and not Path(caps.ffprobe_path).exists():
+        caps.ffprobe_path = find_ffprobe(ffmpeg_path)
+    return caps
+
+
+def _save_cached(cache_path: Path, caps: FFmpegCapabilities) -> None:
+    """Persist a probe result (atomic replace)."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Bot and workers may probe at the same time (unique temp file per writer)
+        write_json_atomic(cache_path, {"version_format": CAPABILITIES_FORMAT_VERSION, **asdict(caps)})
+    except OSError as e:
+        logger.warning(f"Failed to save FFmpeg capabilities: {e}")
+
+
+def get_ffmpeg_capabilities(cache_path: Optional[Path] = None) -> FFmpegCapabilities:
+    """
+    Capabilities of the FFmpeg binary, discovered once per process.
+
+    Args:
+        cache_path: JSON file to reuse the probe across runs (only the
+            first call of a process reads or writes it)
+
+    Returns:
+        Shared capabilities object (do not modify)
+    """
+    global _capabilities
+    with _lock:
+        if _capabilities is not None:
+            return _capabilities
+
+        ffmpeg_path = find_ffmpeg()
+        caps = _load_cached(Path(cache_path), ffmpeg_path) if cache_path else None
+        if caps is None:
+            caps = detect_capabilities(ffmpeg_path)
+            if cache_path:
+                _save_cached(Path(cache_path), caps)
+            logger.info(f"Probed {caps.summary()}")
+        else:
+            logger.debug(f"Loaded {caps.summary()} from {cache_path}")
+
+        _capabilities = caps
+        return caps
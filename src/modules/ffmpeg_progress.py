@@ -0,0 +1,190 @@
+"""
+FFmpeg progress telemetry.
+
+Renders run FFmpeg with "-progress pipe:1 -nostats", which prints
+key=value blocks to stdout (every ~0.5 s and once at the end). This
+module parses those blocks into progress updates and turns a finished
+run into render metrics (wall time, encode fps, bytes out).
+
+Features:
+- ProgressParser: line-by-line parser for one FFmpeg run
+- RenderMetrics: per-render summary, appended to a JSONL log
+- ProgressStream: async iterator over the progress updates of one job
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Global options that make FFmpeg report progress on stdout
+PROGRESS_ARGS = ["-progress", "pipe:1", "-nostats"]
+
+
+@dataclass
+class RenderProgress:
+    """One progress update of a running FFmpeg job."""
+    output: str  # Output file name (first output for multi-output jobs)
+    frame: int = 0  # Frames encoded so far
+    fps: float = 0.0  # Current encode rate (frames per second)
+    speed: Optional[float] = None  # Encode speed relative to realtime (None = not reported yet)
+    out_time: float = 0.0  # Seconds of media written
+    total_size: int = 0  # Bytes written so far
+    duration: Optional[float] = None  # Expected media duration, if known
+    done: bool = False  # True on the final update
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Completed fraction 0..1 (None if duration unknown)."""
+        if not self.duration:
+            return None
+        return min(1.0, self.out_time / self.duration)
+
+
+def _parse_float(value: str) -> Optional[float]:
+    try:
+        return float(value.rstrip("x"))
+    except ValueError:
+        return None  # "N/A"
+
+
+class ProgressParser:
+    """
+    Parser for the "-progress" output of a single FFmpeg run.
+
+    Feed stdout lines one by one; a RenderProgress is returned each time
+    a block ends ("progress=continue" or "progress=end").
+    """
+
+    def __init__(self, output: str, duration: Optional[float] = None):
+        """
+        Args:
+            output: Job label (output file name)
+            duration: Expected media duration for fraction reporting
+        """
+        self.latest = RenderProgress(output=output, duration=duration)
+
+    def feed(self, line: str) -> Optional[RenderProgress]:
+        """
+        Parse one line of progress output.
+
+        Returns:
+            Progress snapshot at the end of a block, None otherwise
+        """
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+
+        current = self.latest
+        value = value.strip()
+
+        if key == "frame":
+            current.frame = int(_parse_float(value) or 0)
+        elif key == "fps":
+            current.fps = _parse_float(value) or 0.0
+        elif key == "speed":
+            current.speed = _parse_float(value)
+        elif key == "out_time_us":
+            microseconds = _parse_float(value)
+            if microseconds is not None and microseconds >= 0:
+                current.out_time = microseconds / 1_000_000
+        elif key == "total_size":
+            current.total_size = int(_parse_float(value) or 0)
+        elif key == "progress":
+            current.done = value == "end"
+            # Hand out a copy; the parser keeps updating its own instance
+            return RenderProgress(**asdict(current))
+
+        return None
+
+
+@dataclass
+class RenderMetrics:
+    """Summary of one finished FFmpeg render."""
+    outputs: list[str]  # Output file names
+    wall_time: float  # Seconds from process start to exit
+    frames: int  # Frames encoded
+    encode_fps: float  # frames / wall_time
+    speed: Optional[float]  # Last speed reported by FFmpeg
+    media_duration: float  # Seconds of media written
+    bytes_out: int  # Total size of output files
+    preset: str = ""
+    motion_engine: str = ""
+    threads: int = 0  # CPU budget threads of the job (0 = unlimited)
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class RenderMetricsLog:
+    """Append-only JSONL log of render metrics (one line per render)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, metrics: RenderMetrics) -> None:
+        """Append a metrics record (errors are logged, never raised)."""
+        line = json.dumps(metrics.to_dict(), ensure_ascii=False)
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write render metrics: {e}")
+
+    def read(self, limit: Optional[int] = None) -> list[dict]:
+        """Read logged metrics (most recent last)."""
+        if not self.path.exists():
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        return records[-limit:] if limit else records
+
+
+class ProgressStream:
+    """
+    Async iterator over the progress updates of one job.
+
+    Pass the stream as the progress_callback of a single compose call (it
+    is callable from any thread) and iterate over it in the event loop;
+    concurrent jobs each get their own stream:
+
+        stream = ProgressStream()
+        task = asyncio.create_task(
+            composer.compose_story_series_async(..., progress_callback=stream)
+        )
+        task.add_done_callback(lambda _: stream.close())
+        async for update in stream:
+            ...
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop or asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def __call__(self, progress: RenderProgress) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, progress)
+
+    def close(self) -> None:
+        """End iteration after the already queued updates."""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, self._CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> RenderProgress:
+        item = await self._queue.get()
+        if item is self._CLOSED:
+            raise StopAsyncIteration
+        return item
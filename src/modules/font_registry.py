@@ -0,0 +1,191 @@
+"""
+Process-wide font registry.
+
+Overlay rendering used to parse the same TTF file several times per
+story: once for pixel wrapping, once more for the imagetext-py FontDB
+and again for the safety-net re-wrap. The registry parses each font
+once per process and hands out the loaded objects afterwards.
+
+- PIL fonts are keyed by (path, size): FreeTypeFont objects are sized
+- imagetext-py fonts are keyed by path: FontDB fonts are scaled at draw time
+
+The registry can be warmed at startup for every font in the rotation,
+and keeps load counters and timings for diagnostics.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Iterable, Optional
+
+from PIL import ImageFont
+
+# imagetext-py is optional (emoji rendering)
+try:
+    from imagetext_py import FontDB, EmojiOptions
+    IMAGETEXT_AVAILABLE = True
+except ImportError:
+    IMAGETEXT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FontLoadStats:
+    """Font loading counters for one registry."""
+    pil_loads: int = 0  # FreeTypeFont objects created
+    imagetext_loads: int = 0  # Fonts registered in the imagetext-py FontDB
+    hits: int = 0  # Requests served from the registry
+    failures: int = 0  # Fonts that could not be loaded
+    load_seconds: float = 0.0  # Total time spent parsing fonts
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class FontRegistry:
+    """
+    Loaded fonts shared by every composer in the process.
+
+    Thread-safe: parallel story renders may request fonts concurrently.
+    A font is parsed at most once; failures are not cached, so a font
+    file that appears later is picked up on the next request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pil_fonts: dict[tuple[str, int], ImageFont.FreeTypeFont] = {}
+        self._imagetext_fonts: dict[str, object] = {}
+        self._emoji_options_set = False
+        self.stats = FontLoadStats()
+
+    def pil_font(self, font_path: Path, size: int) -> ImageFont.FreeTypeFont:
+        """
+        Get a PIL font of the given pixel size.
+
+        Args:
+            font_path: Path to TTF/OTF file
+            size: Font size in pixels
+
+        Returns:
+            Loaded FreeTypeFont
+
+        Raises:
+            OSError: If the font file cannot be read (as ImageFont.truetype)
+        """
+        key = (str(font_path), int(size))
+        with self._lock:
+            font = self._pil_fonts.get(key)
+            if font is not None:
+                self.stats.hits += 1
+                return font
+
+            start = time.perf_counter()
+            try:
+                font = ImageFont.truetype(key[0], key[1])
+            except Exception:
+                self.stats.failures += 1
+                raise
+            self.stats.load_seconds += time.perf_counter() - start
+            self.stats.pil_loads += 1
+            self._pil_fonts[key] = font
+
+        logger.debug(f"Loaded font {Path(font_path).name} @ {size}px")
+        return font
+
+    def imagetext_font(self, font_path: Path):
+        """
+        Get an imagetext-py font (registered in FontDB once).
+
+        Default emoji options are set on the first call.
+
+        Args:
+            font_path: Path to TTF/OTF file
+
+        Returns:
+            imagetext-py Font object
+
+        Raises:
+            RuntimeError: If imagetext-py is not installed
+        """
+        if not IMAGETEXT_AVAILABLE:
+            raise RuntimeError("imagetext-py is not installed")
+
+        key = str(font_path)
+        with self._lock:
+            font = self._imagetext_fonts.get(key)
+            if font is not None:
+                self.stats.hits += 1
+                return font
+
+            if not self._emoji_options_set:
+                FontDB.SetDefaultEmojiOptions(EmojiOptions())
+                self._emoji_options_set = True
+
+            font_name = f"font_{Path(font_path).stem}"
+            start = time.perf_counter()
+            try:
+                FontDB.LoadFromPath(font_name, key)
+                font = FontDB.Query(font_name)
+            except Exception:
+                self.stats.failures += 1
+                raise
+            self.stats.load_seconds += time.perf_counter() - start
+            self.stats.imagetext_loads += 1
+            self._imagetext_fonts[key] = font
+
+        logger.debug(f"Registered font in FontDB: {font_name}")
+        return font
+
+    def warm(self, fonts: Iterable[tuple[Path, int]]) -> int:
+        """
+        Preload fonts so the first render does not pay for parsing.
+
+        Args:
+            fonts: (font path, pixel size) pairs; imagetext-py fonts are
+                loaded once per path regardless of size
+
+        Returns:
+            Number of fonts that failed to load
+        """
+        failed = 0
+        for font_path, size in fonts:
+            try:
+                self.pil_font(font_path, size)
+                if IMAGETEXT_AVAILABLE:
+                    self.imagetext_font(font_path)
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Failed to preload font {Path(font_path).name}: {e}")
+        return failed
+
+    def clear(self) -> None:
+        """Drop loaded fonts (imagetext-py keeps its own FontDB entries)."""
+        with self._lock:
+            self._pil_fonts.clear()
+            self._imagetext_fonts.clear()
+
+    def get_stats(self) -> dict:
+        """Load counters plus the number of fonts currently held."""
+        with self._lock:
+            return {
+                **self.stats.to_dict(),
+                "pil_fonts": len(self._pil_fonts),
+                "imagetext_fonts": len(self._imagetext_fonts),
+            }
+
+
+# Shared by all composers in the process
+_registry: Optional[FontRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_font_registry() -> FontRegistry:
+    """Get the process-wide font registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = FontRegistry()
+        return _registry
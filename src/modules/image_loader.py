@@ -0,0 +1,154 @@
+"""
+Photo decoding near the target size.
+
+Library photos are 12-48 MP, but every consumer needs at most a story
+frame (1080x1920, slightly oversampled for motion) or a 1280 px preview.
+Decoding at full resolution first makes the decode buffer dominate peak
+memory of a render.
+
+JPEG decoders can scale by 1/2, 1/4 or 1/8 while decoding (Pillow's
+draft mode), so the full-size buffer is never allocated. Formats without
+decoder scaling (PNG, HEIC, AVIF) are decoded fully and then reduced
+with a fast integer box filter before any further resampling.
+
+Fit modes define the smallest decoded size that is still sufficient:
+- "cover": image will be scaled to fill size (and cropped)
+- "contain": image will be scaled to fit inside size
+- "stretch": image will be scaled to size in both dimensions
+"""
+
+import logging
+import math
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+FIT_MODES = ("cover", "contain", "stretch")
+
+# EXIF orientations that swap width and height (transpose/rotate 90/270)
+_SWAPPED_ORIENTATIONS = {5, 6, 7, 8}
+_EXIF_ORIENTATION_TAG = 274
+
+
+def required_size(
+    image_size: tuple[int, int],
+    target_size: tuple[int, int],
+    fit: str = "cover",
+) -> tuple[int, int]:
+    """
+    Smallest image size that can be fitted to target_size without upscaling.
+
+    Args:
+        image_size: Source size (width, height)
+        target_size: Output size (width, height)
+        fit: "cover", "contain" or "stretch"
+
+    Returns:
+        Minimum (width, height), never larger than image_size
+    """
+    if fit not in FIT_MODES:
+        raise ValueError(f"Unknown fit mode: {fit}. Available: {', '.join(FIT_MODES)}")
+
+    img_w, img_h = image_size
+    target_w, target_h = target_size
+
+    if fit == "stretch":
+        return min(img_w, target_w), min(img_h, target_h)
+
+    pick = max if fit == "cover" else min
+    scale = min(1.0, pick(target_w / img_w, target_h / img_h))
+    return max(1, math.ceil(img_w * scale)), max(1, math.ceil(img_h * scale))
+
+
+def load_image(
+    path: Path,
+    target_size: Optional[tuple[int, int]] = None,
+    fit: str = "cover",
+) -> Image.Image:
+    """
+    Open a photo with EXIF orientation applied, decoded near target_size.
+
+    The returned image is at least as large as needed to produce
+    target_size with the given fit (see required_size), but usually much
+    smaller than the original. Mode is kept as decoded; callers convert.
+
+    Args:
+        path: Photo file
+        target_size: Final output size (width, height) in displayed
+            orientation; None decodes at full resolution
+        fit: How the caller will fit the image to target_size
+
+    Returns:
+        Loaded image (file handle closed)
+
+    Raises:
+        OSError: If the file cannot be read or decoded
+    """
+    with Image.open(path) as img:
+        if target_size is None:
+            return ImageOps.exif_transpose(img)
+
+        # Decoder works in stored orientation
+        orientation = img.getexif().get(_EXIF_ORIENTATION_TAG, 1)
+        target = tuple(target_size)
+        if orientation in _SWAPPED_ORIENTATIONS:
+            target = target[1], target[0]
+        needed = required_size(img.size, target, fit)
+
+        original_size = img.size
+        img.draft(img.mode, needed)  # No-op for formats without decoder scaling
+        img.load()
+
+        # Box-reduce what the decoder could not (integer factor, still >= needed)
+        factor = min(img.size[0] // needed[0], img.size[1] // needed[1])
+        if factor >= 2:
+            img = img.reduce(factor)
+
+        if img.size != original_size:
+            logger.debug(f"Decoded {Path(path).name} at {img.size} (original {original_size})")
+
+        # Returns a new image (also without rotation), detached from the file
+        return ImageOps.exif_transpose(img)
+
+
+def fit_image(img: Image.Image, size: tuple[int, int], fit: str = "cover") -> Image.Image:
+    """
+    Resize an (oriented) image to the story frame.
+
+    Args:
+        img: Source image
+        size: Target size (width, height)
+        fit: "cover" (scale to fill, center crop to exactly size),
+            "contain" (scale to fit inside size) or "stretch"
+
+    Returns:
+        Resized image (LANCZOS)
+    """
+    if fit not in FIT_MODES:
+        raise ValueError(f"Unknown fit mode: {fit}. Available: {', '.join(FIT_MODES)}")
+
+    target_w, target_h = size
+    img_w, img_h = img.size
+
+    if fit == "stretch":
+        return img.resize((target_w, target_h), Image.Resampling.LANCZOS)
+
+    if fit == "contain":
+        scale = min(target_w / img_w, target_h / img_h)
+        new_size = (max(1, round(img_w * scale)), max(1, round(img_h * scale)))
+        return img.resize(new_size, Image.Resampling.LANCZOS)
+
+    # Calculate scale to cover the target area
+    scale = max(target_w / img_w, target_h / img_h)
+    new_w = int(img_w * scale)
+    new_h = int(img_h * scale)
+
+    img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+
+    # Center crop to target dimensions
+    left = (new_w - target_w) // 2
+    top = (new_h - target_h) // 2
+    return img.crop((left, top, left + target_w, top + target_h))
@@ -0,0 +1,99 @@
+"""
+JSON index files shared by several processes.
+
+The bot and render workers (separate containers sharing ./data and
+./media) each keep an in-memory copy of the same index. Writing one
+process' view would drop entries added by the others since it was
+loaded, and a fixed temp file name lets two writers interleave before
+the rename.
+
+Saves therefore take an exclusive lock (a .lock file next to the index),
+re-read the file, merge the in-memory entries into it and replace it via
+a temp file unique to the writer.
+"""
+
+import json
+import logging
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, merging still applies
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock for an index file (blocks other processes)."""
+    with open(path.with_name(f"{path.name}.lock"), "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write JSON through a temp file unique to this writer, then rename."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def save_json_index(
+    path: Path,
+    index: dict[str, dict],
+    merge: Optional[Callable[[dict, dict], dict]] = None,
+    drop: Optional[Callable[[str], bool]] = None,
+) -> dict[str, dict]:
+    """
+    Merge in-memory entries into an index file and save it.
+
+    Args:
+        path: Index file
+        index: This process' entries (win over stored ones unless merge
+            decides otherwise)
+        merge: Combine (stored entry, own entry) for keys in both
+        drop: Keys to remove from the result (e.g. pruned entries that
+            another process still had)
+
+    Returns:
+        Merged index as written (adopt it to see other processes' entries)
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _locked(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                merged = json.load(f)
+        except FileNotFoundError:
+            merged = {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Replacing unreadable index {path.name}: {e}")
+            merged = {}
+
+        for key, entry in index.items():
+            stored = merged.get(key)
+            merged[key] = merge(stored, entry) if merge and stored else entry
+        if drop:
+            merged = {key: entry for key, entry in merged.items() if not drop(key)}
+
+        write_json_atomic(path, merged)
+    return merged
@@ -0,0 +1,128 @@
+"""
+Size-bounded directory of files with least recently used eviction.
+
+Shared by the render cache and the photo store: both keep plain files in
+a directory, track access through the file mtime (survives restarts
+without an index) and drop the least recently used files once the
+directory exceeds its size limit. Dot files are temp files still being
+written and are never counted or evicted.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class LruDirectory:
+    """
+    Directory bounded in total size, evicted least recently used first.
+
+    Safe to use from several threads; hit/miss counters are kept per
+    instance (per process).
+    """
+
+    def __init__(self, path: Path, max_size_mb: int, name: str = "files"):
+        """
+        Initialize the directory.
+
+        Args:
+            path: Directory (created if missing)
+            max_size_mb: Total size limit
+            name: Label for log messages ("render cache", "photo store")
+        """
+        self.path = Path(path)
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.name = name
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def touch(self, entry: Path) -> bool:
+        """
+        Mark an entry as recently used and count the lookup.
+
+        Returns:
+            True if the entry exists (hit), False on miss
+        """
+        try:
+            os.utime(entry)  # LRU: bump last access
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def _entries(self) -> list[Path]:
+        return [f for f in self.path.iterdir() if f.is_file() and not f.name.startswith(".")]
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until under max size.
+
+        Returns:
+            Number of removed entries
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            for item in self._entries():
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return 0
+
+            removed = 0
+            for _, size, item in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    item.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+
+        if removed:
+            logger.info(f"{self.name.capitalize()} evicted {removed} entries ({total / 1024 / 1024:.0f} MB left)")
+        return removed
+
+    def clear(self) -> int:
+        """Delete all entries (temp files being written are kept)."""
+        removed = 0
+        with self._lock:
+            for item in self._entries():
+                try:
+                    item.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+        return removed
+
+    def get_stats(self) -> dict:
+        """Get directory statistics."""
+        sizes = []
+        for item in self._entries():
+            try:
+                sizes.append(item.stat().st_size)
+            except FileNotFoundError:
+                pass  # Evicted meanwhile
+        return {
+            "entries": len(sizes),
+            "size_mb": round(sum(sizes) / 1024 / 1024, 1),
+            "max_size_mb": self.max_bytes // (1024 * 1024),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
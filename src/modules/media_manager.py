@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
 
+
 logger = logging.getLogger(__name__)
 
 # Supported file extensions
@@ -182,6 +183,14 @@ class MediaManager:
         """Get count of music tracks."""
         return len(self._music_cache)
 
+    def get_music_files(self) -> list[MediaFile]:
+        """Get all scanned music tracks."""
+        return list(self._music_cache)
+
+    def get_photo_files(self) -> list[MediaFile]:
+        """Get all scanned photos (every category)."""
+        return [photo for photos in self._photos_cache.values() for photo in photos]
+
     def find_photos_for_category(
         self,
         category_id: str,
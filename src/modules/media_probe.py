@@ -0,0 +1,505 @@
+"""
+Persistent cache of media probe results.
+
+Every series plan asked ffprobe for the music duration, and single story
+renders asked again, so the hot path spawned a process per render for
+files that never change. The cache probes each file once and keeps
+duration, container, bitrate and the stream layout in a JSON index
+(data/media_probe.json) keyed by path, size and mtime; a replaced file
+is probed again on next use.
+
+Loudness (EBU R128 integrated loudness, true peak, loudness range) is
+measured by a separate, slower pass: the whole track is decoded once by
+FFmpeg's loudnorm analysis. Renders turn the stored measurements into a
+single gain (see LoudnessInfo.gain_db) instead of a two-pass loudnorm
+per story.
+
+Entries are filled lazily (first use) or in bulk (`python main.py
+probe-library [--loudness]`). Without ffprobe (e.g. the imageio-ffmpeg binary alone,
+see ffmpeg_capabilities) the stream info is parsed from the `ffmpeg -i`
+banner instead.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .json_index import save_json_index
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored fields change (old entries are probed again)
+PROBE_FORMAT_VERSION = 1
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_BITRATE_RE = re.compile(r"bitrate:\s*(\d+)\s*kb/s")
+_INPUT_RE = re.compile(r"Input #0, ([^,]+(?:,[^,]+)*?), from")
+_STREAM_RE = re.compile(r"Stream #0:(\d+)[^:]*: (Audio|Video|Subtitle|Data): (\w+)(.*)")
+_SAMPLE_RATE_RE = re.compile(r"(\d+) Hz")
+_LAYOUT_RE = re.compile(r"\d+ Hz, ([^,]+)")
+_SIZE_RE = re.compile(r"(\d{2,5})x(\d{2,5})")
+_STREAM_BITRATE_RE = re.compile(r"(\d+) kb/s")
+# loudnorm prints its measurements as the last JSON object of stderr
+_LOUDNORM_JSON_RE = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}")
+
+
+@dataclass
+class StreamInfo:
+    """One stream of a media file."""
+    index: int
+    codec_type: str  # "audio", "video", ...
+    codec: str
+    sample_rate: Optional[int] = None  # Audio only
+    channels: Optional[int] = None  # Audio only
+    channel_layout: Optional[str] = None  # Audio only ("stereo", "5.1", ...)
+    width: Optional[int] = None  # Video only
+    height: Optional[int] = None  # Video only
+    bit_rate: Optional[int] = None  # bit/s
+
+
+def _merge_entries(stored: dict, own: dict) -> dict:
+    """
+    Combine two processes' entries for one file.
+
+    The entry of the newer file version wins; for the same version, a
+    loudness measurement made by the other process is kept.
+    """
+    if stored.get("mtime_ns", 0) > own.get("mtime_ns", 0):
+        return stored
+    same_file = all(stored.get(k) == own.get(k) for k in ("version", "mtime_ns", "size"))
+    if same_file and stored["info"].get("loudness") and not own["info"].get("loudness"):
+        own = {**own, "info": {**own["info"], "loudness": stored["info"]["loudness"]}}
+    return own
+
+
+@dataclass
+class LoudnessInfo:
+    """EBU R128 measurements of a whole track."""
+    integrated: float  # LUFS
+    true_peak: float  # dBTP
+    lra: float  # Loudness range, LU
+    threshold: float  # Gating threshold, LUFS
+
+    def gain_db(self, target: float, true_peak_limit: float = -1.5) -> float:
+        """
+        Linear gain that brings the track to the target loudness.
+
+        Same result as loudnorm's linear mode: the gain is lowered when
+        the loudness target would push peaks over true_peak_limit, so
+        quiet tracks with loud peaks end up below the target instead of
+        being compressed.
+
+        Args:
+            target: Integrated loudness target, LUFS
+            true_peak_limit: Maximum true peak after the gain, dBTP
+
+        Returns:
+            Gain in dB (0 for silent tracks)
+        """
+        if not math.isfinite(self.integrated) or self.integrated < -70:
+            return 0.0
+        gain = target - self.integrated
+        if math.isfinite(self.true_peak):
+            gain = min(gain, true_peak_limit - self.true_peak)
+        return gain
+
+
+@dataclass
+class MediaInfo:
+    """Probe result of one media file."""
+    duration: Optional[float]  # Seconds
+    format_name: Optional[str] = None  # Container ("mp3", "mov,mp4,m4a,...")
+    bit_rate: Optional[int] = None  # Overall bit/s
+    streams: list[StreamInfo] = field(default_factory=list)
+    loudness: Optional[LoudnessInfo] = None  # Measured on demand (see MediaProbeCache.loudness)
+
+    @property
+    def audio(self) -> Optional[StreamInfo]:
+        """First audio stream."""
+        return next((s for s in self.streams if s.codec_type == "audio"), None)
+
+    @property
+    def video(self) -> Optional[StreamInfo]:
+        """First video stream (embedded cover art of music files included)."""
+        return next((s for s in self.streams if s.codec_type == "video"), None)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MediaInfo":
+        return cls(
+            duration=data.get("duration"),
+            format_name=data.get("format_name"),
+            bit_rate=data.get("bit_rate"),
+            streams=[StreamInfo(**s) for s in data.get("streams", [])],
+            loudness=LoudnessInfo(**data["loudness"]) if data.get("loudness") else None,
+        )
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float_or_none(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MediaProbeCache:
+    """
+    Probe results of media files, persisted across runs.
+
+    Thread-safe; with index_path=None results are kept in memory only.
+    """
+
+    def __init__(self, index_path: Optional[Path], ffmpeg_path: str, ffprobe_path: Optional[str] = None):
+        """
+        Initialize probe cache.
+
+        Args:
+            index_path: JSON index file (None = in-memory only)
+            ffmpeg_path: Path to FFmpeg executable
+            ffprobe_path: Path to ffprobe (None = parse FFmpeg output),
+                see FFmpegCapabilities.ffprobe_path
+        """
+        self.index_path = Path(index_path) if index_path else None
+        self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
+
+        self._lock = threading.Lock()
+        self._index: dict[str, dict] = {}
+        self._analysis_locks: dict[str, threading.Lock] = {}  # One loudness analysis per file at a time
+        self.hits = 0
+        self.misses = 0
+
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Load probe index from disk."""
+        if not self.index_path or not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+            logger.debug(f"Loaded {len(self._index)} probe results from {self.index_path}")
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Failed to load media probe index, starting fresh: {e}")
+            self._index = {}
+
+    def _save_index(self, drop: Optional[Callable[[str], bool]] = None) -> None:
+        """Merge with the file on disk and persist (lock held, see json_index)."""
+        if not self.index_path:
+            return
+        try:
+            self._index = save_json_index(self.index_path, self._index, merge=_merge_entries, drop=drop)
+        except OSError as e:
+            logger.warning(f"Failed to save media probe index: {e}")
+
+    @staticmethod
+    def _is_fresh(stat: os.stat_result, entry: Optional[dict]) -> bool:
+        """Check that an index entry matches the current file."""
+        return bool(
+            entry
+            and entry.get("version") == PROBE_FORMAT_VERSION
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+        )
+
+    def get(self, media_path: Path, save: bool = True) -> Optional[MediaInfo]:
+        """
+        Get probe result of a file, probing it if unknown or changed.
+
+        Args:
+            media_path: Audio or video file
+            save: Persist the index after a new probe (bulk probing saves once)
+
+        Returns:
+            Media info, or None if the file is missing or cannot be probed
+        """
+        media_path = Path(media_path)
+        try:
+            stat = media_path.stat()
+        except OSError as e:
+            logger.warning(f"Cannot probe {media_path}: {e}")
+            return None
+        key = str(media_path.resolve())
+
+        with self._lock:
+            entry = self._index.get(key)
+            if self._is_fresh(stat, entry):
+                self.hits += 1
+                return MediaInfo.from_dict(entry["info"])
+            self.misses += 1
+
+        info = self._probe(media_path)
+        if info is None:
+            return None
+
+        with self._lock:
+            self._index[key] = {
+                "version": PROBE_FORMAT_VERSION,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "info": info.to_dict(),
+            }
+            if save:
+                self._save_index()
+        return info
+
+    def loudness(self, media_path: Path, save: bool = True, analyze: bool = True) -> Optional[LoudnessInfo]:
+        """
+        Get loudness measurements of a track, analyzing it if needed.
+
+        The analysis decodes the whole track once; afterwards the result
+        is stored with the probe entry.
+
+        Args:
+            media_path: Audio file
+            save: Persist the index after a new analysis
+            analyze: Analyze a track without stored measurements (False =
+                return None for it)
+
+        Returns:
+            Measurements, or None if the track cannot be analyzed
+        """
+        info = self.get(media_path, save=save)
+        if info is None:
+            return None
+        if info.loudness:
+            return info.loudness
+        if not analyze:
+            return None
+
+        key = str(Path(media_path).resolve())
+        with self._lock:
+            analysis_lock = self._analysis_locks.setdefault(key, threading.Lock())
+
+        # Parallel stories of a series wait for the first analysis instead of repeating it
+        with analysis_lock:
+            with self._lock:
+                entry = self._index.get(key)
+                if entry and entry["info"].get("loudness"):
+                    return LoudnessInfo(**entry["info"]["loudness"])
+
+            loudness = self._analyze_loudness(Path(media_path))
+            if loudness is None:
+                return None
+
+            with self._lock:
+                entry = self._index.get(key)
+                if entry:
+                    entry["info"]["loudness"] = asdict(loudness)
+                    if save:
+                        self._save_index()
+        return loudness
+
+    def _analyze_loudness(self, media_path: Path) -> Optional[LoudnessInfo]:
+        """Measure a track with the first (analysis) pass of loudnorm."""
+        logger.info(f"Analyzing loudness: {media_path.name}")
+        try:
+            result = subprocess.run(
+                [
+                    self.ffmpeg_path, "-hide_banner", "-nostats",
+                    "-i", str(media_path),
+                    "-map", "0:a:0",
+                    "-af", "loudnorm=print_format=json",
+                    "-f", "null", "-",
+                ],
+                capture_output=True,
+                text=True,
+                timeout=300,
+            )
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.warning(f"Loudness analysis of {media_path.name} failed: {e}")
+            return None
+
+        matches = _LOUDNORM_JSON_RE.findall(result.stderr)
+        if result.returncode != 0 or not matches:
+            logger.warning(f"Loudness analysis of {media_path.name} failed: {result.stderr.strip()[-300:]}")
+            return None
+
+        data = json.loads(matches[-1])
+        loudness = LoudnessInfo(
+            integrated=float(data["input_i"]),
+            true_peak=float(data["input_tp"]),
+            lra=float(data["input_lra"]),
+            threshold=float(data["input_thresh"]),
+        )
+        logger.info(
+            f"Loudness of {media_path.name}: {loudness.integrated:.1f} LUFS, "
+            f"peak {loudness.true_peak:.1f} dBTP, LRA {loudness.lra:.1f} LU"
+        )
+        return loudness
+
+    def duration(self, media_path: Path) -> Optional[float]:
+        """Duration of a file in seconds (None if unknown)."""
+        info = self.get(media_path)
+        return info.duration if info else None
+
+    def _probe(self, media_path: Path) -> Optional[MediaInfo]:
+        """Run ffprobe (or FFmpeg) on a file."""
+        try:
+            if self.ffprobe_path:
+                return self._probe_ffprobe(media_path)
+            return self._probe_ffmpeg(media_path)
+        except (subprocess.TimeoutExpired, OSError, ValueError) as e:
+            logger.warning(f"Could not probe {media_path}: {e}")
+            return None
+
+    def _probe_ffprobe(self, media_path: Path) -> Optional[MediaInfo]:
+        """Probe with ffprobe JSON output."""
+        result = subprocess.run(
+            [
+                self.ffprobe_path,
+                "-v", "error",
+                "-show_entries",
+                "format=duration,format_name,bit_rate:"
+                "stream=index,codec_type,codec_name,sample_rate,channels,channel_layout,width,height,bit_rate",
+                "-of", "json",
+                str(media_path),
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        if result.returncode != 0:
+            logger.warning(f"ffprobe failed for {media_path.name}: {result.stderr.strip()[-300:]}")
+            return None
+
+        data = json.loads(result.stdout or "{}")
+        fmt = data.get("format", {})
+        streams = [
+            StreamInfo(
+                index=s.get("index", i),
+                codec_type=s.get("codec_type", "unknown"),
+                codec=s.get("codec_name", "unknown"),
+                sample_rate=_int_or_none(s.get("sample_rate")),
+                channels=_int_or_none(s.get("channels")),
+                channel_layout=s.get("channel_layout"),
+                width=_int_or_none(s.get("width")),
+                height=_int_or_none(s.get("height")),
+                bit_rate=_int_or_none(s.get("bit_rate")),
+            )
+            for i, s in enumerate(data.get("streams", []))
+        ]
+        return MediaInfo(
+            duration=_float_or_none(fmt.get("duration")),
+            format_name=fmt.get("format_name"),
+            bit_rate=_int_or_none(fmt.get("bit_rate")),
+            streams=streams,
+        )
+
+    def _probe_ffmpeg(self, media_path: Path) -> Optional[MediaInfo]:
+        """Probe by parsing the input banner of `ffmpeg -i` (no ffprobe available)."""
+        # Exits with an error ("At least one output file must be specified"); the banner is complete
+        result = subprocess.run(
+            [self.ffmpeg_path, "-hide_banner", "-i", str(media_path)],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        stderr = result.stderr
+        duration_match = _DURATION_RE.search(stderr)
+        if not duration_match:
+            logger.warning(f"FFmpeg could not read {media_path.name}: {stderr.strip()[-300:]}")
+            return None
+
+        hours, minutes, seconds = duration_match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        bitrate = _BITRATE_RE.search(stderr)
+        container = _INPUT_RE.search(stderr)
+
+        streams = []
+        for line in stderr.splitlines():
+            match = _STREAM_RE.search(line)
+            if not match:
+                continue
+            index, kind, codec, rest = match.groups()
+            stream = StreamInfo(index=int(index), codec_type=kind.lower(), codec=codec)
+            stream_bitrate = _STREAM_BITRATE_RE.search(rest)
+            if stream_bitrate:
+                stream.bit_rate = int(stream_bitrate.group(1)) * 1000
+            if stream.codec_type == "audio":
+                sample_rate = _SAMPLE_RATE_RE.search(rest)
+                layout = _LAYOUT_RE.search(rest)
+                stream.sample_rate = int(sample_rate.group(1)) if sample_rate else None
+                if layout:
+                    stream.channel_layout = layout.group(1).strip()
+                    stream.channels = {"mono": 1, "stereo": 2}.get(stream.channel_layout)
+            elif stream.codec_type == "video":
+                size = _SIZE_RE.search(rest)
+                if size:
+                    stream.width, stream.height = int(size.group(1)), int(size.group(2))
+            streams.append(stream)
+
+        return MediaInfo(
+            duration=duration,
+            format_name=container.group(1) if container else None,
+            bit_rate=int(bitrate.group(1)) * 1000 if bitrate else None,
+            streams=streams,
+        )
+
+    def probe_all(self, media_paths: Iterable[Path], max_workers: int = 4, loudness: bool = False) -> int:
+        """
+        Probe every file that has no fresh entry (index saved once at the end).
+
+        Args:
+            media_paths: Files to probe
+            max_workers: Parallel probe processes
+            loudness: Also measure loudness of every file (full decode)
+
+        Returns:
+            Number of files with a probe result (and loudness, if requested)
+        """
+        paths = [Path(p) for p in media_paths]
+        probe = self.loudness if loudness else self.get
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            results = list(pool.map(lambda p: probe(p, save=False), paths))
+        with self._lock:
+            self._save_index()
+
+        ready = sum(1 for r in results if r is not None)
+        logger.info(f"Media probe: {ready}/{len(paths)} files known")
+        return ready
+
+    def prune(self, media_paths: Iterable[Path]) -> int:
+        """
+        Drop entries of files that are no longer in the library.
+
+        Returns:
+            Number of entries removed
+        """
+        keep = {str(Path(p).resolve()) for p in media_paths}
+        with self._lock:
+            stale = [key for key in self._index if key not in keep]
+            for key in stale:
+                del self._index[key]
+            if stale:
+                # Also drops stale entries that only other processes had
+                self._save_index(drop=lambda key: key not in keep)
+        return len(stale)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "loudness": sum(1 for e in self._index.values() if e["info"].get("loudness")),
+                "hits": self.hits,
+                "misses": self.misses,
+                "backend": "ffprobe" if self.ffprobe_path else "ffmpeg",
+            }
@@ -0,0 +1,249 @@
+"""
+Pre-transcoded music library.
+
+Every music track is transcoded once to AAC (M4A) at the target audio
+bitrate. Story renders then stream-copy the needed slice from the
+derivative instead of re-encoding audio for every story.
+
+Derivatives live in the writable data directory (data/music_cache/, the
+media library may be mounted read-only) and are indexed by source path, size and mtime, so replacing a track triggers a
+fresh transcode on next use.
+
+Loudness normalisation gain (see VideoComposer.music_gain_db) is baked
+into the derivative, so normalised stories still stream-copy audio.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+from .json_index import save_json_index
+
+logger = logging.getLogger(__name__)
+
+class MusicTranscodeCache:
+    """
+    AAC derivatives of music tracks, transcoded lazily or in bulk.
+
+    Falls back to the source track (returns None) whenever the cache
+    directory is not writable or FFmpeg fails.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ffmpeg_path: str,
+        audio_bitrate: str = "192k",
+    ):
+        """
+        Initialize music cache.
+
+        Args:
+            cache_dir: Directory for transcoded files (e.g. data/music_cache)
+            ffmpeg_path: Path to FFmpeg executable
+            audio_bitrate: AAC bitrate for derivatives (should match VideoConfig.audio_bitrate)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ffmpeg_path = ffmpeg_path
+        self.audio_bitrate = audio_bitrate
+        self.index_path = self.cache_dir / "index.json"
+
+        self._lock = threading.Lock()  # Index only, never held while transcoding
+        self._index: dict[str, dict] = {}
+        self._transcode_locks: dict[str, threading.Lock] = {}  # One transcode per track at a time
+        self._disabled = False
+
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Load derivative index from disk."""
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+            logger.debug(f"Loaded {len(self._index)} music derivatives from {self.index_path}")
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Failed to load music cache index, starting fresh: {e}")
+            self._index = {}
+
+    def _save_index(self, drop: Optional[Callable[[str], bool]] = None) -> None:
+        """Merge with the file on disk and persist (lock held, see json_index)."""
+        self._index = save_json_index(self.index_path, self._index, drop=drop)
+
+    def _derived_name(self, source: Path, gain_db: float = 0.0) -> str:
+        """File name of the derivative for a source track."""
+        key = f"{source.resolve()}|{self.audio_bitrate}"
+        if gain_db:
+            key += f"|{gain_db:+.1f}dB"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".m4a"
+
+    def _is_fresh(self, source: Path, entry: Optional[dict], gain_db: float = 0.0) -> bool:
+        """Check that an index entry matches the current source file."""
+        if not entry:
+            return False
+        stat = source.stat()
+        return (
+            entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+            and entry.get("bitrate") == self.audio_bitrate
+            and entry.get("gain_db", 0.0) == gain_db
+            and (self.cache_dir / entry["file"]).exists()
+        )
+
+    def get(self, source: Path, gain_db: float = 0.0) -> Optional[Path]:
+        """
+        Get AAC derivative for a track, transcoding it if needed.
+
+        Args:
+            source: Path to original music file
+            gain_db: Volume change applied during the transcode (rounded
+                to 0.1 dB; a different gain replaces the derivative)
+
+        Returns:
+            Path to .m4a derivative, or None if unavailable (use the source)
+        """
+        if self._disabled:
+            return None
+
+        source = Path(source)
+        key = str(source.resolve())
+        gain_db = round(gain_db, 1)
+
+        with self._lock:
+            entry = self._index.get(key)
+            if self._is_fresh(source, entry, gain_db):
+                return self.cache_dir / entry["file"]
+            transcode_lock = self._transcode_locks.setdefault(key, threading.Lock())
+
+        # Parallel stories of the same track wait for one transcode; other tracks are not blocked
+        with transcode_lock:
+            with self._lock:
+                entry = self._index.get(key)
+                if self._is_fresh(source, entry, gain_db):
+                    return self.cache_dir / entry["file"]
+            if self._disabled:
+                return None
+            return self._transcode(source, key, gain_db)
+
+    def _transcode(self, source: Path, key: str, gain_db: float = 0.0) -> Optional[Path]:
+        """Transcode source to AAC and record it in the index (track's transcode lock held)."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            # e.g. media/ mounted read-only in Docker
+            logger.warning(f"Music cache disabled, cannot create {self.cache_dir}: {e}")
+            self._disabled = True
+            return None
+
+        derived = self.cache_dir / self._derived_name(source, gain_db)
+        # Unique per writer: workers sharing the library may transcode the same track
+        tmp_path = derived.with_name(f".{derived.name}.{uuid.uuid4().hex}.tmp.m4a")
+
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            "-i", str(source),
+            "-vn",  # Drop embedded cover art
+            "-map_metadata", "-1",
+        ]
+        if gain_db:
+            cmd.extend(["-af", f"volume={gain_db:.1f}dB"])
+        cmd.extend([
+            "-c:a", "aac",
+            "-b:a", self.audio_bitrate,
+            "-movflags", "+faststart",
+            str(tmp_path),
+        ])
+
+        gain = f", gain {gain_db:+.1f} dB" if gain_db else ""
+        logger.info(f"Transcoding music to AAC {self.audio_bitrate}{gain}: {source.name}")
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Music transcode timed out: {source.name}")
+            return None
+
+        if result.returncode != 0 or not tmp_path.exists():
+            logger.warning(f"Music transcode failed for {source.name}: {result.stderr[-300:]}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return None
+
+        os.replace(tmp_path, derived)
+
+        stat = source.stat()
+        with self._lock:
+            # Derivative made with a previous gain or bitrate
+            previous = self._index.get(key)
+            if previous and previous["file"] != derived.name:
+                (self.cache_dir / previous["file"]).unlink(missing_ok=True)
+
+            self._index[key] = {
+                "file": derived.name,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "bitrate": self.audio_bitrate,
+                "gain_db": gain_db,
+            }
+            try:
+                self._save_index()
+            except OSError as e:
+                logger.warning(f"Failed to save music cache index: {e}")
+
+        return derived
+
+    def transcode_all(
+        self,
+        sources: list[Path],
+        gain_db: Optional[Callable[[Path], float]] = None,
+    ) -> int:
+        """
+        Transcode every track that has no fresh derivative.
+
+        Args:
+            sources: Paths of music files to prepare
+            gain_db: Normalisation gain of a track (None = no gain)
+
+        Returns:
+            Number of tracks with a ready derivative
+        """
+        ready = 0
+        for source in sources:
+            if self.get(source, gain_db(source) if gain_db else 0.0):
+                ready += 1
+        logger.info(f"Music cache: {ready}/{len(sources)} tracks ready")
+        return ready
+
+    def prune(self, sources: list[Path]) -> int:
+        """
+        Delete derivatives whose source track no longer exists in the library.
+
+        Returns:
+            Number of derivatives removed
+        """
+        keep = {str(Path(s).resolve()) for s in sources}
+        removed = 0
+        with self._lock:
+            # Pick up derivatives other processes created, so their files are deleted too
+            try:
+                self._save_index()
+            except OSError as e:
+                logger.warning(f"Failed to merge music cache index: {e}")
+            for key in list(self._index):
+                if key in keep:
+                    continue
+                derived = self.cache_dir / self._index[key]["file"]
+                if derived.exists():
+                    derived.unlink()
+                del self._index[key]
+                removed += 1
+            if removed:
+                self._save_index(drop=lambda key: key not in keep)
+        return removed
@@ -0,0 +1,187 @@
+"""
+Pre-normalized story photo derivatives.
+
+Library photos are often multi-megapixel HEIC/AVIF files, and the same
+photo is rendered many times over its lifetime. Every render used to
+decode the original, apply EXIF orientation and resize it to story size.
+The store does this once per photo and keeps the result as a JPEG:
+
+- "cover": scaled and center-cropped to fill the story frame (overlay
+  base image, Telegram preview)
+- "contain": scaled to fit inside the story frame (static stories
+  without overlay, padded by FFmpeg as before)
+
+Derivatives are keyed by content hash plus mtime of the source, created
+lazily or in bulk, and evicted least recently used (file mtime = last
+access) when the store exceeds its size limit.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+from PIL import Image
+
+from .image_loader import fit_image, load_image
+from .lru_directory import LruDirectory
+from .render_cache import hash_file
+
+logger = logging.getLogger(__name__)
+
+# Bump when derivative generation changes (resampling, quality, ...)
+STORE_FORMAT_VERSION = "1"
+
+FIT_MODES = ("cover", "contain")
+
+
+class PhotoStore:
+    """
+    Size-bounded store of story-sized photo derivatives.
+
+    Safe to use from several render threads: a derivative is written to
+    a unique temp file and moved into place, so concurrent requests for
+    the same photo at worst do the work twice.
+    """
+
+    def __init__(
+        self,
+        store_dir: Path,
+        size: tuple[int, int] = (1080, 1920),
+        max_size_mb: int = 1024,
+        quality: int = 95,
+    ):
+        """
+        Initialize photo store.
+
+        Args:
+            store_dir: Directory for derivatives (created if missing)
+            size: Story frame size (width, height)
+            max_size_mb: Total size limit; least recently used files are evicted
+            quality: JPEG quality of derivatives
+        """
+        self.store_dir = Path(store_dir)
+        self.size = tuple(size)
+        self.quality = quality
+        self._files = LruDirectory(self.store_dir, max_size_mb, name="photo store")
+
+        self._lock = threading.Lock()
+        self._hashes: dict[str, tuple[int, int, str]] = {}  # path -> (mtime_ns, size, sha256)
+
+    def _content_hash(self, photo_path: Path) -> tuple[str, int]:
+        """SHA-256 and mtime of a photo (hashed once per file version)."""
+        stat = photo_path.stat()
+        key = str(photo_path.resolve())
+        with self._lock:
+            cached = self._hashes.get(key)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2], stat.st_mtime_ns
+
+        digest = hash_file(photo_path)
+        with self._lock:
+            self._hashes[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest, stat.st_mtime_ns
+
+    def _derivative_path(self, photo_path: Path, fit: str) -> Path:
+        digest, mtime_ns = self._content_hash(photo_path)
+        w, h = self.size
+        key = f"{STORE_FORMAT_VERSION}|{digest}|{mtime_ns}|{w}x{h}|{fit}|q{self.quality}"
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.store_dir / f"{name}.jpg"
+
+    def get(self, photo_path: Path, fit: str = "cover") -> Optional[Path]:
+        """
+        Get the derivative of a photo, creating it if needed.
+
+        Args:
+            photo_path: Original photo
+            fit: "cover" (fill and crop) or "contain" (fit inside)
+
+        Returns:
+            Path to derivative JPEG, or None if the photo cannot be processed
+            (callers fall back to the original)
+        """
+        if fit not in FIT_MODES:
+            raise ValueError(f"Unknown fit mode: {fit}. Available: {', '.join(FIT_MODES)}")
+
+        photo_path = Path(photo_path)
+        try:
+            derived = self._derivative_path(photo_path, fit)
+            if self._files.touch(derived):
+                return derived
+            self._create(photo_path, derived, fit)
+        except Exception as e:
+            logger.warning(f"Photo store failed for {photo_path.name}: {e}")
+            return None
+
+        self._files.evict()
+        return derived
+
+    def open(self, photo_path: Path, fit: str = "cover") -> Optional[Image.Image]:
+        """
+        Load the derivative of a photo as an RGB image.
+
+        Returns:
+            Loaded image, or None if the photo cannot be processed
+        """
+        derived = self.get(photo_path, fit)
+        if derived is None:
+            return None
+        try:
+            with Image.open(derived) as img:
+                return img.convert("RGB")
+        except OSError as e:
+            # Evicted by another thread or damaged file
+            logger.warning(f"Failed to read photo derivative {derived.name}: {e}")
+            return None
+
+    def _create(self, photo_path: Path, derived: Path, fit: str) -> None:
+        """Decode, orient, resize and save one derivative."""
+        # Decoded near story size (JPEG draft mode), then resampled
+        img = load_image(photo_path, self.size, fit)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img = fit_image(img, self.size, fit)
+
+        tmp_path = derived.with_name(f".{derived.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            img.save(tmp_path, "JPEG", quality=self.quality)
+            os.replace(tmp_path, derived)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        logger.debug(f"Photo derivative created: {photo_path.name} -> {derived.name} ({fit})")
+
+    def build_all(
+        self,
+        photo_paths: Iterable[Path],
+        fits: tuple[str, ...] = ("cover",),
+        max_workers: int = 4,
+    ) -> int:
+        """
+        Create missing derivatives for many photos in parallel.
+
+        Args:
+            photo_paths: Photos to prepare
+            fits: Fit modes to create for every photo
+            max_workers: Parallel decode threads (Pillow releases the GIL)
+
+        Returns:
+            Number of derivatives ready
+        """
+        tasks = [(Path(p), fit) for p in photo_paths for fit in fits]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            results = list(pool.map(lambda task: self.get(*task), tasks))
+
+        ready = sum(1 for r in results if r is not None)
+        logger.info(f"Photo store: {ready}/{len(tasks)} derivatives ready")
+        return ready
+
+    def get_stats(self) -> dict:
+        """Get store statistics."""
+        return self._files.get_stats()
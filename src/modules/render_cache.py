@@ -0,0 +1,135 @@
+"""
+Content-addressed cache for rendered story videos.
+
+Stores finished MP4 files under a hash of everything that affects the
+encode (photo bytes, text, font, position, effect, duration, music slice,
+video settings). Re-rendering identical inputs becomes a file link.
+
+Features:
+- Hard-link on store/fetch (falls back to copy across filesystems)
+- Size-bounded LRU eviction (file mtime = last access)
+- Safe to use from several render threads
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from .lru_directory import LruDirectory
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key layout or encoder pipeline changes incompatibly
+CACHE_FORMAT_VERSION = "1"
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link src to dst atomically, copying if linking is not possible."""
+    tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+class RenderCache:
+    """
+    Size-bounded LRU cache of rendered videos keyed by input hash.
+
+    Entries are plain files named "<key>.mp4". Access time is tracked
+    through the file mtime, which survives restarts without an index.
+    """
+
+    def __init__(self, cache_dir: Path, max_size_mb: int = 2048):
+        """
+        Initialize render cache.
+
+        Args:
+            cache_dir: Directory for cached videos (created if missing)
+            max_size_mb: Total size limit; least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self._files = LruDirectory(self.cache_dir, max_size_mb, name="render cache")
+
+    @staticmethod
+    def make_key(parts: dict) -> str:
+        """
+        Build a cache key from a dict of render inputs.
+
+        Values are serialized in sorted key order, so the same inputs
+        always give the same key.
+        """
+        digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode())
+        for name in sorted(parts):
+            digest.update(f"{name}={parts[name]!r};".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str, suffix: str = ".mp4") -> Path:
+        return self.cache_dir / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str = ".mp4") -> Optional[Path]:
+        """
+        Look up a cached file and mark it as recently used.
+
+        Returns:
+            Path to cached file, or None on miss
+        """
+        entry = self._entry_path(key, suffix)
+        return entry if self._files.touch(entry) else None
+
+    def fetch(self, key: str, output_path: Path, suffix: str = ".mp4") -> bool:
+        """
+        Materialize a cached entry at output_path.
+
+        Returns:
+            True on cache hit (output_path now exists), False on miss
+        """
+        entry = self.get(key, suffix)
+        if entry is None:
+            return False
+
+        try:
+            _link_or_copy(entry, Path(output_path))
+        except FileNotFoundError:
+            # Evicted by another thread between get() and link
+            return False
+
+        logger.info(f"Render cache hit: {Path(output_path).name} ({key[:12]})")
+        return True
+
+    def put(self, key: str, file_path: Path, suffix: str = ".mp4") -> Path:
+        """
+        Store a rendered file under key and enforce the size limit.
+
+        The source file is left in place (the cache gets its own link).
+
+        Returns:
+            Path to cached entry
+        """
+        entry = self._entry_path(key, suffix)
+        _link_or_copy(Path(file_path), entry)
+        logger.debug(f"Render cache stored: {key[:12]} ({entry.stat().st_size / 1024:.0f} KB)")
+        self._files.evict()
+        return entry
+
+    def clear(self) -> int:
+        """Delete all cached entries."""
+        return self._files.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return self._files.get_stats()
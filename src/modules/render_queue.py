@@ -0,0 +1,319 @@
+"""
+Durable render job queue in SQLite.
+
+Approved series used to be rendered inline by the process that finished
+moderation, so the bot container did all the encoding. The queue
+decouples the two: the bot enqueues a job, any number of workers
+(`python main.py worker`, possibly in separate containers sharing the
+data volume) claim and render it, and the bot delivers the result.
+
+Job lifecycle:
+- queued: waiting for a worker (also after a failed attempt, with backoff)
+- running: claimed by a worker holding a lease; workers renew the lease
+  while rendering, and an expired lease (worker crashed or was killed)
+  makes the job claimable again
+- done / failed: finished (failed = out of attempts), waiting for delivery
+- delivering: taken by the bot; a job left here (bot crashed mid-delivery)
+  is not delivered again, so the series is never recorded twice
+- delivered: result handed to the moderator
+
+Claims run in IMMEDIATE transactions, so one job is never leased to two
+workers. The database must be on a local filesystem (bind mounts shared
+by containers on one host are fine, network filesystems are not).
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ("queued", "running", "done", "failed", "delivering", "delivered")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at);
+"""
+
+
+@dataclass
+class RenderJob:
+    """One queued series render."""
+    id: int
+    content_id: str  # Moderation id of the series
+    payload: dict  # Serialized prepared series + approved stories
+    status: str
+    attempts: int  # Claims so far (including the current one)
+    result: Optional[dict] = None  # Set by the worker on success
+    error: Optional[str] = None  # Last failure
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "RenderJob":
+        return cls(
+            id=row["id"],
+            content_id=row["content_id"],
+            payload=json.loads(row["payload"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+        )
+
+
+class RenderQueue:
+    """
+    SQLite-backed queue of series render jobs with leases and retries.
+
+    Every call opens its own connection, so one queue object can be used
+    from several threads and the database from several processes.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        lease_seconds: float = 600,
+        max_attempts: int = 3,
+        retry_delay: float = 30,
+    ):
+        """
+        Initialize render queue (creates the database if missing).
+
+        Args:
+            db_path: SQLite database file
+            lease_seconds: How long a claim is valid without renewal
+            max_attempts: Claims per job before it is marked failed
+            retry_delay: Delay before a failed job is retried (doubles per attempt)
+        """
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(self, content_id: str, payload: dict) -> int:
+        """
+        Add a render job.
+
+        Args:
+            content_id: Moderation id of the series
+            payload: JSON-serializable job description
+
+        Returns:
+            Job id
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (content_id, payload, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (content_id, json.dumps(payload, ensure_ascii=False), now, now, now),
+            )
+            job_id = cursor.lastrowid
+
+        logger.info(f"Render job {job_id} queued for {content_id}")
+        return job_id
+
+    def claim(self, worker_id: str) -> Optional[RenderJob]:
+        """
+        Lease the oldest available job.
+
+        Available are queued jobs past their retry delay and running jobs
+        whose lease expired. A job that has used up its attempts is marked
+        failed instead of being handed out again.
+
+        Args:
+            worker_id: Unique id of the claiming worker (lease owner)
+
+        Returns:
+            Claimed job, or None if nothing is available
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs "
+                    "WHERE (status = 'queued' AND available_at <= ?) "
+                    "   OR (status = 'running' AND lease_expires < ?) "
+                    "ORDER BY id LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                if row["attempts"] >= self.max_attempts:
+                    # Lease expired on the last attempt (worker died mid-render)
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', lease_owner = NULL, updated_at = ?, "
+                        "error = COALESCE(error, 'lease expired') WHERE id = ?",
+                        (now, row["id"]),
+                    )
+                    logger.warning(f"Render job {row['id']} failed: out of attempts")
+                    continue
+
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                    "lease_owner = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, now, row["id"]),
+                )
+                job = RenderJob.from_row(row)
+                job.status = "running"
+                job.attempts += 1
+                break
+
+        logger.info(f"Render job {job.id} claimed by {worker_id} (attempt {job.attempts}/{self.max_attempts})")
+        return job
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """
+        Renew the lease of a running job.
+
+        Returns:
+            False if the worker no longer holds the lease (it expired and
+            the job was claimed by someone else)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (now + self.lease_seconds, now, job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result: dict) -> bool:
+        """
+        Mark a job done with its result.
+
+        Returns:
+            False if the worker lost the lease (result is discarded)
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_owner = NULL, "
+                "updated_at = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id, worker_id),
+            )
+            done = cursor.rowcount == 1
+
+        if done:
+            logger.info(f"Render job {job_id} done")
+        else:
+            logger.warning(f"Render job {job_id} finished by {worker_id} after losing its lease")
+        return done
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> None:
+        """
+        Record a failed attempt: requeue with backoff, or mark failed.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (job_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return  # Lease lost, the job belongs to another worker now
+
+            if row["attempts"] >= self.max_attempts:
+                status, available_at = "failed", now
+            else:
+                status = "queued"
+                available_at = now + self.retry_delay * 2 ** (row["attempts"] - 1)
+            conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, error = ?, lease_owner = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (status, available_at, error, now, job_id),
+            )
+
+        if status == "failed":
+            logger.error(f"Render job {job_id} failed after {row['attempts']} attempts: {error}")
+        else:
+            logger.warning(f"Render job {job_id} attempt {row['attempts']} failed, retrying: {error}")
+
+    def finished(self) -> list[RenderJob]:
+        """Jobs that are done or failed and not yet delivered (oldest first)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status IN ('done', 'failed') ORDER BY id"
+            ).fetchall()
+        return [RenderJob.from_row(row) for row in rows]
+
+    def start_delivery(self, job_id: int) -> bool:
+        """
+        Take a finished job for delivery (before its result is recorded).
+
+        Returns:
+            False if the job was already taken (another poll or process)
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'delivering', updated_at = ? "
+                "WHERE id = ? AND status IN ('done', 'failed')",
+                (time.time(), job_id),
+            )
+        return cursor.rowcount == 1
+
+    def mark_delivered(self, job_id: int) -> None:
+        """Mark a finished job as handed over."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'delivered', updated_at = ? WHERE id = ?",
+                (time.time(), job_id),
+            )
+
+    def get(self, job_id: int) -> Optional[RenderJob]:
+        """Get a job by id."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return RenderJob.from_row(row) if row else None
+
+    def get_stats(self) -> dict:
+        """Number of jobs per status."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in STATUSES}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
@@ -12,6 +12,7 @@ import asyncio
 import tempfile
 import io
 import json
+import time
 from pathlib import Path
 from typing import Optional, Callable, Awaitable
 from dataclasses import dataclass, asdict
@@ -28,8 +29,14 @@ from telegram.ext import (
     filters,
 )
 
+from .image_loader import load_image
+from .ffmpeg_progress import ProgressStream, RenderProgress
+
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between render progress edits (Telegram rate-limits edits)
+PROGRESS_EDIT_INTERVAL = 5
+
 
 class ModerationAction(Enum):
     """Possible moderation actions."""
@@ -108,6 +115,7 @@ class ModerationBot:
         on_approve: Optional[Callable[[str, str], Awaitable[None]]] = None,
         on_reject: Optional[Callable[[str], Awaitable[None]]] = None,
         on_finish_moderation: Optional[Callable[[str, list, any], Awaitable[None]]] = None,
+        photo_store=None,
     ):
         """
         Initialize moderation bot.
@@ -118,13 +126,18 @@ class ModerationBot:
             on_approve: Callback when content is approved (content_id, text)
             on_reject: Callback when content is rejected (content_id)
             on_finish_moderation: Callback when moderation is finished
-                (content_id, approved_stories, prepared_result)
+                (content_id, approved_stories, prepared_result,
+                progress_callback=...); updates passed to progress_callback
+                are shown in the "rendering" message
+            photo_store: Optional PhotoStore; previews are sent from its
+                story-sized derivatives instead of decoding originals
         """
         self.token = token
         self.moderator_chat_id = moderator_chat_id
         self.on_approve = on_approve
         self.on_reject = on_reject
         self.on_finish_moderation = on_finish_moderation
+        self.photo_store = photo_store
 
         # Store pending edits: chat_id -> content_id
         self._editing: dict[int, str] = {}
@@ -302,34 +315,36 @@ class ModerationBot:
         Returns:
             BytesIO buffer with JPEG data
         """
-        from PIL import ImageOps
         MAX_SIZE = 1280  # Max dimension for Telegram photos
 
+        # Story-framed derivative (oriented JPEG) shows what will be published
+        if self.photo_store:
+            photo_path = self.photo_store.get(photo_path, fit="cover") or photo_path
+
         try:
-            with Image.open(photo_path) as img:
-                # Apply EXIF orientation (fixes rotated photos)
-                img = ImageOps.exif_transpose(img)
-
-                # Convert to RGB if necessary (removes alpha, handles RGBA)
-                if img.mode in ('RGBA', 'P', 'LA'):
-                    # Create white background for transparency
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                # Resize if too large
-                if img.width > MAX_SIZE or img.height > MAX_SIZE:
-                    img.thumbnail((MAX_SIZE, MAX_SIZE), Image.Resampling.LANCZOS)
-
-                # Save to buffer as JPEG
-                buffer = io.BytesIO()
-                img.save(buffer, format='JPEG', quality=85, optimize=True)
-                buffer.seek(0)
-                return buffer
+            # Apply EXIF orientation (fixes rotated photos), decoded near preview size
+            img = load_image(photo_path, (MAX_SIZE, MAX_SIZE), fit="contain")
+
+            # Convert to RGB if necessary (removes alpha, handles RGBA)
+            if img.mode in ('RGBA', 'P', 'LA'):
+                # Create white background for transparency
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                if img.mode == 'P':
+                    img = img.convert('RGBA')
+                background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+                img = background
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+
+            # Resize if too large
+            if img.width > MAX_SIZE or img.height > MAX_SIZE:
+                img.thumbnail((MAX_SIZE, MAX_SIZE), Image.Resampling.LANCZOS)
+
+            # Save to buffer as JPEG
+            buffer = io.BytesIO()
+            img.save(buffer, format='JPEG', quality=85, optimize=True)
+            buffer.seek(0)
+            return buffer
 
         except Exception as e:
             logger.error(f"Failed to convert photo {photo_path}: {e}")
@@ -854,13 +869,13 @@ class ModerationBot:
             return
 
         # Update message to show processing
-        await query.edit_message_text(
-            text=f"⏳ РЕНДЕРИНГ ВИДЕО...\n\n"
-                 f"Тема: {series.subtopic}\n"
-                 f"Историй к рендерингу: {len(approved_stories)}\n"
-                 f"Удалено: {deleted_count}\n\n"
-                 f"Пожалуйста, подождите..."
+        status_text = (
+            f"⏳ РЕНДЕРИНГ ВИДЕО...\n\n"
+            f"Тема: {series.subtopic}\n"
+            f"Историй к рендерингу: {len(approved_stories)}\n"
+            f"Удалено: {deleted_count}\n\n"
         )
+        await query.edit_message_text(text=status_text + "Пожалуйста, подождите...")
 
         # Reconstruct prepared_result if it was loaded from file (None)
         prepared_result = series.prepared_result
@@ -870,11 +885,18 @@ class ModerationBot:
 
         # Call finish moderation callback
         if self.on_finish_moderation:
-            await self.on_finish_moderation(
-                content_id,
-                approved_stories,
-                prepared_result,
-            )
+            progress = ProgressStream()
+            reporter = asyncio.create_task(self._show_render_progress(query, status_text, progress))
+            try:
+                await self.on_finish_moderation(
+                    content_id,
+                    approved_stories,
+                    prepared_result,
+                    progress_callback=progress,
+                )
+            finally:
+                progress.close()
+                await reporter
 
         # Clean up memory and file
         del self._pending_prepared_series[content_id]
@@ -882,6 +904,25 @@ class ModerationBot:
 
         logger.info(f"Moderation finished for {content_id}: {len(approved_stories)} approved, {deleted_count} deleted")
 
+    async def _show_render_progress(self, query, status_text: str, progress: ProgressStream):
+        """Show the latest render progress in the status message (until the stream closes)."""
+        last_edit = time.monotonic()
+        async for update in progress:
+            if update.done or time.monotonic() - last_edit < PROGRESS_EDIT_INTERVAL:
+                continue
+            last_edit = time.monotonic()
+            try:
+                await query.edit_message_text(text=status_text + self._format_progress(update))
+            except Exception as e:
+                logger.debug(f"Progress edit skipped: {e}")
+
+    @staticmethod
+    def _format_progress(update: RenderProgress) -> str:
+        """One status line for a progress update."""
+        done = f"{update.fraction:.0%}" if update.fraction is not None else f"{update.frame} кадров"
+        speed = f", {update.speed:g}x" if update.speed else ""
+        return f"{update.output}: {done} ({update.fps:g} fps{speed})"
+
     async def _reject_content(self, query, content_id: str):
         """Reject content."""
         content = self._pending.get(content_id)
@@ -1285,18 +1326,20 @@ class ModerationBot:
         subtopic: str,
         story_count: int,
         video_paths: list[Path],
+        reel_path: Optional[Path] = None,
     ) -> bool:
         """
         Send ready videos to moderator for manual Instagram publishing.
 
         1. Send header with topic info
-        2. Send each video with numbering
+        2. Send each video with numbering (and the full reel, if rendered)
         3. Delete video files after successful sending
 
         Args:
             subtopic: Topic name
             story_count: Number of rendered videos
             video_paths: List of video file paths
+            reel_path: Whole series as one video for Reels (optional)
 
         Returns:
             True if all videos sent successfully
@@ -1325,6 +1368,8 @@ class ModerationBot:
             for i, video_path in enumerate(video_paths, 1):
                 if video_path.exists():
                     caption = f"#{i}/{len(video_paths)}"
+                    size_mb = video_path.stat().st_size / (1024 * 1024)
+                    start = time.monotonic()
                     with open(video_path, "rb") as video_file:
                         await bot.send_video(
                             chat_id=self.moderator_chat_id,
@@ -1332,10 +1377,23 @@ class ModerationBot:
                             caption=caption,
                         )
                     sent_count += 1
-                    logger.info(f"Sent video {i}/{len(video_paths)}: {video_path.name}")
+                    logger.info(
+                        f"Sent video {i}/{len(video_paths)}: {video_path.name} "
+                        f"({size_mb:.1f} MB in {time.monotonic() - start:.1f}s)"
+                    )
                 else:
                     logger.warning(f"Video not found: {video_path}")
 
+            # Whole series for Reels, from the same encode
+            if reel_path and reel_path.exists():
+                with open(reel_path, "rb") as video_file:
+                    await bot.send_video(
+                        chat_id=self.moderator_chat_id,
+                        video=video_file,
+                        caption="🎬 Вся серия одним видео (для Reels)",
+                    )
+                logger.info(f"Sent reel: {reel_path.name}")
+
             # Send completion message
             if sent_count == len(video_paths):
                 completion_msg = (
@@ -1356,7 +1414,7 @@ class ModerationBot:
             # Delete video files after successful sending
             if sent_count > 0:
                 deleted_count = 0
-                for video_path in video_paths:
+                for video_path in [*video_paths, *([reel_path] if reel_path else [])]:
                     if video_path.exists():
                         try:
                             video_path.unlink()
@@ -0,0 +1,236 @@
+"""
+Cached text layout for story overlays.
+
+Wrapping used to measure every candidate line with the Pillow draw API
+(growing strings, one measurement per word per line), after which
+imagetext-py measured the result again and re-wrapped when the two
+disagreed. Here:
+
+- Each (font, size, backend) gets a glyph advance table; a word's width
+  is estimated from it once and cached
+- Lines are broken greedily on those widths, then each line is checked
+  with exact measurements by the backend that will draw it (usually two
+  per line), so the wrap decision agrees with the renderer
+- Complete layouts are memoized by (text, font, size, max width, backend)
+
+Backends: "pil" (ImageFont bbox, what the PIL renderer centers on) and
+"imagetext" (text_size_multiline, what the imagetext-py renderer uses).
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from .font_registry import FontRegistry, IMAGETEXT_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("pil", "imagetext")
+
+
+@dataclass(frozen=True)
+class TextLayout:
+    """Wrapped text with the renderer's width of every line."""
+    lines: tuple[str, ...]
+    line_widths: tuple[int, ...]
+
+    @property
+    def width(self) -> int:
+        """Width of the widest line."""
+        return max(self.line_widths, default=0)
+
+
+class _FontMetrics:
+    """
+    Measurement caches for one (font, size, backend).
+
+    Not thread-safe on its own: callers hold `lock` while measuring (the
+    font object and the caches are shared by every layout in this font).
+    """
+
+    def __init__(self, measure: Callable[[str], int]):
+        self.lock = threading.Lock()
+        self.measure = measure  # Exact rendered width of a string
+        self.advances: dict[str, int] = {}  # Glyph advance table
+        self.words: dict[str, int] = {}  # Estimated word widths
+        self.exact: dict[str, int] = {}  # Exact widths of measured lines
+        self.space = measure("x x") - measure("xx")
+
+    def advance(self, char: str) -> int:
+        width = self.advances.get(char)
+        if width is None:
+            width = self.advances[char] = self.measure(char)
+        return width
+
+    def word_width(self, word: str) -> int:
+        width = self.words.get(word)
+        if width is None:
+            width = self.words[word] = sum(self.advance(c) for c in word)
+        return width
+
+    def line_width(self, line: str) -> int:
+        width = self.exact.get(line)
+        if width is None:
+            width = self.exact[line] = self.measure(line)
+        return width
+
+
+class TextLayoutEngine:
+    """
+    Greedy line breaking on cached font metrics.
+
+    Thread-safe; one engine can serve every composer in the process.
+    The engine lock only guards the shared caches, line breaking holds
+    the lock of its font, so layouts in different fonts or sizes run in
+    parallel.
+    """
+
+    def __init__(self, fonts: FontRegistry, max_layouts: int = 1024):
+        """
+        Args:
+            fonts: Registry the measured fonts are loaded from
+            max_layouts: Memoized layouts kept (least recently used dropped)
+        """
+        self.fonts = fonts
+        self.max_layouts = max_layouts
+        self._lock = threading.Lock()  # Guards _metrics, _layouts and counters
+        self._metrics: dict[tuple[str, int, str], _FontMetrics] = {}
+        self._layouts: OrderedDict[tuple, TextLayout] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def layout(
+        self,
+        text: str,
+        font_path: Path,
+        size: int,
+        max_width: int,
+        backend: str = "pil",
+    ) -> TextLayout:
+        """
+        Wrap text into lines that fit max_width when drawn by the backend.
+
+        A single word wider than max_width stays on its own line.
+
+        Args:
+            text: Text to wrap (whitespace is collapsed)
+            font_path: Path to font file
+            size: Font size in pixels
+            max_width: Maximum line width in pixels
+            backend: "pil" or "imagetext"
+
+        Returns:
+            TextLayout with exact widths of the wrapped lines
+
+        Raises:
+            ValueError: If the backend is unknown or unavailable
+            OSError: If the font cannot be loaded
+        """
+        key = (text, str(font_path), int(size), int(max_width), backend)
+        with self._lock:
+            cached = self._layouts.get(key)
+            if cached is not None:
+                self._layouts.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        metrics = self._get_metrics(font_path, int(size), backend)
+        with metrics.lock:
+            result = self._break_lines(text.split(), metrics, max_width)
+
+        with self._lock:
+            self._layouts[key] = result
+            self._layouts.move_to_end(key)
+            if len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+
+        return result
+
+    def _break_lines(self, words: list[str], metrics: _FontMetrics, max_width: int) -> TextLayout:
+        """Greedy breaking on estimated widths, corrected by exact line measurements."""
+        if not words:
+            return TextLayout(lines=("",), line_widths=(0,))
+
+        widths = [metrics.word_width(word) for word in words]
+        lines = []
+        line_widths = []
+        start = 0
+
+        while start < len(words):
+            end = start + 1
+            estimate = widths[start]
+            while end < len(words) and estimate + metrics.space + widths[end] <= max_width:
+                estimate += metrics.space + widths[end]
+                end += 1
+
+            # Estimates ignore kerning and side bearings: trust the renderer
+            line = " ".join(words[start:end])
+            exact = metrics.line_width(line)
+            while exact > max_width and end - start > 1:
+                end -= 1
+                line = " ".join(words[start:end])
+                exact = metrics.line_width(line)
+            while exact <= max_width and end < len(words):
+                longer = f"{line} {words[end]}"
+                longer_width = metrics.line_width(longer)
+                if longer_width > max_width:
+                    break
+                line, exact = longer, longer_width
+                end += 1
+
+            lines.append(line)
+            line_widths.append(exact)
+            start = end
+
+        return TextLayout(lines=tuple(lines), line_widths=tuple(line_widths))
+
+    def _get_metrics(self, font_path: Path, size: int, backend: str) -> _FontMetrics:
+        key = (str(font_path), size, backend)
+        with self._lock:
+            metrics = self._metrics.get(key)
+        if metrics is None:
+            # Loaded outside the engine lock; a concurrent first use keeps one copy
+            metrics = _FontMetrics(self._measurer(font_path, size, backend))
+            with self._lock:
+                metrics = self._metrics.setdefault(key, metrics)
+        return metrics
+
+    def _measurer(self, font_path: Path, size: int, backend: str) -> Callable[[str], int]:
+        """Width function matching how the backend's renderer measures text."""
+        if backend == "pil":
+            font = self.fonts.pil_font(font_path, size)
+
+            def measure(text: str) -> int:
+                left, _, right, _ = font.getbbox(text)
+                return right - left
+
+            return measure
+
+        if backend == "imagetext":
+            if not IMAGETEXT_AVAILABLE:
+                raise ValueError("imagetext backend requested but imagetext-py is not installed")
+            from imagetext_py import text_size_multiline
+
+            font = self.fonts.imagetext_font(font_path)
+
+            def measure(text: str) -> int:
+                width, _ = text_size_multiline([text], size, font, draw_emojis=True)
+                return width
+
+            return measure
+
+        raise ValueError(f"Unknown layout backend: {backend}. Available: {', '.join(BACKENDS)}")
+
+    def get_stats(self) -> dict:
+        """Memoization counters."""
+        with self._lock:
+            return {
+                "layouts": len(self._layouts),
+                "fonts": len(self._metrics),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -10,18 +10,48 @@ Supports:
 - Text overlays with semi-transparent background
 """
 
+import asyncio
+import copy
 import logging
+import os
 import subprocess
-import shutil
+import threading
+import time
 import textwrap
 import tempfile
 import random
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+from dataclasses import dataclass, field, asdict, replace
 from datetime import datetime
 
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageFont
+
+from .render_cache import RenderCache, hash_file
+from .music_cache import MusicTranscodeCache
+from .ffmpeg_progress import (
+    PROGRESS_ARGS,
+    ProgressParser,
+    RenderMetrics,
+    RenderMetricsLog,
+    RenderProgress,
+)
+from .motion_frames import (
+    DEFAULT_OVERSAMPLE,
+    compute_crop_windows,
+    prepare_motion_source,
+    iter_motion_frames,
+)
+from .font_registry import FontRegistry, get_font_registry
+from .text_layout import TextLayoutEngine
+from .photo_store import PhotoStore
+from .image_loader import fit_image, load_image
+from .cpu_budget import CpuAllocation, CpuBudget
+from .media_probe import MediaProbeCache
+from .ffmpeg_capabilities import FFmpegCapabilities, get_ffmpeg_capabilities
 
 # Import imagetext-py for emoji support
 try:
@@ -52,24 +82,8 @@ DEFAULT_FONTS_DIR = Path(__file__).parent.parent.parent / "assets" / "fonts"
 
 
 def _get_ffmpeg_path() -> str:
-    """
-    Get path to FFmpeg executable.
-
-    Tries imageio-ffmpeg first (bundled with full codecs),
-    falls back to system FFmpeg.
-    """
-    try:
-        import imageio_ffmpeg
-        return imageio_ffmpeg.get_ffmpeg_exe()
-    except ImportError:
-        ffmpeg = shutil.which("ffmpeg")
-        if ffmpeg:
-            return ffmpeg
-        raise RuntimeError(
-            "FFmpeg not found. Install via:\n"
-            "  pip install imageio-ffmpeg\n"
-            "  or: sudo apt install ffmpeg"
-        )
+    """Get path to FFmpeg executable (discovered once per process)."""
+    return get_ffmpeg_capabilities().ffmpeg_path
 
 
 # Instagram safe zones (pixels from edge)
@@ -192,18 +206,172 @@ class TextOverlayConfig:
 
 @dataclass
 class VideoConfig:
-    """Video composition settings."""
+    """
+    Video composition settings.
+
+    Defaults are the production pipeline; from_env() only overrides
+    fields whose environment variable is set (see VIDEO_CONFIG_ENV).
+    """
     width: int = 1080
     height: int = 1920
     duration: int = 15  # seconds
-    bitrate: str = "4000k"
+    bitrate: str = "4000k"  # Target video bitrate of rate_control="capped"
     audio_bitrate: str = "192k"
     fps: int = 30
     codec: str = "libx264"
     preset: str = "medium"  # ultrafast, fast, medium, slow
     crf: int = 23  # Quality: 18-28, lower = better
+    rate_control: str = "capped"  # "capped" (CRF capped at bitrate, size-targeted) or "crf" (constant quality)
+    gop: Optional[int] = None  # Keyframe interval in frames (None = encoder default)
+    loudness_target: Optional[float] = None  # Music normalised to this integrated loudness, LUFS (None = as is)
+    true_peak_limit: float = -1.5  # Normalisation gain never pushes music peaks above this, dBTP
+    profile: str = "final"  # Name of the render profile (see RENDER_PROFILES)
+    render_workers: int = 1  # Parallel FFmpeg jobs per story series (1 = sequential)
+    series_engine: str = "per_story"  # "per_story" (one FFmpeg per story), "single_process" or "reel"
+    frame_pipe: bool = True  # Feed composited frames to FFmpeg stdin (no temp JPEGs)
+    motion_engine: str = "frames"  # "frames" (Pillow, see motion_frames) or "zoompan" (FFmpeg filter)
+    still_image_encode: bool = True  # Static stories: 1 fps source, single GOP
+    layered_overlay: bool = True  # Motion stories: cache textless base clip, overlay text in a second pass
+    niceness: int = 0  # Added to FFmpeg process niceness (background renders)
     text_overlay: TextOverlayConfig = field(default_factory=TextOverlayConfig)
 
+    @classmethod
+    def from_env(cls, environ: Optional[dict] = None) -> "VideoConfig":
+        """
+        Production config: defaults plus the overrides set in the environment.
+
+        Unset or empty variables keep the default.
+
+        Raises:
+            ValueError: If a variable cannot be parsed
+        """
+        environ = os.environ if environ is None else environ
+        overrides = {}
+        for name, (field_name, parse) in VIDEO_CONFIG_ENV.items():
+            value = environ.get(name, "").strip()
+            if value:
+                overrides[field_name] = parse(value)
+        return cls(**overrides)
+
+    def for_profile(self, name: str) -> "VideoConfig":
+        """
+        Return a copy of this config with a named render profile applied.
+
+        Raises:
+            ValueError: If the profile name is unknown
+        """
+        if name not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile '{name}' (available: {', '.join(RENDER_PROFILES)})")
+        return replace(self, profile=name, **RENDER_PROFILES[name])
+
+
+# Named render profiles: overrides applied on top of the configured VideoConfig.
+# "final" is the configured publishing quality. "preview" is a quick moderator
+# check: quarter-area, fastest preset, 0.5 s GOP for instant seeking in Telegram.
+# Text overlays are always laid out at the final size and scaled down, so
+# previews show the exact text placement.
+RENDER_PROFILES: dict[str, dict] = {
+    "final": {},
+    "preview": {
+        "width": 540,
+        "height": 960,
+        "preset": "ultrafast",
+        "crf": 30,
+        "gop": 15,
+    },
+}
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _parse_optional_float(value: str) -> Optional[float]:
+    return None if value.lower() == "off" else float(value)
+
+
+# Environment variable -> (VideoConfig field, parser), see .env.example
+VIDEO_CONFIG_ENV: dict[str, tuple[str, Callable[[str], object]]] = {
+    "STORY_DURATION_SECONDS": ("duration", int),
+    "VIDEO_BITRATE": ("bitrate", str),
+    "RENDER_WORKERS": ("render_workers", int),
+    "RENDER_SERIES_ENGINE": ("series_engine", str),
+    "RENDER_FRAME_PIPE": ("frame_pipe", _parse_bool),
+    "RENDER_MOTION_ENGINE": ("motion_engine", str),
+    "RENDER_STILL_ENCODE": ("still_image_encode", _parse_bool),
+    "RENDER_LAYERED": ("layered_overlay", _parse_bool),
+    "RENDER_RATE_CONTROL": ("rate_control", str),
+    "RENDER_LOUDNESS_TARGET": ("loudness_target", _parse_optional_float),
+    "RENDER_TRUE_PEAK_LIMIT": ("true_peak_limit", float),
+}
+
+# Instagram feed post sizes (width, height) by aspect ratio
+POST_SIZES: dict[str, tuple[int, int]] = {
+    "4:5": (1080, 1350),
+    "1:1": (1080, 1080),
+    "1.91:1": (1080, 566),
+}
+POST_JPEG_QUALITY = 95
+
+# Layered renders encode the video twice (base clip, then overlay pass);
+# the cached base is encoded this much better so the final output keeps
+# the configured quality.
+LAYER_BASE_CRF_OFFSET = 6
+
+RATE_CONTROLS = ("crf", "capped")
+
+# Size-targeted ("capped") encodes: an output may exceed duration x
+# (bitrate + audio bitrate) by this factor (VBV buffer slack, container
+# overhead) before it is re-encoded with lower quality, at most
+# SIZE_RETRIES times, each SIZE_RETRY_CRF_STEP CRF steps lower.
+SIZE_TOLERANCE = 1.05
+SIZE_RETRIES = 2
+SIZE_RETRY_CRF_STEP = 3
+
+
+def parse_bitrate_kbps(bitrate: str) -> int:
+    """
+    Parse an FFmpeg bitrate ("4000k", "4M", "192000") to kbit/s.
+
+    Raises:
+        ValueError: If the value is not a bitrate
+    """
+    value = str(bitrate).strip().lower()
+    multiplier = 1 / 1000
+    if value.endswith("k"):
+        value, multiplier = value[:-1], 1
+    elif value.endswith("m"):
+        value, multiplier = value[:-1], 1000
+    return max(1, int(float(value) * multiplier))
+
+
+@dataclass
+class StoryRenderJob:
+    """Single story render, fully resolved before any encoding starts."""
+    index: int  # 0-based position in the series
+    photo_path: Path
+    text: str
+    duration: float
+    music_offset: float
+    effect: MotionEffect
+    output_path: Path
+    text_config: Optional[TextOverlayConfig] = None
+    progress: Optional[Callable[[RenderProgress], None]] = None  # Progress callback of the series call
+
+
+@dataclass
+class FFmpegInvocation:
+    """Prepared FFmpeg run: command, stdin data and files to clean up."""
+    cmd: list[str]
+    outputs: list[Path]  # Files the command must create
+    input_data: Optional[bytes] = None  # Single raw frame for pipe:0
+    frames: Optional[Iterable[bytes]] = None  # Raw frame stream for pipe:0
+    temp_files: list[Path] = field(default_factory=list)  # Deleted after the run
+    timeout: int = 300  # Seconds
+    duration: Optional[float] = None  # Media duration per output (progress fraction, size target)
+    size_target: bool = True  # Check outputs against the size target (capped rate control)
+    progress: Optional[Callable[[RenderProgress], None]] = None  # Per-job progress callback
+
 
 class VideoComposer:
     """
@@ -221,6 +389,15 @@ class VideoComposer:
         output_dir: Path,
         config: Optional[VideoConfig] = None,
         fonts_dir: Optional[Path] = None,
+        render_cache: Optional[RenderCache] = None,
+        music_cache: Optional[MusicTranscodeCache] = None,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
+        metrics_path: Optional[Path] = None,
+        font_registry: Optional[FontRegistry] = None,
+        photo_store: Optional[PhotoStore] = None,
+        cpu_budget: Optional[CpuBudget] = None,
+        probe_cache: Optional[MediaProbeCache] = None,
+        capabilities: Optional[FFmpegCapabilities] = None,
     ):
         """
         Initialize video composer.
@@ -229,11 +406,51 @@ class VideoComposer:
             output_dir: Directory for output video files
             config: Video settings (uses defaults if not provided)
             fonts_dir: Directory containing font files
+            render_cache: Optional cache for finished story videos
+            music_cache: Optional AAC derivatives of music tracks; when set,
+                story audio is stream-copied instead of re-encoded
+            progress_callback: Called with a RenderProgress for every FFmpeg
+                progress update of every render (may be called from worker
+                threads); compose calls take their own per-job callback
+            metrics_path: Optional JSONL file that receives RenderMetrics
+                for every finished render
+            font_registry: Loaded fonts (process-wide registry if not provided)
+            photo_store: Optional story-sized photo derivatives; when set,
+                overlays and static stories skip decoding the original
+            cpu_budget: Cores shared by concurrent FFmpeg jobs (default:
+                all cores split into config.render_workers slots); shared
+                by profile and background copies of this composer
+            probe_cache: Persistent media probe results (default: in-memory
+                only, every file is probed once per process)
+            capabilities: FFmpeg binary and its encoders/filters (default:
+                discovered once per process); config options the binary
+                cannot run are switched to a supported path
         """
         self.output_dir = Path(output_dir)
         self.config = config or VideoConfig()
-        self.ffmpeg_path = _get_ffmpeg_path()
+        if self.config.rate_control not in RATE_CONTROLS:
+            raise ValueError(
+                f"Unknown rate control '{self.config.rate_control}' (available: {', '.join(RATE_CONTROLS)})"
+            )
+        self.capabilities = capabilities or get_ffmpeg_capabilities()
+        self.ffmpeg_path = self.capabilities.ffmpeg_path
+        self.config = self._supported_config(self.config)
         self.fonts_dir = Path(fonts_dir) if fonts_dir else DEFAULT_FONTS_DIR
+        self.render_cache = render_cache
+        self.music_cache = music_cache
+        self.progress_callback = progress_callback
+        self.metrics_log = RenderMetricsLog(metrics_path) if metrics_path else None
+        self.fonts = font_registry or get_font_registry()
+        self.text_layout = TextLayoutEngine(self.fonts)
+        self.photo_store = photo_store
+        self.cpu_budget = cpu_budget or CpuBudget(max_jobs=self.config.render_workers)
+        self.priority = "foreground"  # CPU budget slots to render in (see background())
+        self._unmeasured_music: set[str] = set()  # Tracks already reported as not measured
+        self.overlay_size = (self.config.width, self.config.height)
+        self.probe_cache = probe_cache or MediaProbeCache(
+            None, self.ffmpeg_path, self.capabilities.ffprobe_path,
+        )
+        self.render_metrics: deque[RenderMetrics] = deque(maxlen=200)  # Recent renders
 
         # Ensure output directory exists
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -244,12 +461,95 @@ class VideoComposer:
         # Find emoji font for fallback
         self._emoji_font = self._find_emoji_font()
 
-        logger.info(f"Using FFmpeg: {self.ffmpeg_path}")
+        logger.info(f"Using {self.capabilities.summary()}: {self.ffmpeg_path}")
         if self._default_font:
             logger.info(f"Default font: {self._default_font.name}")
         if self._emoji_font:
             logger.info(f"Emoji font: {self._emoji_font.name}")
 
+    def _supported_config(self, config: VideoConfig) -> VideoConfig:
+        """
+        Switch config options the FFmpeg binary cannot run to supported ones.
+
+        Returns:
+            The config, or a copy with fallbacks applied
+        """
+        caps = self.capabilities
+        changes = {}
+        if config.motion_engine == "zoompan" and not caps.has_filter("zoompan"):
+            logger.warning("FFmpeg has no zoompan filter, rendering motion frames in Python")
+            changes["motion_engine"] = "frames"
+        if config.layered_overlay and not caps.has_filter("overlay"):
+            logger.warning("FFmpeg has no overlay filter, burning text into every render")
+            changes["layered_overlay"] = False
+        if not caps.has_encoder(config.codec):
+            logger.error(f"FFmpeg has no {config.codec} encoder, renders will fail ({caps.summary()})")
+        if not caps.has_encoder("aac"):
+            logger.error(f"FFmpeg has no aac encoder, renders will fail ({caps.summary()})")
+        return replace(config, **changes) if changes else config
+
+    def with_profile(self, name: str) -> "VideoComposer":
+        """
+        Get a composer that renders with a named profile (see RENDER_PROFILES).
+
+        The copy shares caches, fonts, callbacks and metrics with this
+        composer; only the video config differs.
+
+        Raises:
+            ValueError: If the profile name is unknown
+        """
+        if name == self.config.profile:
+            return self
+        composer = copy.copy(self)
+        composer.config = self.config.for_profile(name)
+        return composer
+
+    def background(self, output_dir: Optional[Path] = None, niceness: int = 10) -> "VideoComposer":
+        """
+        Get a composer for low-priority background renders.
+
+        Stories are rendered one at a time by FFmpeg processes with raised
+        niceness, in the CPU budget's background slots: they never hold a
+        slot a foreground render waits for, they share its cores and the
+        kernel prefers the foreground process. Cache keys are identical to this composer's, so finished
+        background renders are render cache hits for it.
+
+        Args:
+            output_dir: Directory for outputs and temp files (created;
+                None = this composer's output_dir)
+            niceness: Niceness added to FFmpeg processes
+        """
+        composer = copy.copy(self)
+        composer.config = replace(self.config, render_workers=1, niceness=niceness)
+        composer.priority = "background"
+        if output_dir is not None:
+            composer.output_dir = Path(output_dir)
+            composer.output_dir.mkdir(parents=True, exist_ok=True)
+        return composer
+
+    @staticmethod
+    def _apply_thread_args(
+        cmd: list[str],
+        outputs: list[Path],
+        allocation: CpuAllocation,
+    ) -> list[str]:
+        """
+        Limit an FFmpeg command to the threads of its CPU budget slot.
+
+        Filter graphs get the slot's threads; encoders split them when one
+        process writes several outputs (at least one thread each).
+        """
+        threads = str(allocation.threads)
+        per_output = str(max(1, allocation.threads // max(1, len(outputs))))
+
+        limited = [cmd[0], "-filter_threads", threads, "-filter_complex_threads", threads]
+        output_names = {str(path) for path in outputs}
+        for arg in cmd[1:]:
+            if arg in output_names:
+                limited.extend(["-threads", per_output])  # Output option: encoder threads
+            limited.append(arg)
+        return limited
+
     def _find_default_font(self) -> Optional[Path]:
         """Find a suitable default font for text overlays."""
         if not self.fonts_dir.exists():
@@ -497,6 +797,37 @@ class VideoComposer:
         logger.warning("No rotation fonts available, using default font")
         return self._default_font
 
+    def warm_fonts(self) -> int:
+        """
+        Preload every rotation font at the sizes overlays use.
+
+        Sizes follow the series planner: the overlay font size times each
+        font's size_multiplier. The default font is included as well.
+
+        Returns:
+            Number of fonts loaded or already held by the registry
+        """
+        base_size = self.config.text_overlay.font_size
+        fonts: dict[Path, int] = {}
+        if self._default_font:
+            fonts[self._default_font] = base_size
+
+        if FONT_ROTATION_AVAILABLE:
+            multipliers = {fc.filename: fc.size_multiplier for fc in FONT_ROTATION}
+            for font_path in self.get_available_fonts():
+                multiplier = multipliers.get(font_path.name, multipliers.get(font_path.stem + ".ttf", 1.0))
+                fonts[font_path] = int(base_size * multiplier)
+        else:
+            for font_path in self.get_available_fonts():
+                fonts.setdefault(font_path, base_size)
+
+        start = time.perf_counter()
+        failed = self.fonts.warm(fonts.items())
+        logger.info(
+            f"Preloaded {len(fonts) - failed} fonts in {time.perf_counter() - start:.2f}s"
+        )
+        return len(fonts) - failed
+
     def get_font_count(self) -> int:
         """
         Get total number of fonts in rotation.
@@ -533,9 +864,11 @@ class VideoComposer:
         """
         Wrap text into lines that fit within max_width_px pixels.
 
-        Uses PIL font metrics for accurate pixel-based measurement,
-        unlike character-based wrapping which doesn't account for
-        variable character widths (especially Cyrillic).
+        Uses font metrics for accurate pixel-based measurement, unlike
+        character-based wrapping which doesn't account for variable
+        character widths (especially Cyrillic). Lines are measured with
+        the renderer that will draw them (imagetext-py if available,
+        otherwise PIL), and layouts are memoized by TextLayoutEngine.
 
         Args:
             text: Text to wrap
@@ -546,38 +879,14 @@ class VideoComposer:
         Returns:
             List of text lines, each fitting within max_width_px
         """
+        backend = "imagetext" if IMAGETEXT_AVAILABLE else "pil"
         try:
-            font = ImageFont.truetype(str(font_path), font_size)
+            layout = self.text_layout.layout(text, font_path, font_size, max_width_px, backend)
         except Exception:
             logger.warning(f"Failed to load font for pixel wrapping: {font_path}")
             return self._wrap_text(text, max_chars=25)
 
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
-        words = text.split()
-        if not words:
-            return [text] if text else [""]
-
-        lines = []
-        current_line = ""
-
-        for word in words:
-            test_line = f"{current_line} {word}" if current_line else word
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            line_width = bbox[2] - bbox[0]
-
-            if line_width <= max_width_px:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-
-        if current_line:
-            lines.append(current_line)
-
-        return lines if lines else [text]
+        return list(layout.lines)
 
     def _escape_text_for_ffmpeg(self, text: str) -> str:
         """
@@ -612,32 +921,70 @@ class VideoComposer:
         Returns:
             Path to image with overlay
         """
-        cfg = text_config
+        img = self._render_overlay_image(image_path, text, text_config)
+        img.save(output_path, "JPEG", quality=95)
 
-        # Load image and apply EXIF orientation
-        img = Image.open(image_path)
-        img = ImageOps.exif_transpose(img)  # Fix rotation from EXIF metadata
-
-        # Resize/crop to Instagram Story dimensions (1080x1920)
-        target_w, target_h = self.config.width, self.config.height
-        img_w, img_h = img.size
+        logger.debug(f"Created image with text overlay: {output_path}")
+        return output_path
 
-        # Calculate scale to cover the target area
-        scale = max(target_w / img_w, target_h / img_h)
-        new_w = int(img_w * scale)
-        new_h = int(img_h * scale)
+    def _render_overlay_image(
+        self,
+        image_path: Path,
+        text: str,
+        text_config: "TextOverlayConfig",
+    ) -> Image.Image:
+        """
+        Render the story frame with text overlay in memory.
 
-        img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+        Args:
+            image_path: Path to source image
+            text: Text to overlay
+            text_config: Text styling configuration
 
-        # Center crop to target dimensions
-        left = (new_w - target_w) // 2
-        top = (new_h - target_h) // 2
-        img = img.crop((left, top, left + target_w, top + target_h))
+        Returns:
+            RGB image at story dimensions (config width x height)
+        """
+        img = self._load_cover_image(image_path)
 
         # Convert to RGBA for transparency support
         if img.mode != "RGBA":
             img = img.convert("RGBA")
 
+        img = self._draw_text(img, text, text_config)
+
+        # Flatten to RGB (JPEG and rawvideo rgb24 have no alpha)
+        return img.convert("RGB")
+
+    def _render_text_layer(self, text: str, text_config: "TextOverlayConfig") -> Image.Image:
+        """
+        Render the text overlay alone on a transparent canvas.
+
+        Same layout as _render_overlay_image; composited over a base clip
+        by the layered render path.
+
+        Returns:
+            RGBA image at overlay size
+        """
+        canvas = Image.new("RGBA", self.overlay_size, (0, 0, 0, 0))
+        return self._draw_text(canvas, text, text_config)
+
+    def _draw_text(
+        self,
+        img: Image.Image,
+        text: str,
+        text_config: "TextOverlayConfig",
+    ) -> Image.Image:
+        """
+        Wrap text and draw it (with background and shadow) onto an RGBA image.
+
+        Returns:
+            RGBA image with text
+        """
+        cfg = text_config
+
+        # Always laid out at final size; preview profiles scale the frame down
+        target_w, target_h = self.overlay_size
+
         # Get font path (needed for pixel-based wrapping)
         font_path = cfg.font_path or self._default_font
 
@@ -646,7 +993,8 @@ class VideoComposer:
         # than Latin, and font size_multiplier makes it worse
         actual_font_size = int(cfg.font_size * cfg.size_multiplier)
         # Available width: image width minus safe zones minus safety margin
-        # 80px margin accounts for PIL vs imagetext-py measurement differences
+        # 80px margin keeps text clear of the safe zone edge (wrapping itself
+        # measures with the renderer, so no re-wrap is needed afterwards)
         max_text_w = target_w - 2 * SAFE_SIDE - 80
         if font_path and font_path.exists():
             lines = self._wrap_text_by_pixels(text, font_path, actual_font_size, max_text_w)
@@ -660,20 +1008,44 @@ class VideoComposer:
 
         # Use imagetext-py if available (for emoji support)
         if IMAGETEXT_AVAILABLE:
-            img = self._render_text_with_imagetext(
+            return self._render_text_with_imagetext(
                 img, wrapped_text, font_path, cfg, target_w, target_h
             )
-        else:
-            img = self._render_text_with_pil(
-                img, lines, font_path, cfg, target_w, target_h
-            )
+        return self._render_text_with_pil(
+            img, lines, font_path, cfg, target_w, target_h
+        )
+
+    def _load_cover_image(self, image_path: Path) -> Image.Image:
+        """
+        Load a photo oriented, scaled and center-cropped to overlay size.
 
-        # Save as RGB (JPEG doesn't support alpha)
-        img_rgb = img.convert("RGB")
-        img_rgb.save(output_path, "JPEG", quality=95)
+        Reads the photo store derivative when the store matches the
+        overlay size, otherwise processes the original.
+        """
+        if self.photo_store and self.photo_store.size == self.overlay_size:
+            img = self.photo_store.open(image_path, fit="cover")
+            if img is not None:
+                return img
 
-        logger.debug(f"Created image with text overlay: {output_path}")
-        return output_path
+        # EXIF orientation applied, decoded near story size
+        img = load_image(image_path, self.overlay_size, fit="cover")
+
+        # Resize/crop to Instagram Story dimensions (1080x1920)
+        return fit_image(img, self.overlay_size, fit="cover")
+
+    def _static_source(self, photo_path: Path) -> Path:
+        """
+        Get the file a static story without overlay should encode.
+
+        The photo store's "contain" derivative is already oriented and
+        scaled to fit the story frame, so FFmpeg only pads it. Without a
+        store (or if the photo cannot be processed) the original is used.
+        """
+        if self.photo_store:
+            derived = self.photo_store.get(photo_path, fit="contain")
+            if derived is not None:
+                return derived
+        return photo_path
 
     def _render_text_with_imagetext(
         self,
@@ -685,13 +1057,10 @@ class VideoComposer:
         target_h: int,
     ) -> Image.Image:
         """Render text with emoji support using imagetext-py."""
-        from imagetext_py import FontDB, Paint, EmojiOptions, text_size_multiline, draw_text_multiline, Canvas
+        from imagetext_py import Paint, text_size_multiline, draw_text_multiline, Canvas
 
-        # Register font
-        font_name = f"font_{font_path.stem}"
-        FontDB.LoadFromPath(font_name, str(font_path))
-        FontDB.SetDefaultEmojiOptions(EmojiOptions())
-        font = FontDB.Query(font_name)
+        # Registered in FontDB once per process
+        font = self.fonts.imagetext_font(font_path)
 
         # Split text into lines for imagetext-py
         lines = text.split('\n')
@@ -706,8 +1075,8 @@ class VideoComposer:
             draw_emojis=True,
         )
 
-        # Safety net: if text still exceeds safe zones after pixel wrapping
-        # (can happen due to PIL vs imagetext-py measurement differences)
+        # Safety net: wrapping measures with imagetext-py too, so this only
+        # fires for single words wider than the safe zone
         max_text_w = target_w - 2 * SAFE_SIDE
         if text_w > max_text_w:
             logger.warning(
@@ -813,7 +1182,7 @@ class VideoComposer:
         # Load font with size_multiplier applied
         actual_font_size = int(cfg.font_size * cfg.size_multiplier)
         try:
-            font = ImageFont.truetype(str(font_path), actual_font_size)
+            font = self.fonts.pil_font(font_path, actual_font_size)
         except Exception as e:
             logger.warning(f"Failed to load font {font_path}: {e}")
             font = ImageFont.load_default()
@@ -905,40 +1274,35 @@ class VideoComposer:
 
     def _get_media_duration(self, media_path: Path) -> Optional[float]:
         """
-        Get duration of audio/video file using ffprobe.
+        Get duration of audio/video file (probed once, see MediaProbeCache).
 
         Returns:
             Duration in seconds, or None if unable to determine
         """
-        # ffprobe should be in the same directory as ffmpeg
-        ffprobe_path = str(Path(self.ffmpeg_path).parent / "ffprobe")
-        if not Path(ffprobe_path).exists():
-            ffprobe_path = "ffprobe"  # Fall back to system ffprobe
-
-        try:
-            result = subprocess.run(
-                [
-                    ffprobe_path,
-                    "-v", "error",
-                    "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1",
-                    str(media_path),
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-            if result.returncode == 0:
-                return float(result.stdout.strip())
-        except (subprocess.TimeoutExpired, ValueError, FileNotFoundError) as e:
-            logger.warning(f"Could not get duration for {media_path}: {e}")
+        return self.probe_cache.duration(media_path)
 
-        return None
+    def _generate_output_filename(
+        self,
+        prefix: str = "story",
+        index: Optional[int] = None,
+        run_id: Optional[str] = None,
+    ) -> Path:
+        """
+        Generate unique output filename with timestamp.
 
-    def _generate_output_filename(self, prefix: str = "story") -> Path:
-        """Generate unique output filename with timestamp."""
+        Args:
+            prefix: Filename prefix
+            index: Optional 1-based story number within a series
+            run_id: Identifier shared by the stories of one series (random
+                if None); keeps names unique when several processes render
+                into the same directory within the same second
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{prefix}_{timestamp}.mp4"
+        run_id = run_id or uuid.uuid4().hex[:8]
+        if index is not None:
+            filename = f"{prefix}_{timestamp}_{run_id}_{index:02d}.mp4"
+        else:
+            filename = f"{prefix}_{timestamp}_{run_id}.mp4"
         return self.output_dir / filename
 
     def _apply_exif_orientation(self, photo_path: Path) -> tuple[Path, bool]:
@@ -955,36 +1319,59 @@ class VideoComposer:
             Tuple of (path_to_use, needs_cleanup) - if needs_cleanup is True,
             the returned path is a temp file that should be deleted after use.
         """
+        img_fixed = self._load_oriented_image(photo_path)
+        if img_fixed is None:
+            return photo_path, False
+
+        temp_path = self.output_dir / f"_temp_exif_{uuid.uuid4().hex}.jpg"
+        img_fixed.save(temp_path, format='JPEG', quality=95)
+        logger.debug("Saved EXIF-rotated photo to temp file")
+        return temp_path, True
+
+    def _load_oriented_image(self, photo_path: Path) -> Optional[Image.Image]:
+        """
+        Load photo with EXIF rotation applied, only if rotation is needed.
+
+        The photo is decoded near the source size motion effects need
+        (story frame times DEFAULT_OVERSAMPLE), not at full resolution.
+
+        Returns:
+            Rotated RGB image, or None if the file can be used as is
+        """
         try:
             with Image.open(photo_path) as img:
                 # Check if EXIF orientation exists and requires rotation
                 exif = img.getexif()
                 orientation = exif.get(274)  # 274 is the EXIF orientation tag
 
-                if orientation and orientation != 1:
-                    # Orientation requires transformation
-                    img_fixed = ImageOps.exif_transpose(img)
-                    temp_path = self.output_dir / f"_temp_exif_{datetime.now().strftime('%Y%m%d_%H%M%S%f')}.jpg"
-
-                    # Convert to RGB if necessary
-                    if img_fixed.mode in ('RGBA', 'P'):
-                        img_fixed = img_fixed.convert('RGB')
-
-                    img_fixed.save(temp_path, format='JPEG', quality=95)
-                    logger.debug(f"Applied EXIF rotation (orientation={orientation}) to temp file")
-                    return temp_path, True
+            if orientation and orientation != 1:
+                # Orientation requires transformation
+                img_fixed = load_image(photo_path, self._motion_source_size(), fit="stretch")
+                logger.debug(f"Applied EXIF rotation (orientation={orientation})")
+                return img_fixed.convert("RGB")
 
         except Exception as e:
             logger.warning(f"Failed to check/apply EXIF orientation: {e}")
 
-        return photo_path, False
+        return None
+
+    def _motion_source_size(self) -> tuple[int, int]:
+        """Smallest source size that motion effects can zoom into without upscaling."""
+        return (
+            round(self.config.width * DEFAULT_OVERSAMPLE),
+            round(self.config.height * DEFAULT_OVERSAMPLE),
+        )
 
     @staticmethod
-    def _pick_random_effect(static_probability: float = STATIC_PROBABILITY) -> MotionEffect:
+    def _pick_random_effect(
+        static_probability: float = STATIC_PROBABILITY,
+        rng: Optional[random.Random] = None,
+    ) -> MotionEffect:
         """Pick a random motion effect, with a chance of static."""
-        if random.random() < static_probability:
+        rng = rng or random
+        if rng.random() < static_probability:
             return _EFFECTS_BY_NAME["static"]
-        return random.choice(_NON_STATIC_EFFECTS)
+        return rng.choice(_NON_STATIC_EFFECTS)
 
     def _build_motion_command(
         self,
@@ -994,177 +1381,584 @@ class VideoComposer:
         output_path: Path,
         duration: float,
         music_offset: float = 0,
+        frame_size: Optional[tuple[int, int]] = None,
     ) -> list[str]:
-        """Build FFmpeg command for a given motion effect."""
+        """
+        Build FFmpeg command for a given motion effect.
+
+        If frame_size is set, the photo is read as one rgb24 frame from
+        stdin instead of photo_path (see _image_input_args).
+        """
         if effect.is_static:
             return self._build_static_command(
                 photo_path, music_path, output_path, duration, music_offset,
+                frame_size=frame_size,
             )
 
+        vf = self._build_video_filter(effect, duration)
+
+        cmd = [self.ffmpeg_path, "-y"]
+        image_args, loop_filter = self._image_input_args(photo_path, frame_size)
+        cmd.extend(image_args)
+        vf = loop_filter + vf
+
+        music_args, audio_copy, audio_filter = self._music_input_args(music_path, music_offset)
+        cmd.extend(music_args)
+
+        cmd.extend(["-vf", vf])
+        cmd.extend(self._encode_args(duration, audio_copy=audio_copy, audio_filter=audio_filter))
+        cmd.append(str(output_path))
+
+        return cmd
+
+    def _build_frames_invocation(
+        self,
+        effect: MotionEffect,
+        image: Image.Image,
+        music_path: Path,
+        output_path: Path,
+        duration: float,
+        music_offset: float = 0,
+    ) -> FFmpegInvocation:
+        """
+        Build a motion effect render that pipes Pillow-generated frames to FFmpeg.
+
+        Same geometry as the zoompan filter, without the 8000px upscale.
+        Frames are generated lazily while FFmpeg consumes them.
+        """
         w = self.config.width
         h = self.config.height
         fps = self.config.fps
         total_frames = int(duration * fps)
         zoom_speed = 0.2 / total_frames
 
-        z = effect.z_expr.format(zoom_speed=zoom_speed, total_frames=total_frames)
-        x = effect.x_expr.format(total_frames=total_frames)
-        y = effect.y_expr.format(total_frames=total_frames)
-
-        vf = (
-            f"scale=8000:-1,"
-            f"zoompan="
-            f"z='{z}':"
-            f"x='{x}':"
-            f"y='{y}':"
-            f"d={total_frames}:"
-            f"s={w}x{h}:"
-            f"fps={fps},"
-            f"setsar=1"
+        windows = compute_crop_windows(
+            effect.z_expr.format(zoom_speed=zoom_speed, total_frames=total_frames),
+            effect.x_expr.format(total_frames=total_frames),
+            effect.y_expr.format(total_frames=total_frames),
+            total_frames,
         )
+        source = prepare_motion_source(image, w, h)
 
         cmd = [
             self.ffmpeg_path,
             "-y",
-            "-loop", "1",
-            "-i", str(photo_path),
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "-s", f"{w}x{h}",
+            "-framerate", str(fps),
+            "-i", "pipe:0",
         ]
 
-        if music_offset > 0:
-            cmd.extend(["-ss", f"{music_offset:.3f}"])
-        cmd.extend(["-i", str(music_path)])
+        music_args, audio_copy, audio_filter = self._music_input_args(music_path, music_offset)
+        cmd.extend(music_args)
 
-        cmd.extend([
-            "-vf", vf,
-            "-c:v", self.config.codec,
-            "-preset", self.config.preset,
-            "-crf", str(self.config.crf),
-            "-c:a", "aac",
-            "-b:a", self.config.audio_bitrate,
-            "-t", f"{duration:.3f}",
-            "-pix_fmt", "yuv420p",
-            "-movflags", "+faststart",
-            "-shortest",
-            str(output_path),
-        ])
+        cmd.extend(["-vf", "setsar=1"])
+        cmd.extend(self._encode_args(duration, audio_copy=audio_copy, audio_filter=audio_filter))
+        cmd.append(str(output_path))
 
-        return cmd
+        return FFmpegInvocation(
+            cmd=cmd,
+            outputs=[output_path],
+            frames=iter_motion_frames(source, windows, w, h),
+            duration=duration,
+        )
 
-    def compose_story(
+    async def _run_ffmpeg_async(
         self,
-        photo_path: Path,
-        music_path: Path,
-        output_path: Optional[Path] = None,
-        duration: Optional[float] = None,
-        ken_burns: bool = False,
-        music_offset: float = 0,
-        motion_effect: Optional[str] = None,
-    ) -> Path:
+        cmd: list[str],
+        timeout: int = 300,
+        input_data: Optional[bytes] = None,
+        frames: Optional[Iterable[bytes]] = None,
+        progress: Optional[ProgressParser] = None,
+        on_progress: Optional[Callable[[RenderProgress], None]] = None,
+        allocation: Optional[CpuAllocation] = None,
+    ) -> None:
         """
-        Create a story video from photo and music.
+        Run FFmpeg as an asyncio subprocess.
 
-        Args:
-            photo_path: Path to input photo
-            music_path: Path to input music file
-            output_path: Custom output path (auto-generated if None)
-            duration: Video duration in seconds (uses config default or music length)
-            ken_burns: Legacy parameter (use motion_effect instead)
-            music_offset: Start position in music file (seconds)
-            motion_effect: Effect name, "random", or None.
-                "random" — pick random effect (including static with STATIC_PROBABILITY).
-                None — use ken_burns param for backward compatibility.
-                Specific name — use that effect.
+        Frames are produced in a worker thread (Pillow releases the GIL),
+        so the event loop only shuffles bytes. On timeout or cancellation
+        the FFmpeg process is killed before the exception propagates.
 
-        Returns:
-            Path to created video file
+        Args:
+            cmd: FFmpeg command line
+            timeout: Timeout in seconds
+            input_data: Bytes written to FFmpeg stdin
+            frames: Iterable of raw frame bytes written to FFmpeg stdin
+            progress: Parser for progress updates (adds "-progress pipe:1")
+            on_progress: Callback of this job, called with every update
+                besides the composer's progress_callback
+            allocation: CPU budget slot to pin the process to
 
         Raises:
-            FileNotFoundError: If input files don't exist
-            RuntimeError: If FFmpeg fails
+            RuntimeError: If FFmpeg fails or exceeds timeout
+            asyncio.CancelledError: If the calling task is cancelled
         """
-        photo_path = Path(photo_path)
-        music_path = Path(music_path)
+        if progress:
+            cmd = [cmd[0], *PROGRESS_ARGS, *cmd[1:]]
+        has_input = input_data is not None or frames is not None
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if has_input else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE if progress else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self.cpu_budget.apply(process.pid, allocation, extra_niceness=self.config.niceness)
 
-        if not photo_path.exists():
-            raise FileNotFoundError(f"Photo not found: {photo_path}")
-        if not music_path.exists():
-            raise FileNotFoundError(f"Music not found: {music_path}")
+        async def feed_stdin():
+            try:
+                if input_data is not None:
+                    process.stdin.write(input_data)
+                    await process.stdin.drain()
+                elif frames is not None:
+                    iterator = iter(frames)
+                    while True:
+                        data = await asyncio.to_thread(next, iterator, None)
+                        if data is None:
+                            break
+                        process.stdin.write(data)
+                        await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # FFmpeg exited early, error is in stderr
+            finally:
+                process.stdin.close()
+
+        async def read_progress():
+            async for raw_line in process.stdout:
+                update = progress.feed(raw_line.decode("utf-8", errors="replace"))
+                if update:
+                    self._notify_progress(update, on_progress)
+
+        async def communicate() -> bytes:
+            readers = [process.stderr.read()]
+            if has_input:
+                readers.append(feed_stdin())
+            if progress:
+                readers.append(read_progress())
+            results = await asyncio.gather(*readers)
+            await process.wait()
+            return results[0]
 
-        if output_path is None:
-            output_path = self._generate_output_filename()
-        else:
-            output_path = Path(output_path)
+        try:
+            stderr = await asyncio.wait_for(communicate(), timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"FFmpeg timed out after {timeout:.0f}s")
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+                logger.info(f"Killed FFmpeg process {process.pid}")
 
-        # Apply EXIF orientation (FFmpeg doesn't handle it reliably)
-        actual_photo_path, cleanup_temp = self._apply_exif_orientation(photo_path)
+        if process.returncode != 0:
+            stderr = stderr.decode("utf-8", errors="replace")
+            logger.error(f"FFmpeg error: {stderr}")
+            raise RuntimeError(f"FFmpeg failed: {stderr[:500]}")
 
-        try:
-            # Determine duration
-            if duration is None:
-                music_duration = self._get_media_duration(music_path)
-                if music_duration and music_duration <= 60:
-                    duration = music_duration
-                else:
-                    duration = float(self.config.duration)
+    def _image_input_args(
+        self,
+        photo_path: Path,
+        frame_size: Optional[tuple[int, int]] = None,
+        input_fps: int = 25,
+    ) -> tuple[list[str], str]:
+        """
+        Build FFmpeg input options for the story image.
 
-            # Resolve motion effect
-            if motion_effect is not None:
-                # New API
-                if motion_effect == "random":
-                    effect = self._pick_random_effect()
-                elif motion_effect == "static":
-                    effect = _EFFECTS_BY_NAME["static"]
-                else:
-                    effect = _EFFECTS_BY_NAME.get(motion_effect)
-                    if not effect:
-                        logger.warning(f"Unknown motion effect '{motion_effect}', using random")
-                        effect = self._pick_random_effect()
-            else:
-                # Legacy ken_burns compat
-                if ken_burns:
-                    effect = _EFFECTS_BY_NAME["zoom_in_center"]
-                else:
-                    effect = _EFFECTS_BY_NAME["static"]
+        With frame_size, the image arrives as a single raw rgb24 frame on
+        stdin; the image2 demuxer's -loop does not apply to pipes, so the
+        frame is repeated with the loop filter instead.
 
-            logger.info(
-                f"Composing video: {photo_path.name} + {music_path.name} "
-                f"({duration:.2f}s, offset={music_offset:.2f}s, effect={effect.name})"
-            )
+        Args:
+            photo_path: Image file (ignored when frame_size is set)
+            frame_size: (width, height) of the raw frame on stdin
+            input_fps: Source frame rate (25 = image2 default, keeps zoompan timing)
 
-            # Build FFmpeg command
-            cmd = self._build_motion_command(
-                effect, actual_photo_path, music_path, output_path, duration, music_offset
+        Returns:
+            Tuple of (input args, filter prefix to put before the video filter)
+        """
+        if frame_size is None:
+            return ["-framerate", str(input_fps), "-loop", "1", "-i", str(photo_path)], ""
+
+        w, h = frame_size
+        args = [
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "-s", f"{w}x{h}",
+            "-framerate", str(input_fps),
+            "-i", "pipe:0",
+        ]
+        return args, "loop=loop=-1:size=1:start=0,"
+
+    def _build_video_filter(self, effect: MotionEffect, duration: float) -> str:
+        """
+        Build the video filter chain for one story.
+
+        Static: scale to fit and pad to 9:16.
+        Motion: upscale, then zoompan with the effect's expressions.
+        """
+        w = self.config.width
+        h = self.config.height
+
+        if effect.is_static:
+            return (
+                f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
+                f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:black,"
+                f"setsar=1"
+            )
+
+        fps = self.config.fps
+        total_frames = int(duration * fps)
+        zoom_speed = 0.2 / total_frames
+
+        z = effect.z_expr.format(zoom_speed=zoom_speed, total_frames=total_frames)
+        x = effect.x_expr.format(total_frames=total_frames)
+        y = effect.y_expr.format(total_frames=total_frames)
+
+        return (
+            f"scale=8000:-1,"
+            f"zoompan="
+            f"z='{z}':"
+            f"x='{x}':"
+            f"y='{y}':"
+            f"d={total_frames}:"
+            f"s={w}x{h}:"
+            f"fps={fps},"
+            f"setsar=1"
+        )
+
+    def _run_ffmpeg(
+        self,
+        cmd: list[str],
+        timeout: int = 300,
+        input_data: Optional[bytes] = None,
+        frames: Optional[Iterable[bytes]] = None,
+        progress: Optional[ProgressParser] = None,
+        on_progress: Optional[Callable[[RenderProgress], None]] = None,
+        allocation: Optional[CpuAllocation] = None,
+    ) -> None:
+        """
+        Run an FFmpeg command to completion.
+
+        stdin is fed from a helper thread and stderr goes to a temp file,
+        so neither pipe can stall while progress is read from stdout.
+
+        Args:
+            cmd: FFmpeg command line
+            timeout: Timeout in seconds
+            input_data: Bytes written to FFmpeg stdin (raw frame for pipe:0)
+            frames: Iterable of raw frame bytes written to FFmpeg stdin
+            progress: Parser for progress updates (adds "-progress pipe:1")
+            on_progress: Callback of this job, called with every update
+                besides the composer's progress_callback
+            allocation: CPU budget slot to pin the process to
+
+        Raises:
+            RuntimeError: If FFmpeg fails or exceeds timeout (seconds)
+        """
+        if progress:
+            cmd = [cmd[0], *PROGRESS_ARGS, *cmd[1:]]
+        has_input = input_data is not None or frames is not None
+
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if has_input else subprocess.DEVNULL,
+                stdout=subprocess.PIPE if progress else subprocess.DEVNULL,
+                stderr=stderr_file,
             )
+            self.cpu_budget.apply(process.pid, allocation, extra_niceness=self.config.niceness)
+
+            timed_out = threading.Event()
+
+            def on_timeout():
+                timed_out.set()
+                process.kill()
 
-            # Execute FFmpeg
+            timer = threading.Timer(timeout, on_timeout)
+            timer.start()
+
+            feed_errors: list[BaseException] = []
+            feeder = None
+            if has_input:
+                feeder = threading.Thread(
+                    target=self._feed_stdin,
+                    args=(process, input_data, frames, feed_errors),
+                    daemon=True,
+                )
+                feeder.start()
+
+            try:
+                if progress:
+                    for raw_line in process.stdout:
+                        update = progress.feed(raw_line.decode("utf-8", errors="replace"))
+                        if update:
+                            self._notify_progress(update, on_progress)
+                returncode = process.wait()
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                timer.cancel()
+                if feeder:
+                    feeder.join()
+
+            if timed_out.is_set():
+                raise RuntimeError(f"FFmpeg timed out after {timeout:.0f}s")
+            if feed_errors:
+                raise RuntimeError(f"Frame generation failed: {feed_errors[0]}") from feed_errors[0]
+
+            if returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode("utf-8", errors="replace")
+                logger.error(f"FFmpeg error: {stderr}")
+                raise RuntimeError(f"FFmpeg failed: {stderr[:500]}")
+
+    @staticmethod
+    def _feed_stdin(
+        process: subprocess.Popen,
+        input_data: Optional[bytes],
+        frames: Optional[Iterable[bytes]],
+        errors: list[BaseException],
+    ) -> None:
+        """Write input bytes or frames to FFmpeg stdin (runs in a helper thread)."""
+        try:
+            if input_data is not None:
+                process.stdin.write(input_data)
+            else:
+                for data in frames:
+                    process.stdin.write(data)
+        except BrokenPipeError:
+            pass  # FFmpeg exited early, error is in stderr
+        except Exception as e:
+            errors.append(e)
+            process.kill()
+        finally:
             try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300,  # 5 minutes max
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def _notify_progress(
+        self,
+        update: RenderProgress,
+        on_progress: Optional[Callable[[RenderProgress], None]] = None,
+    ) -> None:
+        """Pass a progress update to the callbacks (callback errors are only logged)."""
+        for callback in (self.progress_callback, on_progress):
+            if not callback:
+                continue
+            try:
+                callback(update)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+    def _video_codec_args(self) -> list[str]:
+        """Video encoder options shared by all story commands."""
+        args = [
+            "-c:v", self.config.codec,
+            "-preset", self.config.preset,
+            "-crf", str(self.config.crf),
+        ]
+        if self.config.rate_control == "capped":
+            args.extend(self._rate_cap_args(parse_bitrate_kbps(self.config.bitrate)))
+        if self.config.gop:
+            args.extend(["-g", str(self.config.gop)])
+        return args
+
+    @staticmethod
+    def _rate_cap_args(kbps: int, buffer_seconds: int = 2) -> list[str]:
+        """
+        Constrained VBR: CRF decides quality, the VBV buffer caps the rate.
+
+        Simple frames stay below the cap (small files for static stories),
+        detailed motion is limited to it. A two-second buffer lets single
+        keyframes exceed the cap without starving the following frames.
+        """
+        return ["-maxrate", f"{kbps}k", "-bufsize", f"{buffer_seconds * kbps}k"]
+
+    def _still_codec_args(self, duration: float) -> list[str]:
+        """
+        Extra encoder options for a story made of one repeated image.
+
+        One keyframe for the whole clip; every following frame is an
+        identical P-frame that x264 codes as skip blocks. "-tune stillimage"
+        is deliberately not used: it raises I-frame bits ~20% on detailed
+        photos without making the encode faster.
+        """
+        total_frames = max(1, int(round(duration * self.config.fps)))
+        gop = self.config.gop or total_frames
+        return [
+            "-g", str(gop),
+            "-keyint_min", str(gop),
+            "-sc_threshold", "0",
+            "-r", str(self.config.fps),  # Constant output rate for Instagram
+        ]
+
+    def music_gain_db(self, music_path: Path, analyze: bool = False) -> float:
+        """
+        Loudness normalisation gain of a music track.
+
+        Computed from the track's stored loudness measurements, so renders
+        apply a plain volume change instead of a two-pass loudnorm per
+        story. Renders never measure: tracks are analyzed offline
+        ("probe-library --loudness"), an unmeasured track plays as is.
+
+        Args:
+            music_path: Music track
+            analyze: Measure the track if it has no stored measurement
+                (offline commands only, decodes the whole track)
+
+        Returns:
+            Gain in dB, rounded to 0.1 (0 when normalisation is off or
+            the track is not measured)
+        """
+        if self.config.loudness_target is None:
+            return 0.0
+        loudness = self.probe_cache.loudness(music_path, analyze=analyze)
+        if loudness is None:
+            key = str(music_path)
+            if not analyze and key not in self._unmeasured_music:
+                self._unmeasured_music.add(key)
+                logger.warning(
+                    f"{Path(music_path).name} has no loudness measurement, not normalised "
+                    f"(run 'python main.py probe-library --loudness')"
                 )
+            return 0.0
+        return round(loudness.gain_db(self.config.loudness_target, self.config.true_peak_limit), 1)
 
-                if result.returncode != 0:
-                    logger.error(f"FFmpeg error: {result.stderr}")
-                    raise RuntimeError(f"FFmpeg failed: {result.stderr[:500]}")
+    def _music_volume_filter(self, music_path: Path, gain_db: Optional[float] = None) -> str:
+        """Audio filter applying music_gain_db ("" when there is no gain)."""
+        gain = self.music_gain_db(music_path) if gain_db is None else gain_db
+        return f"volume={gain:.1f}dB" if gain else ""
 
-            except subprocess.TimeoutExpired:
-                raise RuntimeError("FFmpeg timed out after 5 minutes")
+    def _prepare_series_music(self, music_path: Path) -> None:
+        """
+        Resolve the gain and transcode the series track before stories fan out.
 
-            if not output_path.exists():
-                raise RuntimeError(f"Output file was not created: {output_path}")
+        The first use of a track decodes it in full (AAC derivative); done
+        once here, parallel stories only read the stored results instead
+        of each waiting on the same work.
+        """
+        gain_db = self.music_gain_db(music_path)
+        if self.music_cache:
+            self.music_cache.get(music_path, gain_db)
 
-            file_size = output_path.stat().st_size / (1024 * 1024)  # MB
-            logger.info(f"Video created: {output_path.name} ({file_size:.1f} MB)")
+    def _music_input_args(self, music_path: Path, music_offset: float = 0) -> tuple[list[str], bool, str]:
+        """
+        Build FFmpeg input options for the music track.
 
-            return output_path
+        Uses the pre-transcoded AAC derivative when available, so the slice
+        can be stream-copied (AAC frame accurate, ~23 ms). The derivative
+        already carries the normalisation gain; otherwise it is returned
+        as an audio filter.
 
-        finally:
-            # Clean up temp EXIF-corrected file if created
-            if cleanup_temp and actual_photo_path.exists():
-                actual_photo_path.unlink()
-                logger.debug(f"Cleaned up temp EXIF file: {actual_photo_path}")
+        Returns:
+            Tuple of (input args, audio_copy flag and audio filter for _encode_args)
+        """
+        source = music_path
+        audio_copy = False
+        audio_filter = ""
+        gain_db = self.music_gain_db(music_path)
+        if self.music_cache:
+            derived = self.music_cache.get(music_path, gain_db)
+            if derived:
+                source = derived
+                audio_copy = True
+        if not audio_copy:
+            audio_filter = self._music_volume_filter(music_path, gain_db)
+
+        args = []
+        if music_offset > 0:
+            args.extend(["-ss", f"{music_offset:.3f}"])
+        args.extend(["-i", str(source)])
+        return args, audio_copy, audio_filter
+
+    def _encode_args(
+        self,
+        duration: float,
+        audio_copy: bool = False,
+        still: bool = False,
+        audio_filter: str = "",
+    ) -> list[str]:
+        """
+        Output options for one story MP4 (codecs, duration, container).
+
+        Args:
+            duration: Story duration in seconds
+            audio_copy: Stream-copy audio (input is already AAC at target bitrate)
+            still: Add still-image encoder options (see _still_codec_args)
+            audio_filter: Filter for the re-encoded audio (e.g. normalisation gain)
+        """
+        if audio_copy:
+            audio_args = ["-c:a", "copy"]
+        else:
+            audio_args = ["-c:a", "aac", "-b:a", self.config.audio_bitrate]
+            if audio_filter:
+                audio_args = ["-af", audio_filter] + audio_args
+
+        video_args = self._video_codec_args()
+        if still:
+            video_args += self._still_codec_args(duration)
+
+        return video_args + audio_args + [
+            "-t", f"{duration:.3f}",  # Precision to milliseconds
+            "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart",  # Web optimization
+            "-shortest",  # End when shortest input ends
+        ]
+
+    def compose_story(
+        self,
+        photo_path: Path,
+        music_path: Path,
+        output_path: Optional[Path] = None,
+        duration: Optional[float] = None,
+        ken_burns: bool = False,
+        music_offset: float = 0,
+        motion_effect: Optional[str] = None,
+        frame: Optional[Image.Image] = None,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
+    ) -> Path:
+        """
+        Create a story video from photo and music.
+
+        Args:
+            photo_path: Path to input photo
+            music_path: Path to input music file
+            output_path: Custom output path (auto-generated if None)
+            duration: Video duration in seconds (uses config default or music length)
+            ken_burns: Legacy parameter (use motion_effect instead)
+            music_offset: Start position in music file (seconds)
+            motion_effect: Effect name, "random", or None.
+                "random" — pick random effect (including static with STATIC_PROBABILITY).
+                None — use ken_burns param for backward compatibility.
+                Specific name — use that effect.
+            frame: Ready RGB image to pipe to FFmpeg stdin instead of
+                decoding photo_path (used by the frame_pipe mode)
+            progress_callback: Called with every progress update of this
+                render (in addition to the composer's progress_callback;
+                may be called from worker threads)
+
+        Returns:
+            Path to created video file
+
+        Raises:
+            FileNotFoundError: If input files don't exist
+            RuntimeError: If FFmpeg fails
+        """
+        invocation = self._prepare_story(
+            photo_path=photo_path,
+            music_path=music_path,
+            output_path=output_path,
+            duration=duration,
+            ken_burns=ken_burns,
+            music_offset=music_offset,
+            motion_effect=motion_effect,
+            frame=frame,
+        )
+        invocation.progress = progress_callback
+        return self._finish(invocation)[0]
 
     def compose_story_with_overlay(
         self,
@@ -1177,6 +1971,7 @@ class VideoComposer:
         text_config: Optional[TextOverlayConfig] = None,
         music_offset: float = 0,
         motion_effect: Optional[str] = None,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
     ) -> Path:
         """
         Create a story video with text overlay.
@@ -1191,45 +1986,268 @@ class VideoComposer:
             text_config: Text overlay settings (uses defaults if None)
             music_offset: Start position in music file (seconds)
             motion_effect: Effect name, "random", or None (see compose_story)
+            progress_callback: Per-render progress callback (see compose_story)
+
+        Returns:
+            Path to created video file
+        """
+        invocation = self._prepare_story_with_overlay(
+            photo_path=photo_path,
+            music_path=music_path,
+            text=text,
+            output_path=output_path,
+            duration=duration,
+            ken_burns=ken_burns,
+            text_config=text_config,
+            music_offset=music_offset,
+            motion_effect=motion_effect,
+        )
+        invocation.progress = progress_callback
+        return self._finish(invocation)[0]
+
+    async def compose_story_async(
+        self,
+        photo_path: Path,
+        music_path: Path,
+        output_path: Optional[Path] = None,
+        duration: Optional[float] = None,
+        ken_burns: bool = False,
+        music_offset: float = 0,
+        motion_effect: Optional[str] = None,
+        timeout: int = 300,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
+    ) -> Path:
+        """
+        Async version of compose_story for use inside the bot's event loop.
+
+        Image work runs in a worker thread and FFmpeg runs as an asyncio
+        subprocess, so the loop stays responsive. Cancelling the task
+        kills the FFmpeg process.
+
+        Args:
+            timeout: FFmpeg timeout in seconds (other args as in compose_story)
+
+        Returns:
+            Path to created video file
+
+        Raises:
+            FileNotFoundError: If input files don't exist
+            RuntimeError: If FFmpeg fails or times out
+        """
+        invocation = await asyncio.to_thread(
+            self._prepare_story,
+            photo_path=photo_path,
+            music_path=music_path,
+            output_path=output_path,
+            duration=duration,
+            ken_burns=ken_burns,
+            music_offset=music_offset,
+            motion_effect=motion_effect,
+        )
+        invocation.timeout = timeout
+        invocation.progress = progress_callback
+        return (await self._finish_async(invocation))[0]
+
+    async def compose_story_with_overlay_async(
+        self,
+        photo_path: Path,
+        music_path: Path,
+        text: str,
+        output_path: Optional[Path] = None,
+        duration: Optional[float] = None,
+        ken_burns: bool = True,
+        text_config: Optional[TextOverlayConfig] = None,
+        music_offset: float = 0,
+        motion_effect: Optional[str] = None,
+        timeout: int = 300,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
+    ) -> Path:
+        """
+        Async version of compose_story_with_overlay (see compose_story_async).
+
+        Args:
+            timeout: FFmpeg timeout in seconds (other args as in compose_story_with_overlay)
 
         Returns:
             Path to created video file
         """
+        invocation = await asyncio.to_thread(
+            self._prepare_story_with_overlay,
+            photo_path=photo_path,
+            music_path=music_path,
+            text=text,
+            output_path=output_path,
+            duration=duration,
+            ken_burns=ken_burns,
+            text_config=text_config,
+            music_offset=music_offset,
+            motion_effect=motion_effect,
+        )
+        invocation.timeout = timeout
+        invocation.progress = progress_callback
+        return (await self._finish_async(invocation))[0]
+
+    def _resolve_effect(self, motion_effect: Optional[str], ken_burns: bool) -> MotionEffect:
+        """Resolve a motion effect name (or legacy ken_burns flag) to an effect."""
+        if motion_effect is not None:
+            # New API
+            if motion_effect == "random":
+                return self._pick_random_effect()
+            if motion_effect == "static":
+                return _EFFECTS_BY_NAME["static"]
+            effect = _EFFECTS_BY_NAME.get(motion_effect)
+            if not effect:
+                logger.warning(f"Unknown motion effect '{motion_effect}', using random")
+                effect = self._pick_random_effect()
+            return effect
+
+        # Legacy ken_burns compat
+        if ken_burns:
+            return _EFFECTS_BY_NAME["zoom_in_center"]
+        return _EFFECTS_BY_NAME["static"]
+
+    def _prepare_story(
+        self,
+        photo_path: Path,
+        music_path: Path,
+        output_path: Optional[Path] = None,
+        duration: Optional[float] = None,
+        ken_burns: bool = False,
+        music_offset: float = 0,
+        motion_effect: Optional[str] = None,
+        frame: Optional[Image.Image] = None,
+        temp_files: Optional[list[Path]] = None,
+    ) -> FFmpegInvocation:
+        """
+        Resolve inputs and build the FFmpeg invocation for one story.
+
+        Blocking (image decoding, ffprobe), but does not run the encoder;
+        see compose_story for the arguments. temp_files are handed over to
+        the invocation and deleted after it runs.
+
+        Raises:
+            FileNotFoundError: If input files don't exist
+        """
         photo_path = Path(photo_path)
         music_path = Path(music_path)
+        temp_files = temp_files if temp_files is not None else []
 
         if not photo_path.exists():
             raise FileNotFoundError(f"Photo not found: {photo_path}")
         if not music_path.exists():
             raise FileNotFoundError(f"Music not found: {music_path}")
 
-        # Use provided config or default
-        txt_cfg = text_config or self.config.text_overlay
+        if output_path is None:
+            output_path = self._generate_output_filename()
+        else:
+            output_path = Path(output_path)
 
-        # Check if font is available
-        font_path = txt_cfg.font_path or self._default_font
-        if not font_path or not font_path.exists():
-            logger.warning("No font found, falling back to compose_story without overlay")
-            return self.compose_story(
-                photo_path=photo_path,
-                music_path=music_path,
-                output_path=output_path,
-                duration=duration,
-                ken_burns=ken_burns,
-                music_offset=music_offset,
-                motion_effect=motion_effect,
+        try:
+            # Determine duration
+            if duration is None:
+                music_duration = self._get_media_duration(music_path)
+                if music_duration and music_duration <= 60:
+                    duration = music_duration
+                else:
+                    duration = float(self.config.duration)
+
+            effect = self._resolve_effect(motion_effect, ken_burns)
+
+            logger.info(
+                f"Composing video: {photo_path.name} + {music_path.name} "
+                f"({duration:.2f}s, offset={music_offset:.2f}s, effect={effect.name})"
             )
 
-        # Update config with actual font path
-        txt_cfg.font_path = font_path
+            if not effect.is_static and self.config.motion_engine == "frames":
+                # Frames are generated here, FFmpeg only encodes
+                if frame is None:
+                    frame = load_image(photo_path, self._motion_source_size(), fit="stretch").convert("RGB")
+                invocation = self._build_frames_invocation(
+                    effect, frame, music_path, output_path, duration, music_offset,
+                )
+                invocation.temp_files.extend(temp_files)
+                return invocation
+
+            if effect.is_static and frame is None and photo_path not in temp_files:
+                # Original library photo (not a temp overlay image)
+                photo_path = self._static_source(photo_path)
+
+            # Apply EXIF orientation (FFmpeg doesn't handle it reliably)
+            if frame is None and self.config.frame_pipe:
+                # Rotated photo goes through stdin; None = FFmpeg reads the file
+                frame = self._load_oriented_image(photo_path)
+            if frame is not None:
+                actual_photo_path = photo_path
+            else:
+                actual_photo_path, cleanup_temp = self._apply_exif_orientation(photo_path)
+                if cleanup_temp:
+                    temp_files.append(actual_photo_path)
+
+            cmd = self._build_motion_command(
+                effect, actual_photo_path, music_path, output_path, duration, music_offset,
+                frame_size=frame.size if frame is not None else None,
+            )
+
+        except BaseException:
+            self._cleanup_temp_files(temp_files)
+            raise
+
+        return FFmpegInvocation(
+            cmd=cmd,
+            outputs=[output_path],
+            input_data=frame.tobytes() if frame is not None else None,
+            temp_files=temp_files,
+            duration=duration,
+        )
+
+    def _prepare_story_with_overlay(
+        self,
+        photo_path: Path,
+        music_path: Path,
+        text: str,
+        output_path: Optional[Path] = None,
+        duration: Optional[float] = None,
+        ken_burns: bool = True,
+        text_config: Optional[TextOverlayConfig] = None,
+        music_offset: float = 0,
+        motion_effect: Optional[str] = None,
+    ) -> FFmpegInvocation:
+        """Render the text overlay and build the story invocation (see compose_story_with_overlay)."""
+        photo_path = Path(photo_path)
+        music_path = Path(music_path)
+
+        if not photo_path.exists():
+            raise FileNotFoundError(f"Photo not found: {photo_path}")
+        if not music_path.exists():
+            raise FileNotFoundError(f"Music not found: {music_path}")
+
+        story_args = dict(
+            music_path=music_path,
+            output_path=output_path,
+            duration=duration,
+            ken_burns=ken_burns,
+            music_offset=music_offset,
+            motion_effect=motion_effect,
+        )
+
+        # Check if font is available
+        txt_cfg = self._resolve_text_config(text_config)
+        if txt_cfg is None:
+            logger.warning("No font found, falling back to compose_story without overlay")
+            return self._prepare_story(photo_path=photo_path, **story_args)
 
         logger.info(f"Composing video with overlay: {photo_path.name}")
         logger.debug(f"Overlay text: {text[:50]}...")
 
+        if self.config.frame_pipe:
+            # Composited frame goes straight to FFmpeg stdin
+            frame = self._render_overlay_image(photo_path, text, txt_cfg)
+            return self._prepare_story(photo_path=photo_path, frame=frame, **story_args)
+
         # Step 1: Create image with text overlay using PIL
         # Use temp file for intermediate image
-        temp_image = self.output_dir / f"_temp_overlay_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-
+        # Random suffix: parallel renders may start within the same second
+        temp_image = self.output_dir / f"_temp_overlay_{uuid.uuid4().hex}.jpg"
         try:
             self._add_text_overlay_pillow(
                 image_path=photo_path,
@@ -1237,26 +2255,258 @@ class VideoComposer:
                 output_path=temp_image,
                 text_config=txt_cfg,
             )
-            logger.debug(f"Created temp image with overlay: {temp_image}")
+        except BaseException:
+            self._cleanup_temp_files([temp_image])
+            raise
+        logger.debug(f"Created temp image with overlay: {temp_image}")
 
-            # Step 2: Create video from the processed image
-            video_path = self.compose_story(
-                photo_path=temp_image,
-                music_path=music_path,
-                output_path=output_path,
-                duration=duration,
-                ken_burns=ken_burns,
-                music_offset=music_offset,
-                motion_effect=motion_effect,
-            )
+        # Step 2: Create video from the processed image
+        return self._prepare_story(photo_path=temp_image, temp_files=[temp_image], **story_args)
+
+    def _finish(self, invocation: FFmpegInvocation) -> list[Path]:
+        """
+        Run a prepared invocation, check its outputs and delete its temp files.
 
-            return video_path
+        Returns:
+            Output paths of the invocation
 
+        Raises:
+            RuntimeError: If FFmpeg fails or an output is missing
+        """
+        progress = ProgressParser(invocation.outputs[0].name, invocation.duration)
+        try:
+            # Waits for a free CPU budget slot; the timeout covers the run only
+            with self.cpu_budget.acquire(self.priority) as allocation:
+                start = time.monotonic()
+                self._run_ffmpeg(
+                    self._apply_thread_args(invocation.cmd, invocation.outputs, allocation),
+                    timeout=invocation.timeout,
+                    input_data=invocation.input_data,
+                    frames=invocation.frames,
+                    progress=progress,
+                    on_progress=invocation.progress,
+                    allocation=allocation,
+                )
+                wall_time = time.monotonic() - start
+            self._check_outputs(invocation)
+            self._record_metrics(invocation, progress.latest, wall_time, allocation)
+            for path, limit in self._oversized_outputs(invocation):
+                kbps = parse_bitrate_kbps(self.config.bitrate)
+                for attempt in range(1, SIZE_RETRIES + 1):
+                    retry, kbps = self._prepare_size_retry(path, limit, attempt, kbps, invocation)
+                    try:
+                        self._finish(retry)
+                    except RuntimeError as e:
+                        logger.warning(f"Size retry of {path.name} failed, keeping the original: {e}")
+                        break
+                    if self._replace_sized(retry.outputs[0], path, limit):
+                        break
+        except BaseException:
+            # Don't leave truncated MP4s behind (failure, timeout, cancel)
+            self._cleanup_temp_files(invocation.outputs)
+            raise
         finally:
-            # Clean up temp image
-            if temp_image.exists():
-                temp_image.unlink()
-                logger.debug(f"Cleaned up temp image: {temp_image}")
+            self._cleanup_temp_files(invocation.temp_files)
+        return invocation.outputs
+
+    async def _finish_async(self, invocation: FFmpegInvocation) -> list[Path]:
+        """Async version of _finish (FFmpeg as an asyncio subprocess)."""
+        progress = ProgressParser(invocation.outputs[0].name, invocation.duration)
+        try:
+            async with self.cpu_budget.acquire_async(self.priority) as allocation:
+                start = time.monotonic()
+                await self._run_ffmpeg_async(
+                    self._apply_thread_args(invocation.cmd, invocation.outputs, allocation),
+                    timeout=invocation.timeout,
+                    input_data=invocation.input_data,
+                    frames=invocation.frames,
+                    progress=progress,
+                    on_progress=invocation.progress,
+                    allocation=allocation,
+                )
+                wall_time = time.monotonic() - start
+            self._check_outputs(invocation)
+            self._record_metrics(invocation, progress.latest, wall_time, allocation)
+            for path, limit in self._oversized_outputs(invocation):
+                kbps = parse_bitrate_kbps(self.config.bitrate)
+                for attempt in range(1, SIZE_RETRIES + 1):
+                    retry, kbps = self._prepare_size_retry(path, limit, attempt, kbps, invocation)
+                    try:
+                        await self._finish_async(retry)
+                    except RuntimeError as e:
+                        logger.warning(f"Size retry of {path.name} failed, keeping the original: {e}")
+                        break
+                    if self._replace_sized(retry.outputs[0], path, limit):
+                        break
+        except BaseException:
+            # Don't leave truncated MP4s behind (failure, timeout, cancel)
+            self._cleanup_temp_files(invocation.outputs)
+            raise
+        finally:
+            self._cleanup_temp_files(invocation.temp_files)
+        return invocation.outputs
+
+    def _size_limit(self, duration: Optional[float]) -> Optional[int]:
+        """
+        Largest acceptable output size in bytes for a media duration.
+
+        Returns:
+            Byte limit, or None if outputs are not size-targeted
+        """
+        if self.config.rate_control != "capped" or not duration:
+            return None
+        kbps = parse_bitrate_kbps(self.config.bitrate) + parse_bitrate_kbps(self.config.audio_bitrate)
+        return int(duration * kbps * 1000 / 8 * SIZE_TOLERANCE)
+
+    def _oversized_outputs(self, invocation: FFmpegInvocation) -> list[tuple[Path, int]]:
+        """
+        Outputs of a finished invocation that exceed the size target.
+
+        invocation.duration is the longest output of a multi-output run,
+        so shorter outputs get a looser limit (never a false overshoot).
+        """
+        if not invocation.size_target:
+            return []
+        limit = self._size_limit(invocation.duration)
+        if limit is None:
+            return []
+
+        oversized = []
+        for path in invocation.outputs:
+            size = path.stat().st_size
+            if size > limit:
+                logger.warning(
+                    f"{path.name} overshoots the size target: {size / 1024:.0f} KB > {limit / 1024:.0f} KB, "
+                    f"re-encoding"
+                )
+                oversized.append((path, limit))
+        return oversized
+
+    def _prepare_size_retry(
+        self,
+        path: Path,
+        limit: int,
+        attempt: int,
+        kbps: int,
+        source: FFmpegInvocation,
+    ) -> tuple[FFmpegInvocation, int]:
+        """
+        Re-encode an oversized output with lower quality and a lower cap.
+
+        The previous cap is scaled by how far the output overshot, so a
+        single retry usually lands inside the limit; every attempt also
+        raises CRF by SIZE_RETRY_CRF_STEP. Retries use a one-second VBV
+        buffer (the buffer is what lets short clips overshoot). Audio is
+        copied.
+
+        Args:
+            path: Oversized output (the input of the retry)
+            limit: Size limit in bytes
+            attempt: 1-based retry number
+            kbps: Video bitrate cap of the encode that produced path
+            source: Invocation that produced the output (timeout, duration)
+
+        Returns:
+            Tuple of (retry invocation, its bitrate cap)
+        """
+        size = path.stat().st_size
+        kbps = max(1, int(kbps * min(1.0, limit / size) * 0.95))
+        crf = min(51, self.config.crf + SIZE_RETRY_CRF_STEP * attempt)
+
+        retry_path = path.with_name(f"_temp_size_{uuid.uuid4().hex}{path.suffix}")
+        cmd = [
+            self.ffmpeg_path, "-y",
+            "-i", str(path),
+            "-map", "0:v", "-map", "0:a?",
+            "-c:v", self.config.codec,
+            "-preset", self.config.preset,
+            "-crf", str(crf),
+            *self._rate_cap_args(kbps, buffer_seconds=1),
+        ]
+        if self.config.gop:
+            cmd.extend(["-g", str(self.config.gop)])
+        cmd.extend([
+            "-c:a", "copy",
+            "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart",
+            str(retry_path),
+        ])
+
+        logger.info(f"Size retry {attempt}/{SIZE_RETRIES} of {path.name}: crf={crf}, maxrate={kbps}k")
+        retry = FFmpegInvocation(
+            cmd=cmd,
+            outputs=[retry_path],
+            timeout=source.timeout,
+            duration=source.duration,
+            size_target=False,
+            progress=source.progress,
+        )
+        return retry, kbps
+
+    @staticmethod
+    def _replace_sized(retry_path: Path, path: Path, limit: int) -> bool:
+        """
+        Move a size retry over the original output.
+
+        Returns:
+            True if the output now fits the limit
+        """
+        retry_path.replace(path)
+        size = path.stat().st_size
+        if size <= limit:
+            logger.info(f"{path.name} fits the size target after re-encode ({size / 1024:.0f} KB)")
+            return True
+        logger.warning(f"{path.name} still over the size target ({size / 1024:.0f} KB > {limit / 1024:.0f} KB)")
+        return False
+
+    def _check_outputs(self, invocation: FFmpegInvocation) -> None:
+        """Verify that FFmpeg wrote every output and log the sizes."""
+        for output_path in invocation.outputs:
+            if not output_path.exists():
+                raise RuntimeError(f"Output file was not created: {output_path}")
+
+            file_size = output_path.stat().st_size / (1024 * 1024)  # MB
+            logger.info(f"Video created: {output_path.name} ({file_size:.1f} MB)")
+
+    def _record_metrics(
+        self,
+        invocation: FFmpegInvocation,
+        progress: RenderProgress,
+        wall_time: float,
+        allocation: Optional[CpuAllocation] = None,
+    ) -> RenderMetrics:
+        """Summarize a finished render, keep it in memory and append it to the metrics log."""
+        metrics = RenderMetrics(
+            outputs=[path.name for path in invocation.outputs],
+            wall_time=round(wall_time, 3),
+            frames=progress.frame,
+            encode_fps=round(progress.frame / wall_time, 2) if wall_time > 0 else 0.0,
+            speed=progress.speed,
+            media_duration=round(progress.out_time, 3),
+            bytes_out=sum(path.stat().st_size for path in invocation.outputs),
+            preset=self.config.preset,
+            motion_engine=self.config.motion_engine,
+            threads=allocation.threads if allocation else 0,
+        )
+        self.render_metrics.append(metrics)
+        if self.metrics_log:
+            self.metrics_log.append(metrics)
+
+        logger.info(
+            f"Render metrics: {metrics.outputs[0]}"
+            f"{f' (+{len(metrics.outputs) - 1})' if len(metrics.outputs) > 1 else ''} "
+            f"{metrics.wall_time:.1f}s wall, {metrics.frames} frames @ {metrics.encode_fps:.1f} fps, "
+            f"speed={metrics.speed}x, {metrics.bytes_out / 1024:.0f} KB"
+        )
+        return metrics
+
+    @staticmethod
+    def _cleanup_temp_files(temp_files: list[Path]) -> None:
+        """Delete intermediate files (overlay / EXIF-corrected images, failed outputs)."""
+        for temp_file in temp_files:
+            if temp_file.exists():
+                temp_file.unlink()
+                logger.debug(f"Cleaned up temp file: {temp_file}")
 
     def _build_static_command(
         self,
@@ -1265,47 +2515,34 @@ class VideoComposer:
         output_path: Path,
         duration: float,
         music_offset: float = 0,
+        frame_size: Optional[tuple[int, int]] = None,
     ) -> list[str]:
         """
         Build FFmpeg command for static photo video.
 
         Scales and pads photo to 9:16 aspect ratio.
         """
-        w = self.config.width
-        h = self.config.height
-
         # Video filter: scale to fit, pad to exact dimensions, center
-        vf = (
-            f"scale={w}:{h}:force_original_aspect_ratio=decrease,"
-            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:black,"
-            f"setsar=1"
-        )
-
-        cmd = [
-            self.ffmpeg_path,
-            "-y",  # Overwrite output
-            "-loop", "1",  # Loop image
-            "-i", str(photo_path),
-        ]
+        vf = self._build_video_filter(_EFFECTS_BY_NAME["static"], duration)
+        still = self.config.still_image_encode
+
+        cmd = [self.ffmpeg_path, "-y"]  # Overwrite output
+        if still:
+            # Scale/pad once per second, then duplicate frames up to output fps
+            image_args, loop_filter = self._image_input_args(photo_path, frame_size, input_fps=1)
+            vf = f"{vf},fps={self.config.fps}"
+        else:
+            image_args, loop_filter = self._image_input_args(photo_path, frame_size)
+        cmd.extend(image_args)
+        vf = loop_filter + vf
 
         # Add music with optional offset
-        if music_offset > 0:
-            cmd.extend(["-ss", f"{music_offset:.3f}"])
-        cmd.extend(["-i", str(music_path)])
+        music_args, audio_copy, audio_filter = self._music_input_args(music_path, music_offset)
+        cmd.extend(music_args)
 
-        cmd.extend([
-            "-vf", vf,
-            "-c:v", self.config.codec,
-            "-preset", self.config.preset,
-            "-crf", str(self.config.crf),
-            "-c:a", "aac",
-            "-b:a", self.config.audio_bitrate,
-            "-t", f"{duration:.3f}",  # Precision to milliseconds
-            "-pix_fmt", "yuv420p",
-            "-movflags", "+faststart",  # Web optimization
-            "-shortest",  # End when shortest input ends
-            str(output_path),
-        ])
+        cmd.extend(["-vf", vf])
+        cmd.extend(self._encode_args(duration, audio_copy=audio_copy, still=still, audio_filter=audio_filter))
+        cmd.append(str(output_path))
 
         return cmd
 
@@ -1356,8 +2593,11 @@ class VideoComposer:
             cmd.extend(["-ss", f"{music_offset:.3f}"])
         cmd.extend(["-i", str(music_path)])
 
+        cmd.extend(["-vf", vf])
+        audio_filter = self._music_volume_filter(music_path)
+        if audio_filter:
+            cmd.extend(["-af", audio_filter])
         cmd.extend([
-            "-vf", vf,
             "-c:v", self.config.codec,
             "-preset", self.config.preset,
             "-crf", str(self.config.crf),
@@ -1389,50 +2629,90 @@ class VideoComposer:
         Returns:
             Path to processed image
         """
-        photo_path = Path(photo_path)
-
-        if not photo_path.exists():
-            raise FileNotFoundError(f"Photo not found: {photo_path}")
-
         if output_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = self.output_dir / f"post_{timestamp}.jpg"
 
-        # Calculate dimensions based on aspect ratio
-        if aspect_ratio == "4:5":
-            w, h = 1080, 1350
-        elif aspect_ratio == "1:1":
-            w, h = 1080, 1080
-        else:  # 1.91:1 landscape
-            w, h = 1080, 566
+        return self._write_post_images(Path(photo_path), {aspect_ratio: Path(output_path)})[aspect_ratio]
 
-        # FFmpeg command to crop and scale
-        vf = (
-            f"scale={w}:{h}:force_original_aspect_ratio=increase,"
-            f"crop={w}:{h}"
-        )
+    def compose_post_images(
+        self,
+        photo_paths: list[Path],
+        aspect_ratios: Iterable[str] = ("4:5",),
+        output_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+    ) -> list[dict[str, Path]]:
+        """
+        Prepare feed post images for many photos in one batch.
 
-        cmd = [
-            self.ffmpeg_path,
-            "-y",
-            "-i", str(photo_path),
-            "-vf", vf,
-            "-q:v", "2",  # High quality JPEG
-            str(output_path),
-        ]
+        Every photo is decoded once (near the largest requested size,
+        see load_image) and all aspect ratios are cropped from that
+        decode. Photos are processed on a thread pool: Pillow releases
+        the GIL while decoding, resampling and encoding.
 
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        Args:
+            photo_paths: Input photos
+            aspect_ratios: Ratios to produce per photo (keys of POST_SIZES)
+            output_dir: Directory for the JPEGs (default: output_dir)
+            max_workers: Parallel photos (None = all render cores)
 
-        if result.returncode != 0:
-            raise RuntimeError(f"FFmpeg failed: {result.stderr[:500]}")
+        Returns:
+            Per photo (input order), a dict of aspect ratio -> image path
 
-        logger.info(f"Post image created: {output_path.name}")
-        return output_path
+        Raises:
+            ValueError: If an aspect ratio is unknown
+            FileNotFoundError: If a photo does not exist
+        """
+        aspect_ratios = list(dict.fromkeys(aspect_ratios))
+        out_dir = Path(output_dir) if output_dir else self.output_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        jobs = []
+        for i, photo_path in enumerate(photo_paths, start=1):
+            outputs = {
+                ratio: out_dir / f"post_{timestamp}_{i:02d}_{ratio.replace(':', 'x')}.jpg"
+                for ratio in aspect_ratios
+            }
+            jobs.append((Path(photo_path), outputs))
+
+        workers = max_workers or self.cpu_budget.total_cores
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs) or 1))) as pool:
+            results = list(pool.map(lambda job: self._write_post_images(*job), jobs))
+
+        logger.info(
+            f"Post images created: {len(jobs)} photos x {len(aspect_ratios)} ratios "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+        return results
+
+    def _write_post_images(self, photo_path: Path, outputs: dict[str, Path]) -> dict[str, Path]:
+        """Decode a photo once and write a cover crop per aspect ratio."""
+        unknown = [ratio for ratio in outputs if ratio not in POST_SIZES]
+        if unknown:
+            raise ValueError(
+                f"Unknown post aspect ratio '{unknown[0]}' (available: {', '.join(POST_SIZES)})"
+            )
+        if not photo_path.exists():
+            raise FileNotFoundError(f"Photo not found: {photo_path}")
+
+        # Smallest decode that covers every requested size
+        sizes = [POST_SIZES[ratio] for ratio in outputs]
+        decode_size = (max(w for w, _ in sizes), max(h for _, h in sizes))
+        img = load_image(photo_path, decode_size, fit="cover").convert("RGB")
+
+        for ratio, output_path in outputs.items():
+            post = fit_image(img, POST_SIZES[ratio], fit="cover")
+            post.save(output_path, "JPEG", quality=POST_JPEG_QUALITY)
+            logger.info(f"Post image created: {output_path.name}")
+        return outputs
 
     def _random_story_duration(
         self,
         min_seconds: float = 5.0,
         max_seconds: float = 8.0,
+        rng: Optional[random.Random] = None,
     ) -> float:
         """
         Generate random story duration with hundredths precision.
@@ -1442,59 +2722,247 @@ class VideoComposer:
         Args:
             min_seconds: Minimum duration
             max_seconds: Maximum duration
+            rng: Optional random generator (module-level random if None)
+
+        Returns:
+            Random duration like 5.48, 7.22, etc.
+        """
+        rng = rng or random
+        return round(rng.uniform(min_seconds, max_seconds), 2)
+
+    def compose_story_series(
+        self,
+        stories: list[dict],
+        music_path: Path,
+        ken_burns: bool = True,
+        story_duration: Optional[float] = None,
+        min_duration: float = 5.0,
+        max_duration: float = 8.0,
+        text_config: Optional[TextOverlayConfig] = None,
+        motion_effects: bool = True,
+        max_workers: Optional[int] = None,
+        seed: Optional[str] = None,
+        engine: Optional[str] = None,
+        profile: Optional[str] = None,
+        reel_path: Optional[Path] = None,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
+    ) -> list[Path]:
+        """
+        Create a series of story videos with continuous music.
+
+        Each video uses a sequential segment of the same music track,
+        creating a continuous listening experience when played in order.
+
+        All per-story decisions (duration, music offset, effect, text position)
+        are made up front, so stories can be rendered in parallel.
+
+        Args:
+            stories: List of dicts with 'photo_path' and 'text' keys
+            music_path: Path to music file (will be split into segments)
+            ken_burns: Legacy parameter (ignored when motion_effects is set)
+            story_duration: Fixed duration for all stories (None = random per story)
+            min_duration: Minimum random duration (default: 5.0 seconds)
+            max_duration: Maximum random duration (default: 8.0 seconds)
+            text_config: Optional text overlay config (with font from rotation)
+            motion_effects: If True, pick random effect per story. If False, all static.
+            max_workers: Number of stories rendered concurrently
+                (None = config.render_workers, 1 = sequential)
+            seed: Optional series seed. When set, each story's random choices
+                (duration, effect, text position) depend only on the seed and
+                its photo, so re-rendering the same series hits the render cache.
+            engine: "per_story" (one FFmpeg process per story, optionally parallel),
+                "single_process" (one FFmpeg process writes all stories) or
+                "reel" (one continuous encode, stream-copied into stories).
+                None = config.series_engine.
+            profile: Render profile name ("final", "preview"; None = config.profile)
+            reel_path: With the "reel" engine, keep the full series as one
+                video here (ignored by other engines)
+            progress_callback: Called with every progress update of this
+                series (in addition to the composer's progress_callback;
+                may be called from worker threads). Updates name the
+                output they belong to.
+
+        Returns:
+            List of paths to created video files (in story order)
+        """
+        if profile and profile != self.config.profile:
+            return self.with_profile(profile).compose_story_series(
+                stories, music_path, ken_burns, story_duration, min_duration, max_duration,
+                text_config, motion_effects, max_workers, seed, engine, reel_path=reel_path,
+                progress_callback=progress_callback,
+            )
+
+        music_path = Path(music_path)
+        if not music_path.exists():
+            raise FileNotFoundError(f"Music not found: {music_path}")
+
+        jobs = self._plan_story_series(
+            stories=stories,
+            music_path=music_path,
+            story_duration=story_duration,
+            min_duration=min_duration,
+            max_duration=max_duration,
+            text_config=text_config,
+            motion_effects=motion_effects,
+            seed=seed,
+            progress_callback=progress_callback,
+        )
+        self._prepare_series_music(music_path)
+
+        engine = self._resolve_series_engine(engine, jobs)
+        workers = max_workers if max_workers is not None else self.config.render_workers
+        workers = max(1, min(workers, len(jobs)))
+
+        if engine == "reel" and jobs:
+            video_paths = self._render_series_reel(jobs, music_path, reel_path)
+        elif engine == "single_process" and len(jobs) > 1:
+            video_paths = self._render_series_single_process(jobs, music_path)
+        elif workers > 1:
+            logger.info(f"Rendering {len(jobs)} stories with {workers} parallel workers")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render") as executor:
+                # map() preserves input order, so paths come back in story order
+                video_paths = list(executor.map(
+                    lambda job: self._render_story_job(job, music_path), jobs
+                ))
+        else:
+            video_paths = [self._render_story_job(job, music_path) for job in jobs]
+
+        total_duration = sum(job.duration for job in jobs)
+        logger.info(f"Story series complete: {len(video_paths)} videos, total {total_duration:.2f}s")
+        return video_paths
+
+    async def compose_story_series_async(
+        self,
+        stories: list[dict],
+        music_path: Path,
+        ken_burns: bool = True,
+        story_duration: Optional[float] = None,
+        min_duration: float = 5.0,
+        max_duration: float = 8.0,
+        text_config: Optional[TextOverlayConfig] = None,
+        motion_effects: bool = True,
+        max_workers: Optional[int] = None,
+        seed: Optional[str] = None,
+        engine: Optional[str] = None,
+        story_timeout: int = 300,
+        profile: Optional[str] = None,
+        reel_path: Optional[Path] = None,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
+    ) -> list[Path]:
+        """
+        Async version of compose_story_series for use inside the bot's event loop.
+
+        Stories run as asyncio subprocesses (at most max_workers at once).
+        If one story fails or the task is cancelled, the remaining FFmpeg
+        processes are killed.
+
+        Args:
+            story_timeout: FFmpeg timeout per story in seconds
+                (other args as in compose_story_series)
+
+        Returns:
+            List of paths to created video files (in story order)
+        """
+        if profile and profile != self.config.profile:
+            return await self.with_profile(profile).compose_story_series_async(
+                stories, music_path, ken_burns, story_duration, min_duration, max_duration,
+                text_config, motion_effects, max_workers, seed, engine, story_timeout,
+                reel_path=reel_path, progress_callback=progress_callback,
+            )
+
+        music_path = Path(music_path)
+        if not music_path.exists():
+            raise FileNotFoundError(f"Music not found: {music_path}")
+
+        jobs = await asyncio.to_thread(
+            self._plan_story_series,
+            stories=stories,
+            music_path=music_path,
+            story_duration=story_duration,
+            min_duration=min_duration,
+            max_duration=max_duration,
+            text_config=text_config,
+            motion_effects=motion_effects,
+            seed=seed,
+            progress_callback=progress_callback,
+        )
+        await asyncio.to_thread(self._prepare_series_music, music_path)
+
+        engine = self._resolve_series_engine(engine, jobs)
+        workers = max_workers if max_workers is not None else self.config.render_workers
+        workers = max(1, min(workers, len(jobs)))
+
+        if engine == "reel" and jobs:
+            video_paths = await self._render_series_reel_async(
+                jobs, music_path, reel_path, timeout=story_timeout,
+            )
+        elif engine == "single_process" and len(jobs) > 1:
+            video_paths = await self._render_series_single_process_async(
+                jobs, music_path, timeout=story_timeout,
+            )
+        else:
+            semaphore = asyncio.Semaphore(workers)
 
-        Returns:
-            Random duration like 5.48, 7.22, etc.
-        """
-        return round(random.uniform(min_seconds, max_seconds), 2)
+            async def render(job: StoryRenderJob) -> Path:
+                async with semaphore:
+                    return await self._render_story_job_async(job, music_path, timeout=story_timeout)
 
-    def compose_story_series(
+            tasks = [asyncio.create_task(render(job)) for job in jobs]
+            try:
+                video_paths = list(await asyncio.gather(*tasks))
+            except BaseException:
+                # gather() leaves siblings running on error; stop their FFmpeg too
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        total_duration = sum(job.duration for job in jobs)
+        logger.info(f"Story series complete: {len(video_paths)} videos, total {total_duration:.2f}s")
+        return video_paths
+
+    def _plan_story_series(
         self,
         stories: list[dict],
         music_path: Path,
-        ken_burns: bool = True,
         story_duration: Optional[float] = None,
         min_duration: float = 5.0,
         max_duration: float = 8.0,
         text_config: Optional[TextOverlayConfig] = None,
         motion_effects: bool = True,
-    ) -> list[Path]:
+        seed: Optional[str] = None,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
+    ) -> list[StoryRenderJob]:
         """
-        Create a series of story videos with continuous music.
-
-        Each video uses a sequential segment of the same music track,
-        creating a continuous listening experience when played in order.
-
-        Args:
-            stories: List of dicts with 'photo_path' and 'text' keys
-            music_path: Path to music file (will be split into segments)
-            ken_burns: Legacy parameter (ignored when motion_effects is set)
-            story_duration: Fixed duration for all stories (None = random per story)
-            min_duration: Minimum random duration (default: 5.0 seconds)
-            max_duration: Maximum random duration (default: 8.0 seconds)
-            text_config: Optional text overlay config (with font from rotation)
-            motion_effects: If True, pick random effect per story. If False, all static.
+        Resolve durations, music offsets, effects and text configs for a series.
 
         Returns:
-            List of paths to created video files
+            One StoryRenderJob per story, in story order
         """
-        music_path = Path(music_path)
-        if not music_path.exists():
-            raise FileNotFoundError(f"Music not found: {music_path}")
-
         # Get total music duration
         music_duration = self._get_media_duration(music_path)
 
+        # One generator per story: with a seed, a story keeps its choices
+        # even when other stories of the series are deleted or edited
+        rngs = [
+            random.Random(f"{seed}:{Path(story['photo_path']).name}") if seed is not None else random
+            for story in stories
+        ]
+
         # Pre-generate durations for each story
         durations = []
-        for _ in stories:
+        for i, _ in enumerate(stories):
             if story_duration is not None:
                 durations.append(float(story_duration))
             else:
-                durations.append(self._random_story_duration(min_duration, max_duration))
+                durations.append(self._random_story_duration(min_duration, max_duration, rng=rngs[i]))
 
         total_needed = sum(durations)
 
+        # Previews get their own names, so they never overwrite final renders
+        prefix = "story" if self.config.profile == "final" else f"story_{self.config.profile}"
+        run_id = uuid.uuid4().hex[:8]
+
         if not music_duration:
             music_duration = total_needed + 30  # Estimate if can't detect
 
@@ -1504,9 +2972,6 @@ class VideoComposer:
                 f"Last stories may have overlapping/repeated music."
             )
 
-        video_paths = []
-        music_offset = 0.0
-
         # Get fonts from config — select ONE font for entire series
         series_font_path = None
         series_font_cfg = None
@@ -1529,6 +2994,9 @@ class VideoComposer:
                             series_font_path = font_path
                             series_font_cfg = font_config
 
+        jobs = []
+        music_offset = 0.0
+
         for i, story in enumerate(stories):
             photo_path = Path(story["photo_path"])
             text = story.get("text", "")
@@ -1540,7 +3008,7 @@ class VideoComposer:
 
             # Pick motion effect for this story
             if motion_effects:
-                effect = self._pick_random_effect()
+                effect = self._pick_random_effect(rng=rngs[i])
             else:
                 effect = _EFFECTS_BY_NAME["static"]
 
@@ -1548,7 +3016,7 @@ class VideoComposer:
             story_text_config = text_config
             if text and series_font_path:
                 # Random position for this story (variety within series)
-                position = random.choice(TEXT_POSITIONS)
+                position = rngs[i].choice(TEXT_POSITIONS)
 
                 # Scale max_width_chars inversely with size_multiplier
                 # to prevent wide fonts from overflowing safe zones
@@ -1562,41 +3030,845 @@ class VideoComposer:
                     max_width_chars=scaled_max_chars,
                 )
                 logger.info(
-                    f"Composing story {i + 1}/{len(stories)}: "
+                    f"Planned story {i + 1}/{len(stories)}: "
                     f"font={series_font_cfg.name}, pos={position}, bg={not series_font_cfg.is_bold}, "
                     f"effect={effect.name}"
                 )
             else:
                 logger.info(
-                    f"Composing story {i + 1}/{len(stories)}: "
+                    f"Planned story {i + 1}/{len(stories)}: "
                     f"duration={duration:.2f}s, music_offset={music_offset:.2f}s, "
                     f"effect={effect.name}"
                 )
 
-            if text:
-                video_path = self.compose_story_with_overlay(
-                    photo_path=photo_path,
-                    music_path=music_path,
-                    text=text,
-                    duration=duration,
-                    text_config=story_text_config,
-                    music_offset=music_offset,
-                    motion_effect=effect.name,
-                )
+            jobs.append(StoryRenderJob(
+                index=len(jobs),
+                photo_path=photo_path,
+                text=text,
+                duration=duration,
+                music_offset=music_offset,
+                effect=effect,
+                output_path=self._generate_output_filename(prefix=prefix, index=len(jobs) + 1, run_id=run_id),
+                text_config=story_text_config,
+                progress=progress_callback,
+            ))
+            music_offset += duration  # Advance to next segment
+
+        return jobs
+
+    def _render_cache_key(self, job: StoryRenderJob, music_path: Path, layer: str = "final") -> str:
+        """
+        Build the render cache key for a planned story.
+
+        layer="base" keys the textless base clip of the layered render
+        path: text, font and text styling are left out.
+        """
+        music_stat = music_path.stat()
+
+        text_cfg = job.text_config or self.config.text_overlay
+        font_path = text_cfg.font_path or self._default_font
+        font_id = None
+        if font_path and font_path.exists():
+            # Name + size instead of absolute path: host and container paths differ
+            font_id = (font_path.name, font_path.stat().st_size)
+        text_fields = {
+            k: v for k, v in asdict(text_cfg).items()
+            if k not in ("font_path", "emoji_font_path")
+        }
+
+        video_fields = {
+            k: v for k, v in asdict(self.config).items()
+            if k not in ("text_overlay", "render_workers", "niceness")
+        }
+
+        parts = {
+            "photo": hash_file(job.photo_path),
+            "text": job.text,
+            "font": font_id,
+            "text_config": sorted(text_fields.items()),
+            "effect": job.effect.name,
+            "duration": round(job.duration, 3),
+            "music": (music_path.name, music_stat.st_size, music_stat.st_mtime_ns),
+            "music_offset": round(job.music_offset, 3),
+            "music_copy": self.music_cache is not None,
+            "video_config": sorted(video_fields.items()),
+        }
+        if layer == "base":
+            # Shared by every text version of the story
+            for name in ("text", "font", "text_config"):
+                del parts[name]
+            parts["layer"] = "base"
+
+        return RenderCache.make_key(parts)
+
+    def _render_story_job(self, job: StoryRenderJob, music_path: Path) -> Path:
+        """Render a single planned story (safe to call from worker threads)."""
+        hit, cache_key = self._fetch_cached_job(job, music_path)
+        if hit:
+            return job.output_path
+
+        self._log_story_job(job)
+        if self._use_layers(job):
+            video_path = self._render_layered_job(job, music_path)
+        else:
+            video_path = self._finish(self._prepare_story_job(job, music_path))[0]
+
+        self._store_cached(cache_key, video_path)
+        return video_path
+
+    async def _render_story_job_async(
+        self,
+        job: StoryRenderJob,
+        music_path: Path,
+        timeout: int = 300,
+    ) -> Path:
+        """Async version of _render_story_job."""
+        hit, cache_key = await asyncio.to_thread(self._fetch_cached_job, job, music_path)
+        if hit:
+            return job.output_path
+
+        self._log_story_job(job)
+        if self._use_layers(job):
+            video_path = await self._render_layered_job_async(job, music_path, timeout)
+        else:
+            invocation = await asyncio.to_thread(self._prepare_story_job, job, music_path)
+            invocation.timeout = timeout
+            video_path = (await self._finish_async(invocation))[0]
+
+        await asyncio.to_thread(self._store_cached, cache_key, video_path)
+        return video_path
+
+    def _use_layers(self, job: StoryRenderJob) -> bool:
+        """
+        Check whether a story goes through the layered render path.
+
+        Only motion stories with text benefit: their base clip is the
+        expensive part, and it needs the render cache to be reused.
+        Static stories are cheaper to burn in and still-encode directly.
+        """
+        return (
+            self.config.layered_overlay
+            and self.render_cache is not None
+            and bool(job.text)
+            and not job.effect.is_static
+            and self._resolve_text_config(job.text_config) is not None
+        )
+
+    def _render_layered_job(self, job: StoryRenderJob, music_path: Path) -> Path:
+        """
+        Render a story as cached base clip plus text overlay pass.
+
+        The textless motion clip is looked up in (or added to) the render
+        cache, so re-rendering with edited text only runs the overlay pass.
+        """
+        base_path, base_invocation, base_key = self._prepare_base_clip(job, music_path)
+        if base_invocation:
+            self._finish(base_invocation)
+            self._store_cached(base_key, base_path)
+
+        return self._finish(self._prepare_overlay_pass(job, base_path))[0]
+
+    async def _render_layered_job_async(
+        self,
+        job: StoryRenderJob,
+        music_path: Path,
+        timeout: int = 300,
+    ) -> Path:
+        """Async version of _render_layered_job (timeout per FFmpeg pass)."""
+        base_path, base_invocation, base_key = await asyncio.to_thread(
+            self._prepare_base_clip, job, music_path,
+        )
+        if base_invocation:
+            base_invocation.timeout = timeout
+            await self._finish_async(base_invocation)
+            await asyncio.to_thread(self._store_cached, base_key, base_path)
+
+        invocation = await asyncio.to_thread(self._prepare_overlay_pass, job, base_path)
+        invocation.timeout = timeout
+        return (await self._finish_async(invocation))[0]
+
+    def _prepare_base_clip(
+        self,
+        job: StoryRenderJob,
+        music_path: Path,
+    ) -> tuple[Path, Optional[FFmpegInvocation], str]:
+        """
+        Get the textless base clip of a story at a temp path.
+
+        Returns:
+            Tuple of (temp base path, invocation that still has to run or
+            None on a cache hit, base cache key)
+        """
+        base_path = self.output_dir / f"_temp_base_{uuid.uuid4().hex}.mp4"
+        base_key = self._render_cache_key(job, music_path, layer="base")
+        if self.render_cache.fetch(base_key, base_path):
+            return base_path, None, base_key
+
+        # Same framing as burned-in overlays: motion over the cover crop
+        frame = self._load_cover_image(job.photo_path).convert("RGB")
+
+        base_composer = copy.copy(self)
+        # Intermediate clip: not size-targeted, the overlay pass is
+        base_composer.config = replace(
+            self.config,
+            crf=max(0, self.config.crf - LAYER_BASE_CRF_OFFSET),
+            rate_control="crf",
+        )
+        invocation = base_composer._prepare_story(
+            photo_path=job.photo_path,
+            music_path=music_path,
+            output_path=base_path,
+            duration=job.duration,
+            music_offset=job.music_offset,
+            motion_effect=job.effect.name,
+            frame=frame,
+        )
+        invocation.progress = job.progress
+        return base_path, invocation, base_key
+
+    def _prepare_overlay_pass(self, job: StoryRenderJob, base_path: Path) -> FFmpegInvocation:
+        """
+        Render the text layer and build the overlay pass over a base clip.
+
+        The base clip and the layer PNG are temp files of the invocation.
+        """
+        temp_files = [base_path]
+        try:
+            txt_cfg = self._resolve_text_config(job.text_config)
+            layer_path = self.output_dir / f"_temp_layer_{uuid.uuid4().hex}.png"
+            temp_files.append(layer_path)
+            self._render_text_layer(job.text, txt_cfg).save(layer_path, "PNG", compress_level=1)
+
+            cmd = self._build_overlay_command(base_path, layer_path, job.output_path, job.duration)
+        except BaseException:
+            self._cleanup_temp_files(temp_files)
+            raise
+
+        return FFmpegInvocation(
+            cmd=cmd,
+            outputs=[job.output_path],
+            temp_files=temp_files,
+            duration=job.duration,
+            progress=job.progress,
+        )
+
+    def _build_overlay_command(
+        self,
+        base_path: Path,
+        layer_path: Path,
+        output_path: Path,
+        duration: float,
+    ) -> list[str]:
+        """
+        Build FFmpeg command that composites a text layer over a base clip.
+
+        The base clip's audio is stream-copied; only video is re-encoded.
+        """
+        w = self.config.width
+        h = self.config.height
+
+        # Text layer is laid out at final size; scale it for preview profiles
+        layer = "[1:v]"
+        scale = ""
+        if self.overlay_size != (w, h):
+            scale = f"[1:v]scale={w}:{h}[layer];"
+            layer = "[layer]"
+
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            "-i", str(base_path),
+            "-i", str(layer_path),
+            "-filter_complex", f"{scale}[0:v]{layer}overlay=0:0:format=auto,setsar=1[v]",
+            "-map", "[v]",
+            "-map", "0:a?",
+        ]
+        cmd.extend(self._encode_args(duration, audio_copy=True))
+        cmd.append(str(output_path))
+        return cmd
+
+    def _fetch_cached_job(
+        self,
+        job: StoryRenderJob,
+        music_path: Path,
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Try to serve a planned story from the render cache.
+
+        Returns:
+            Tuple of (hit, cache key). On a hit the output is already in
+            place; on a miss the key is where to store the render
+            (None when caching is off).
+        """
+        if not self.render_cache:
+            return False, None
+        cache_key = self._render_cache_key(job, music_path)
+        return self.render_cache.fetch(cache_key, job.output_path), cache_key
+
+    def _store_cached(self, cache_key: Optional[str], video_path: Path) -> None:
+        """Store a fresh render in the cache (no-op without a key)."""
+        if not cache_key:
+            return
+        try:
+            self.render_cache.put(cache_key, video_path)
+        except OSError as e:
+            logger.warning(f"Failed to store render in cache: {e}")
+
+    @staticmethod
+    def _log_story_job(job: StoryRenderJob) -> None:
+        logger.info(
+            f"Composing story {job.index + 1}: {job.photo_path.name} "
+            f"({job.duration:.2f}s, offset={job.music_offset:.2f}s, effect={job.effect.name})"
+        )
+
+    def _resolve_text_config(
+        self,
+        text_config: Optional[TextOverlayConfig],
+    ) -> Optional[TextOverlayConfig]:
+        """Return text config with a usable font, or None if no font exists."""
+        txt_cfg = text_config or self.config.text_overlay
+        font_path = txt_cfg.font_path or self._default_font
+        if not font_path or not font_path.exists():
+            return None
+        txt_cfg.font_path = font_path
+        return txt_cfg
+
+    def _prepare_story_image(self, job: StoryRenderJob, temp_files: list[Path]) -> Path:
+        """
+        Produce the still image FFmpeg should encode for a planned story.
+
+        Burns in the text overlay (if any) or applies EXIF orientation.
+        Temp files created here are appended to temp_files for cleanup.
+        """
+        txt_cfg = self._resolve_text_config(job.text_config) if job.text else None
+
+        if txt_cfg:
+            temp_image = self.output_dir / f"_temp_overlay_{uuid.uuid4().hex}.jpg"
+            temp_files.append(temp_image)
+            self._add_text_overlay_pillow(
+                image_path=job.photo_path,
+                text=job.text,
+                output_path=temp_image,
+                text_config=txt_cfg,
+            )
+            return temp_image
+
+        if job.text:
+            logger.warning("No font found, rendering story without overlay")
+
+        if job.effect.is_static and self.photo_store:
+            return self._static_source(job.photo_path)
+
+        image_path, cleanup = self._apply_exif_orientation(job.photo_path)
+        if cleanup:
+            temp_files.append(image_path)
+        return image_path
+
+    def _build_series_command(
+        self,
+        jobs: list[StoryRenderJob],
+        image_paths: list[Path],
+        music_path: Path,
+    ) -> list[str]:
+        """
+        Build one FFmpeg command that writes every story of a series.
+
+        Music is opened and decoded once, split per story with atrim.
+        Each story keeps the same filter chain and encoder options as
+        the zoompan per-story commands, written as a separate MP4 output.
+        Only used when no option needs a per-story process (see
+        _resolve_series_engine).
+        """
+        cmd = [self.ffmpeg_path, "-y"]
+
+        for job, image_path in zip(jobs, image_paths):
+            # Bound the looped image so finished outputs stop pulling frames
+            cmd.extend([
+                "-loop", "1",
+                "-t", f"{job.duration + 1:.3f}",
+                "-i", str(image_path),
+            ])
+
+        music_input = len(jobs)
+        cmd.extend(["-i", str(music_path)])
+        volume = self._music_volume_filter(music_path)
+        gain = f",{volume}" if volume else ""
+
+        split_labels = "".join(f"[as{i}]" for i in range(len(jobs)))
+        graph = [f"[{music_input}:a]asplit={len(jobs)}{split_labels}"]
+        for i, job in enumerate(jobs):
+            vf = self._build_video_filter(job.effect, job.duration)
+            graph.append(f"[{i}:v]{vf}[v{i}]")
+            graph.append(
+                f"[as{i}]atrim=start={job.music_offset:.3f}:duration={job.duration:.3f},"
+                f"asetpts=PTS-STARTPTS{gain}[a{i}]"
+            )
+        cmd.extend(["-filter_complex", ";".join(graph)])
+
+        for i, job in enumerate(jobs):
+            cmd.extend(["-map", f"[v{i}]", "-map", f"[a{i}]"])
+            cmd.extend(self._encode_args(job.duration))
+            cmd.append(str(job.output_path))
+
+        return cmd
+
+    def _resolve_series_engine(self, engine: Optional[str], jobs: list[StoryRenderJob]) -> str:
+        """
+        Pick the series engine for planned stories.
+
+        The single_process graph reads looped images and decodes the music
+        itself, so it cannot produce the same output as per-story renders
+        when these are on; the series is then rendered per story.
+        """
+        engine = engine or self.config.series_engine
+        if engine != "single_process":
+            return engine
+
+        reasons = []
+        if self.config.motion_engine == "frames" and any(not job.effect.is_static for job in jobs):
+            reasons.append("piped motion frames (motion_engine=frames)")
+        if self.config.still_image_encode and any(job.effect.is_static for job in jobs):
+            reasons.append("1 fps still-image encodes")
+        if self.music_cache is not None:
+            reasons.append("stream-copied music from the music cache")
+        if reasons:
+            logger.info(f"single_process engine cannot do {', '.join(reasons)}; rendering per story")
+            return "per_story"
+        return engine
+
+    def _render_series_single_process(
+        self,
+        jobs: list[StoryRenderJob],
+        music_path: Path,
+    ) -> list[Path]:
+        """
+        Render all planned stories with a single FFmpeg invocation.
+
+        Stories already in the render cache are served from it; only the
+        remaining ones go into the FFmpeg graph.
+        """
+        pending, cache_keys = self._split_cached_jobs(jobs, music_path)
+
+        if pending:
+            invocation = self._prepare_series_invocation(pending, music_path)
+            self._finish(invocation)
+            for job in pending:
+                self._store_cached(cache_keys.get(job.index), job.output_path)
+
+        return [job.output_path for job in jobs]
+
+    async def _render_series_single_process_async(
+        self,
+        jobs: list[StoryRenderJob],
+        music_path: Path,
+        timeout: int = 300,
+    ) -> list[Path]:
+        """Async version of _render_series_single_process (timeout per story)."""
+        pending, cache_keys = await asyncio.to_thread(self._split_cached_jobs, jobs, music_path)
+
+        if pending:
+            invocation = await asyncio.to_thread(self._prepare_series_invocation, pending, music_path)
+            invocation.timeout = timeout * len(pending)
+            await self._finish_async(invocation)
+            for job in pending:
+                await asyncio.to_thread(self._store_cached, cache_keys.get(job.index), job.output_path)
+
+        return [job.output_path for job in jobs]
+
+    def _render_series_reel(
+        self,
+        jobs: list[StoryRenderJob],
+        music_path: Path,
+        reel_path: Optional[Path] = None,
+    ) -> list[Path]:
+        """
+        Render the series as one continuous reel and cut it into stories.
+
+        The reel is encoded once with keyframes forced at every story
+        boundary; the stories are then cut out of it without encoding
+        video again, so the music plays on across consecutive stories.
+
+        Args:
+            jobs: Planned stories
+            music_path: Music track of the series
+            reel_path: Keep the full reel here (None = delete it after the split)
+        """
+        all_cached, cache_keys = self._fetch_reel_stories(jobs, music_path)
+        if all_cached:
+            if reel_path:
+                self._finish(self._prepare_reel_concat(jobs, reel_path))
+            return [job.output_path for job in jobs]
+
+        encode, split, mux = self._prepare_reel_invocations(jobs, music_path, reel_path)
+        try:
+            self._finish(encode)
+            self._finish(split)
+            if mux:
+                self._finish(mux)
+        finally:
+            self._cleanup_temp_files(encode.outputs)
+        for job in jobs:
+            self._store_cached(cache_keys.get(job.index), job.output_path)
+        return [job.output_path for job in jobs]
+
+    async def _render_series_reel_async(
+        self,
+        jobs: list[StoryRenderJob],
+        music_path: Path,
+        reel_path: Optional[Path] = None,
+        timeout: int = 300,
+    ) -> list[Path]:
+        """Async version of _render_series_reel (timeout per story)."""
+        all_cached, cache_keys = await asyncio.to_thread(self._fetch_reel_stories, jobs, music_path)
+        if all_cached:
+            if reel_path:
+                await self._finish_async(self._prepare_reel_concat(jobs, reel_path))
+            return [job.output_path for job in jobs]
+
+        encode, split, mux = await asyncio.to_thread(self._prepare_reel_invocations, jobs, music_path, reel_path)
+        encode.timeout = timeout * len(jobs)
+        try:
+            await self._finish_async(encode)
+            await self._finish_async(split)
+            if mux:
+                await self._finish_async(mux)
+        finally:
+            self._cleanup_temp_files(encode.outputs)
+        for job in jobs:
+            await asyncio.to_thread(self._store_cached, cache_keys.get(job.index), job.output_path)
+        return [job.output_path for job in jobs]
+
+    def _fetch_reel_stories(
+        self,
+        jobs: list[StoryRenderJob],
+        music_path: Path,
+    ) -> tuple[bool, dict[int, str]]:
+        """
+        Serve reel stories from the render cache.
+
+        The reel timeline needs every story, so a single miss means the
+        whole series is encoded again. Stories served on a partial hit
+        are unlinked first: they are hard links to the cache entries, and
+        the split would otherwise rewrite the entries in place.
+
+        Returns:
+            Tuple of (all stories cached, cache key by job index)
+        """
+        all_cached = bool(self.render_cache)
+        cache_keys = {}
+        fetched = []
+        for job in jobs:
+            hit, cache_key = self._fetch_cached_job(job, music_path)
+            all_cached = all_cached and hit
+            if hit:
+                fetched.append(job.output_path)
+            if cache_key:
+                cache_keys[job.index] = cache_key
+        if not all_cached:
+            for path in fetched:
+                path.unlink(missing_ok=True)
+        return all_cached, cache_keys
+
+    def _prepare_reel_concat(self, jobs: list[StoryRenderJob], reel_path: Path) -> FFmpegInvocation:
+        """
+        Join finished stories into a reel without encoding (concat demuxer).
+
+        Used when every story came from the render cache, e.g. after a
+        pre-render; stories start with a keyframe, so they join cleanly.
+        """
+        list_path = self.output_dir / f"_temp_reel_{uuid.uuid4().hex}.txt"
+        lines = []
+        for job in jobs:
+            escaped = str(job.output_path.resolve()).replace("'", "'\\''")
+            lines.append(f"file '{escaped}'")
+        list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        logger.info(f"Joining {len(jobs)} cached stories into a reel")
+        return FFmpegInvocation(
+            cmd=[
+                self.ffmpeg_path, "-y",
+                "-f", "concat", "-safe", "0",
+                "-i", str(list_path),
+                "-c", "copy",
+                "-movflags", "+faststart",
+                str(reel_path),
+            ],
+            outputs=[Path(reel_path)],
+            temp_files=[list_path],
+            timeout=120,
+            duration=sum(job.duration for job in jobs),
+            progress=jobs[0].progress,
+            size_target=False,
+        )
+
+    def _reel_timeline(self, jobs: list[StoryRenderJob]) -> tuple[list[int], list[float]]:
+        """
+        Frame counts and start times of the stories on the reel.
+
+        Story durations are rounded down to whole frames (as zoompan
+        does), so every boundary falls exactly on a frame.
+
+        Returns:
+            Tuple of (frames per story, start time per story in seconds)
+        """
+        fps = self.config.fps
+        frames = [max(1, int(job.duration * fps)) for job in jobs]
+        starts = []
+        elapsed = 0
+        for count in frames:
+            starts.append(elapsed / fps)
+            elapsed += count
+        return frames, starts
+
+    def _build_reel_command(
+        self,
+        jobs: list[StoryRenderJob],
+        image_paths: list[Path],
+        music_path: Path,
+        reel_path: Path,
+    ) -> list[str]:
+        """
+        Build the FFmpeg command that encodes a series as one reel.
+
+        Videos of all stories are concatenated; the music is cut once per
+        contiguous run of segments (a music loop starts a new run) instead
+        of once per story. A keyframe is forced at every story start, half
+        a frame early so rounding never pushes it to the following frame.
+
+        reel_path is an intermediate MOV with PCM audio: stories and the
+        published reel each get a single AAC encode from it (see
+        _build_reel_split_command).
+        """
+        fps = self.config.fps
+        frames, starts = self._reel_timeline(jobs)
+        total = sum(frames) / fps
+
+        cmd = [self.ffmpeg_path, "-y"]
+        for job, image_path in zip(jobs, image_paths):
+            cmd.extend([
+                "-loop", "1",
+                "-framerate", str(fps),
+                "-t", f"{job.duration + 1:.3f}",
+                "-i", str(image_path),
+            ])
+        music_input = len(jobs)
+        cmd.extend(["-i", str(music_path)])
+        volume = self._music_volume_filter(music_path)
+        gain = f",{volume}" if volume else ""
+
+        graph = []
+        for i, (job, count) in enumerate(zip(jobs, frames)):
+            vf = self._build_video_filter(job.effect, job.duration)
+            graph.append(f"[{i}:v]{vf},fps={fps},trim=end_frame={count},setpts=PTS-STARTPTS[v{i}]")
+        video_labels = "".join(f"[v{i}]" for i in range(len(jobs)))
+        graph.append(f"{video_labels}concat=n={len(jobs)}:v=1:a=0[v]")
+
+        # Contiguous music runs: (music start, reel seconds)
+        runs: list[list[float]] = []
+        for i, (job, count) in enumerate(zip(jobs, frames)):
+            previous = jobs[i - 1] if i else None
+            if previous and abs(previous.music_offset + previous.duration - job.music_offset) < 0.001:
+                runs[-1][1] += count / fps
             else:
-                video_path = self.compose_story(
-                    photo_path=photo_path,
-                    music_path=music_path,
-                    duration=duration,
-                    music_offset=music_offset,
-                    motion_effect=effect.name,
+                runs.append([job.music_offset, count / fps])
+
+        if len(runs) == 1:
+            start, length = runs[0]
+            graph.append(f"[{music_input}:a]atrim=start={start:.3f}:duration={length:.3f},asetpts=PTS-STARTPTS{gain},apad[a]")
+        else:
+            split_labels = "".join(f"[as{i}]" for i in range(len(runs)))
+            graph.append(f"[{music_input}:a]asplit={len(runs)}{split_labels}")
+            for i, (start, length) in enumerate(runs):
+                graph.append(
+                    f"[as{i}]atrim=start={start:.3f}:duration={length:.3f},"
+                    f"asetpts=PTS-STARTPTS{gain},apad=whole_dur={length:.3f}[ar{i}]"
                 )
+            run_labels = "".join(f"[ar{i}]" for i in range(len(runs)))
+            graph.append(f"{run_labels}concat=n={len(runs)}:v=0:a=1,apad[a]")
+        cmd.extend(["-filter_complex", ";".join(graph)])
+
+        keyframes = ",".join(f"{max(0.0, start - 0.5 / fps):.6f}" for start in starts[1:])
+        cmd.extend(["-map", "[v]", "-map", "[a]"])
+        cmd.extend(self._video_codec_args())
+        if keyframes:
+            cmd.extend(["-force_key_frames", keyframes])
+        cmd.extend([
+            "-r", str(fps),  # concat leaves the rate unset (FFmpeg would pick 25)
+            "-c:a", "pcm_s16le",
+            "-t", f"{total:.3f}",
+            "-pix_fmt", "yuv420p",
+            str(reel_path),
+        ])
+        return cmd
 
-            video_paths.append(video_path)
-            music_offset += duration  # Advance to next segment
+    def _build_reel_split_command(self, jobs: list[StoryRenderJob], reel_path: Path) -> list[str]:
+        """
+        Build one FFmpeg command that cuts every story out of the reel.
 
-        logger.info(f"Story series complete: {len(video_paths)} videos, total {total_needed:.2f}s")
-        return video_paths
+        Video is stream-copied from the story's forced keyframe up to the
+        next story start. The reel's audio is PCM, so it is cut at the
+        exact boundaries with atrim and encoded to AAC once per story:
+        the only lossy audio generation (copied AAC packets would cut on
+        ~23 ms packet edges and click at every story start).
+        """
+        _, starts = self._reel_timeline(jobs)
+        ends = starts[1:] + [None]
+        # Frame pts sit exactly on the boundary; the tiny margin only
+        # absorbs decimal rounding of the cut times
+        margin = 0.00001
+
+        cmd = [self.ffmpeg_path, "-y", "-i", str(reel_path)]
+        split_labels = "".join(f"[as{i}]" for i in range(len(jobs)))
+        graph = [f"[0:a]asplit={len(jobs)}{split_labels}"] if len(jobs) > 1 else []
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            source = f"[as{i}]" if len(jobs) > 1 else "[0:a]"
+            bounds = f"start={start:.6f}" + (f":end={end:.6f}" if end is not None else "")
+            # Timestamps stay in reel time, so the output -ss below shifts both streams alike
+            graph.append(f"{source}atrim={bounds}[a{i}]")
+        cmd.extend(["-filter_complex", ";".join(graph)])
+
+        for i, (job, start, end) in enumerate(zip(jobs, starts, ends)):
+            cmd.extend(["-map", "0:v", "-map", f"[a{i}]", "-c:v", "copy"])
+            cmd.extend(["-c:a", "aac", "-b:a", self.config.audio_bitrate])
+            if i:
+                cmd.extend(["-ss", f"{start - margin:.6f}"])
+            if end is not None:
+                cmd.extend(["-to", f"{end - margin:.6f}"])
+            cmd.extend(["-movflags", "+faststart", str(job.output_path)])
+        return cmd
+
+    def _prepare_reel_invocations(
+        self,
+        jobs: list[StoryRenderJob],
+        music_path: Path,
+        reel_path: Optional[Path] = None,
+    ) -> tuple[FFmpegInvocation, FFmpegInvocation, Optional[FFmpegInvocation]]:
+        """
+        Prepare story images, the reel encode, the stream-copy split and
+        the reel mux.
+
+        Returns:
+            Tuple of (reel encode, split, reel mux or None if reel_path is
+            not set); the caller deletes the intermediate reel (encode output)
+        """
+        logger.info(f"Encoding {len(jobs)} stories as one reel")
+        intermediate = self.output_dir / f"_temp_reel_{uuid.uuid4().hex}.mov"
+
+        temp_files: list[Path] = []
+        try:
+            image_paths = [self._prepare_story_image(job, temp_files) for job in jobs]
+            cmd = self._build_reel_command(jobs, image_paths, music_path, intermediate)
+        except BaseException:
+            self._cleanup_temp_files(temp_files)
+            raise
+
+        frames, _ = self._reel_timeline(jobs)
+        encode = FFmpegInvocation(
+            cmd=cmd,
+            outputs=[intermediate],
+            temp_files=temp_files,
+            timeout=300 * len(jobs),
+            duration=sum(frames) / self.config.fps,
+            # Size retries would drop the story keyframes; stories are checked after the split
+            size_target=False,
+            progress=jobs[0].progress,
+        )
+        split = FFmpegInvocation(
+            cmd=self._build_reel_split_command(jobs, intermediate),
+            outputs=[job.output_path for job in jobs],
+            timeout=120,
+            duration=max(frames) / self.config.fps,
+            progress=jobs[0].progress,
+        )
+        mux = None
+        if reel_path:
+            mux = FFmpegInvocation(
+                cmd=[
+                    self.ffmpeg_path, "-y",
+                    "-i", str(intermediate),
+                    "-c:v", "copy",
+                    "-c:a", "aac", "-b:a", self.config.audio_bitrate,
+                    "-movflags", "+faststart",
+                    str(reel_path),
+                ],
+                outputs=[Path(reel_path)],
+                timeout=120,
+                duration=sum(frames) / self.config.fps,
+                size_target=False,  # The reel is not a story
+                progress=jobs[0].progress,
+            )
+        return encode, split, mux
+
+    def _split_cached_jobs(
+        self,
+        jobs: list[StoryRenderJob],
+        music_path: Path,
+    ) -> tuple[list[StoryRenderJob], dict[int, str]]:
+        """
+        Serve cached stories and return the ones that still need encoding.
+
+        Returns:
+            Tuple of (pending jobs, cache key by job index)
+        """
+        cache_keys = {}
+        pending = []
+        for job in jobs:
+            hit, cache_key = self._fetch_cached_job(job, music_path)
+            if hit:
+                continue
+            if cache_key:
+                cache_keys[job.index] = cache_key
+            pending.append(job)
+        return pending, cache_keys
+
+    def _prepare_series_invocation(
+        self,
+        pending: list[StoryRenderJob],
+        music_path: Path,
+    ) -> FFmpegInvocation:
+        """Prepare story images and the single-process series command."""
+        logger.info(f"Encoding {len(pending)} stories in one FFmpeg process")
+        temp_files: list[Path] = []
+        try:
+            image_paths = [self._prepare_story_image(job, temp_files) for job in pending]
+            cmd = self._build_series_command(pending, image_paths, music_path)
+        except BaseException:
+            self._cleanup_temp_files(temp_files)
+            raise
+
+        return FFmpegInvocation(
+            cmd=cmd,
+            outputs=[job.output_path for job in pending],
+            temp_files=temp_files,
+            timeout=300 * len(pending),
+            duration=max(job.duration for job in pending),
+            progress=pending[0].progress,
+        )
+
+    def _prepare_story_job(self, job: StoryRenderJob, music_path: Path) -> FFmpegInvocation:
+        """Build the FFmpeg invocation for a planned story (no caching)."""
+        if job.text:
+            invocation = self._prepare_story_with_overlay(
+                photo_path=job.photo_path,
+                music_path=music_path,
+                text=job.text,
+                output_path=job.output_path,
+                duration=job.duration,
+                text_config=job.text_config,
+                music_offset=job.music_offset,
+                motion_effect=job.effect.name,
+            )
+        else:
+            invocation = self._prepare_story(
+                photo_path=job.photo_path,
+                music_path=music_path,
+                output_path=job.output_path,
+                duration=job.duration,
+                music_offset=job.music_offset,
+                motion_effect=job.effect.name,
+            )
+        invocation.progress = job.progress
+        return invocation
 
     def cleanup_old_files(self, keep_days: int = 7) -> int:
         """
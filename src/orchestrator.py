@@ -11,9 +11,12 @@ Coordinates the entire content generation workflow:
 7. Send to moderation (Telegram)
 """
 
+import asyncio
 import logging
+import shutil
+import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -22,6 +25,14 @@ from .modules.news_fetcher import NewsFetcher, NewsResult
 from .modules.text_generator import TextGenerator, GeneratedText, GeneratedStorySeries as TextStorySeries, StoryItem
 from .modules.media_manager import MediaManager, MediaFile
 from .modules.video_composer import VideoComposer, VideoConfig, TextOverlayConfig
+from .modules.render_cache import RenderCache
+from .modules.render_queue import RenderQueue, RenderJob
+from .modules.photo_store import PhotoStore
+from .modules.cpu_budget import CpuBudget
+from .modules.music_cache import MusicTranscodeCache
+from .modules.media_probe import MediaProbeCache
+from .modules.ffmpeg_capabilities import get_ffmpeg_capabilities
+from .modules.ffmpeg_progress import RenderProgress
 from .modules.content_history import ContentHistory, Publication
 from .modules.image_searcher import ImageSearcher
 
@@ -93,6 +104,54 @@ class PreparedStorySeriesResult:
         """Get number of stories."""
         return len(self.stories)
 
+    def to_dict(self) -> dict:
+        """Serialize what rendering needs (render queue payload)."""
+        return {
+            "topic": {
+                "category_id": self.topic.category_id,
+                "category_name": self.topic.category_name,
+                "subtopic": self.topic.subtopic,
+            },
+            "facts": self.facts,
+            "stories": [
+                {
+                    "order": s.order,
+                    "angle": s.angle,
+                    "text": s.text,
+                    "photo_path": str(s.photo.path),
+                    "photo_category": s.photo.category,
+                }
+                for s in self.stories
+            ],
+            "music_path": str(self.music.path),
+            "motion_effects": self.motion_effects,
+            "story_duration": self.story_duration,
+            "font_path": str(self.font_path) if self.font_path else None,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PreparedStorySeriesResult":
+        """Restore a series serialized by to_dict."""
+        return cls(
+            topic=SelectedTopic(**data["topic"]),
+            facts=data.get("facts", ""),
+            stories=[
+                PreparedStory(
+                    order=s["order"],
+                    angle=s.get("angle", ""),
+                    text=s["text"],
+                    photo=MediaFile(path=Path(s["photo_path"]), category=s.get("photo_category")),
+                )
+                for s in data["stories"]
+            ],
+            music=MediaFile(path=Path(data["music_path"])),
+            motion_effects=data.get("motion_effects", True),
+            story_duration=data.get("story_duration"),
+            font_path=Path(data["font_path"]) if data.get("font_path") else None,
+            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else datetime.now(),
+        )
+
 
 @dataclass
 class GeneratedStorySeriesResult:
@@ -110,6 +169,7 @@ class GeneratedStorySeriesResult:
     publication: Optional[Publication] = None
     success: bool = True
     error: Optional[str] = None
+    reel_path: Optional[Path] = None  # Whole series as one video ("reel" series engine)
 
     @property
     def video_paths(self) -> list[Path]:
@@ -144,6 +204,12 @@ class Orchestrator:
         output_dir: Path = None,
         history_path: Path = None,
         fonts_dir: Optional[Path] = None,
+        render_cache_dir: Optional[Path] = None,
+        render_metrics_path: Optional[Path] = None,
+        photo_store_dir: Optional[Path] = None,
+        render_queue_path: Optional[Path] = None,
+        media_probe_path: Optional[Path] = None,
+        ffmpeg_capabilities_path: Optional[Path] = None,
         # Settings
         video_config: Optional[VideoConfig] = None,
         subtopic_cooldown_days: int = 7,
@@ -151,6 +217,14 @@ class Orchestrator:
         music_cooldown_days: int = 14,
         use_image_search: bool = True,
         use_text_overlay: bool = True,
+        render_cache_max_mb: int = 2048,
+        photo_store_max_mb: int = 1024,
+        music_cache_dir: Optional[Path] = None,
+        preload_fonts: bool = False,
+        prerender: bool = False,
+        cpu_cores: Optional[int] = None,
+        cpu_pin: bool = False,
+        render_niceness: int = 0,
     ):
         """
         Initialize orchestrator with all dependencies.
@@ -167,12 +241,30 @@ class Orchestrator:
             output_dir: Directory for generated videos
             history_path: Path to content_history.json
             fonts_dir: Directory with font files for text overlays
+            render_cache_dir: Directory for cached story renders (None = no cache)
+            render_metrics_path: JSONL file for per-render metrics (None = don't log)
+            photo_store_dir: Directory for story-sized photo derivatives (None = no store)
+            render_queue_path: SQLite file of the render job queue (None = render
+                approved series inline)
+            media_probe_path: JSON index of media probe results (None = probe
+                every file once per process)
+            ffmpeg_capabilities_path: JSON file caching the FFmpeg
+                capability probe across runs (None = probe at every start)
             video_config: Optional video settings
             subtopic_cooldown_days: Days before subtopic can repeat
             photo_cooldown_days: Days before photo can repeat
             music_cooldown_days: Days before music can repeat
             use_image_search: Whether to search for images online (vs local pool)
             use_text_overlay: Whether to add text overlay on stories
+            render_cache_max_mb: Size limit of the render cache
+            photo_store_max_mb: Size limit of the photo store
+            music_cache_dir: Directory for AAC music derivatives, story audio is stream-copied (None = no cache)
+            preload_fonts: Parse all rotation fonts at startup (first render is faster)
+            prerender: Render series in the background while they are in
+                moderation (see start_prerender; needs the render cache)
+            cpu_cores: Cores split between concurrent renders (None = detect)
+            cpu_pin: Pin each concurrent render to its own cores
+            render_niceness: Niceness added to FFmpeg processes
         """
         logger.info("Initializing Orchestrator...")
 
@@ -210,11 +302,74 @@ class Orchestrator:
             content_history=self.history,
         )
 
+        self.render_cache: Optional[RenderCache] = None
+        if render_cache_dir:
+            self.render_cache = RenderCache(
+                cache_dir=render_cache_dir,
+                max_size_mb=render_cache_max_mb,
+            )
+            logger.info(f"Render cache enabled: {render_cache_dir} (max {render_cache_max_mb} MB)")
+
+        # One FFmpeg slot per parallel story, each with its share of the cores
+        self.cpu_budget = CpuBudget(
+            max_jobs=video_config.render_workers if video_config else 1,
+            total_cores=cpu_cores,
+            pin=cpu_pin,
+            niceness=render_niceness,
+        )
+
+        # FFmpeg binary, version, encoders and filters (probed once per binary)
+        self.ffmpeg = get_ffmpeg_capabilities(ffmpeg_capabilities_path)
+
         self.video_composer = VideoComposer(
             output_dir=output_dir,
             config=video_config,
             fonts_dir=fonts_dir,
+            render_cache=self.render_cache,
+            metrics_path=render_metrics_path,
+            cpu_budget=self.cpu_budget,
+            capabilities=self.ffmpeg,
         )
+        if preload_fonts:
+            self.video_composer.warm_fonts()
+
+        # Durations and stream layouts of library files, probed once
+        self.media_probe = MediaProbeCache(media_probe_path, self.ffmpeg.ffmpeg_path, self.ffmpeg.ffprobe_path)
+        self.video_composer.probe_cache = self.media_probe
+
+        # Speculative renders of series in moderation: content_id -> task
+        self.prerender = prerender and self.render_cache is not None
+        if prerender and not self.render_cache:
+            logger.warning("Pre-rendering needs the render cache, disabled")
+        self._prerenders: dict[str, asyncio.Task] = {}
+
+        # Approved series rendered by `main.py worker` processes
+        self.render_queue: Optional[RenderQueue] = None
+        if render_queue_path:
+            self.render_queue = RenderQueue(render_queue_path)
+            logger.info(f"Render queue enabled: {render_queue_path}")
+
+        # Oriented, story-sized photos shared by renders and Telegram previews
+        self.photo_store: Optional[PhotoStore] = None
+        if photo_store_dir:
+            self.photo_store = PhotoStore(
+                store_dir=photo_store_dir,
+                size=self.video_composer.overlay_size,
+                max_size_mb=photo_store_max_mb,
+            )
+            self.video_composer.photo_store = self.photo_store
+            logger.info(f"Photo store enabled: {photo_store_dir} (max {photo_store_max_mb} MB)")
+
+        # Pre-transcoded music library
+        self.music_cache: Optional[MusicTranscodeCache] = None
+        if music_cache_dir:
+            self.music_cache = MusicTranscodeCache(
+                cache_dir=music_cache_dir,
+                ffmpeg_path=self.video_composer.ffmpeg_path,
+                audio_bitrate=self.video_composer.config.audio_bitrate,
+            )
+            self.video_composer.music_cache = self.music_cache
+            logger.info(f"Music cache enabled: {music_cache_dir}")
 
         # Initialize image searcher if API keys provided
         self.image_searcher: Optional[ImageSearcher] = None
@@ -287,6 +442,7 @@ class Orchestrator:
         min_count: int = 3,
         max_count: int = 7,
         story_duration: Optional[float] = None,
+        profile: str = "final",
     ) -> Optional[GeneratedStorySeriesResult]:
         """
         Generate a series of connected Instagram Stories.
@@ -299,6 +455,7 @@ class Orchestrator:
             min_count: Minimum number of stories (default 3)
             max_count: Maximum number of stories (default 7)
             story_duration: Duration per story (None = random 5-8s per story)
+            profile: Render profile ("final" or "preview", see RENDER_PROFILES)
 
         Returns:
             GeneratedStorySeriesResult or None on failure
@@ -439,6 +596,7 @@ class Orchestrator:
                 story_duration=story_duration,
                 text_config=text_config,
                 motion_effects=motion_effects,
+                profile=profile,
             )
         except Exception as e:
             logger.error(f"Video composition failed: {e}")
@@ -458,16 +616,20 @@ class Orchestrator:
                 video_path=video_paths[i],
             ))
 
-        # Step 8: Record to history (tracking ALL photos)
-        logger.info("Step 8: Recording to history...")
-        publication = self.history.record_story_series(
-            category_id=topic.category_id,
-            subtopic=topic.subtopic,
-            photo_paths=[str(sd["photo"].path) for sd in story_data],
-            music_path=str(music.path),
-            texts=[sd["text"] for sd in story_data],
-            status="pending",
-        )
+        # Step 8: Record to history (tracking ALL photos); previews are throwaway
+        publication = None
+        if profile == "final":
+            logger.info("Step 8: Recording to history...")
+            publication = self.history.record_story_series(
+                category_id=topic.category_id,
+                subtopic=topic.subtopic,
+                photo_paths=[str(sd["photo"].path) for sd in story_data],
+                music_path=str(music.path),
+                texts=[sd["text"] for sd in story_data],
+                status="pending",
+            )
+        else:
+            logger.info(f"Step 8: Skipping history for {profile} render")
 
         result = GeneratedStorySeriesResult(
             topic=topic,
@@ -646,6 +808,8 @@ class Orchestrator:
         self,
         prepared: PreparedStorySeriesResult,
         approved_stories: list[dict],
+        profile: str = "final",
+        content_id: Optional[str] = None,
     ) -> Optional[GeneratedStorySeriesResult]:
         """
         Render videos only for approved stories after moderation.
@@ -654,6 +818,11 @@ class Orchestrator:
             prepared: PreparedStorySeriesResult from prepare_story_series()
             approved_stories: List of dicts with approved story data:
                 [{"order": 1, "text": "...", "photo_path": "..."}]
+            profile: Render profile. "final" renders for publishing and records
+                the series to history; "preview" renders quick low-res clips
+                for moderators and records nothing.
+            content_id: Moderation id of the series; its background
+                pre-render is stopped first
 
         Returns:
             GeneratedStorySeriesResult or None on failure
@@ -662,7 +831,168 @@ class Orchestrator:
             logger.warning("No approved stories to render")
             return None
 
-        logger.info(f"=== Rendering {len(approved_stories)} approved stories ===")
+        approved_stories, series_args = self._series_render_args(prepared, approved_stories, profile)
+
+        # Finished pre-renders are in the render cache; the rest is rendered now
+        if content_id:
+            self._stop_prerender_sync(content_id)
+
+        # Render videos
+        logger.info("Composing videos...")
+        try:
+            video_paths = self.video_composer.compose_story_series(**series_args)
+        except Exception as e:
+            logger.error(f"Video composition failed: {e}")
+            return None
+
+        return self._record_rendered_series(
+            prepared, approved_stories, video_paths, record_history=profile == "final",
+            reel_path=series_args.get("reel_path"),
+        )
+
+    async def render_approved_stories_async(
+        self,
+        prepared: PreparedStorySeriesResult,
+        approved_stories: list[dict],
+        profile: str = "final",
+        content_id: Optional[str] = None,
+        progress_callback: Optional[Callable[[RenderProgress], None]] = None,
+    ) -> Optional[GeneratedStorySeriesResult]:
+        """
+        Async version of render_approved_stories for the bot's event loop.
+
+        FFmpeg runs as asyncio subprocesses, so Telegram callbacks keep
+        working during the render. Cancelling the task stops the render.
+
+        Args:
+            prepared: PreparedStorySeriesResult from prepare_story_series()
+            approved_stories: List of dicts with approved story data
+            profile: Render profile (see render_approved_stories)
+            content_id: Moderation id of the series (its pre-render is stopped)
+            progress_callback: Receives the FFmpeg progress updates of this
+                render (e.g. a ProgressStream)
+
+        Returns:
+            GeneratedStorySeriesResult or None on failure
+        """
+        if not approved_stories:
+            logger.warning("No approved stories to render")
+            return None
+
+        approved_stories, series_args = self._series_render_args(prepared, approved_stories, profile)
+
+        # Finished pre-renders are in the render cache; the rest is rendered now
+        if content_id:
+            await self._stop_prerender(content_id)
+
+        # Render videos
+        logger.info("Composing videos...")
+        try:
+            video_paths = await self.video_composer.compose_story_series_async(
+                **series_args, progress_callback=progress_callback,
+            )
+        except Exception as e:
+            logger.error(f"Video composition failed: {e}")
+            return None
+
+        return await asyncio.to_thread(
+            self._record_rendered_series, prepared, approved_stories, video_paths,
+            profile == "final", series_args.get("reel_path"),
+        )
+
+    async def enqueue_render(
+        self,
+        prepared: PreparedStorySeriesResult,
+        approved_stories: list[dict],
+        content_id: str,
+        profile: str = "final",
+    ) -> int:
+        """
+        Queue approved stories for a render worker instead of rendering here.
+
+        The series' background pre-render is stopped (the worker renders
+        it; finished pre-renders are render cache hits for the worker).
+
+        Args:
+            prepared: PreparedStorySeriesResult from prepare_story_series()
+            approved_stories: List of dicts with approved story data
+            content_id: Moderation id of the series
+            profile: Render profile (see render_approved_stories)
+
+        Returns:
+            Job id
+
+        Raises:
+            RuntimeError: If the render queue is not enabled
+        """
+        if not self.render_queue:
+            raise RuntimeError("Render queue is not enabled")
+
+        await self._stop_prerender(content_id)
+        payload = {
+            "prepared": prepared.to_dict(),
+            "approved_stories": approved_stories,
+            "profile": profile,
+        }
+        return await asyncio.to_thread(self.render_queue.enqueue, content_id, payload)
+
+    async def render_queued_job(self, job: RenderJob) -> dict:
+        """
+        Render a claimed queue job (worker side, records nothing to history).
+
+        Returns:
+            Job result: {"video_paths": [...]} in story order, plus
+            "reel_path" with the "reel" series engine
+
+        Raises:
+            Exception: Whatever the render raised (the job is retried)
+        """
+        prepared = PreparedStorySeriesResult.from_dict(job.payload["prepared"])
+        _, series_args = self._series_render_args(
+            prepared, job.payload["approved_stories"], job.payload.get("profile", "final"),
+        )
+        video_paths = await self.video_composer.compose_story_series_async(**series_args)
+        result = {"video_paths": [str(p) for p in video_paths]}
+        if series_args.get("reel_path"):
+            result["reel_path"] = str(series_args["reel_path"])
+        return result
+
+    def record_queued_result(self, job: RenderJob) -> Optional[GeneratedStorySeriesResult]:
+        """
+        Build the series result of a finished queue job (bot side).
+
+        Final renders are recorded to history here, in the process that
+        owns the history file, not in the worker.
+
+        Returns:
+            GeneratedStorySeriesResult, or None if the job failed
+        """
+        if job.status != "done" or not job.result:
+            return None
+
+        prepared = PreparedStorySeriesResult.from_dict(job.payload["prepared"])
+        approved_stories = sorted(job.payload["approved_stories"], key=lambda x: x["order"])
+        video_paths = [Path(p) for p in job.result["video_paths"]]
+        reel_path = job.result.get("reel_path")
+        return self._record_rendered_series(
+            prepared, approved_stories, video_paths,
+            record_history=job.payload.get("profile", "final") == "final",
+            reel_path=Path(reel_path) if reel_path else None,
+        )
+
+    def _series_render_args(
+        self,
+        prepared: PreparedStorySeriesResult,
+        approved_stories: list[dict],
+        profile: str = "final",
+    ) -> tuple[list[dict], dict]:
+        """
+        Build compose_story_series arguments for the approved stories.
+
+        Returns:
+            Tuple of (approved stories sorted by order, keyword arguments)
+        """
+        logger.info(f"=== Rendering {len(approved_stories)} approved stories ({profile}) ===")
 
         # Sort by order
         approved_stories = sorted(approved_stories, key=lambda x: x["order"])
@@ -673,26 +1003,43 @@ class Orchestrator:
             for s in approved_stories
         ]
 
+        # Only approved stories are planned, so the music runs on without
+        # gaps. A story's duration, effect and text position depend only on
+        # the seed and its photo; stories before the first deleted one keep
+        # their music offsets and come from the pre-render, later ones are
+        # rendered again with the shifted offsets.
+
         # Create text config with font from rotation (if available)
         text_config = None
         if prepared.font_path:
             text_config = TextOverlayConfig(font_path=prepared.font_path)
             logger.info(f"Using font: {prepared.font_path.name}")
 
-        # Render videos
-        logger.info("Composing videos...")
-        try:
-            video_paths = self.video_composer.compose_story_series(
-                stories=video_stories_input,
-                music_path=prepared.music.path,
-                story_duration=prepared.story_duration,
-                text_config=text_config,
-                motion_effects=prepared.motion_effects,
-            )
-        except Exception as e:
-            logger.error(f"Video composition failed: {e}")
-            return None
-
+        series_args = dict(
+            stories=video_stories_input,
+            music_path=prepared.music.path,
+            story_duration=prepared.story_duration,
+            text_config=text_config,
+            motion_effects=prepared.motion_effects,
+            seed=self._series_seed(prepared),
+            profile=profile,
+        )
+        # Reel engine: the full series comes out of the same encode (Reels account)
+        if profile == "final" and self.video_composer.config.series_engine == "reel":
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Unique per render: series finishing in the same second must not share a file
+            series_args["reel_path"] = self.video_composer.output_dir / f"reel_{timestamp}_{uuid.uuid4().hex[:8]}.mp4"
+        return approved_stories, series_args
+
+    def _record_rendered_series(
+        self,
+        prepared: PreparedStorySeriesResult,
+        approved_stories: list[dict],
+        video_paths: list[Path],
+        record_history: bool = True,
+        reel_path: Optional[Path] = None,
+    ) -> GeneratedStorySeriesResult:
+        """Build the series result for rendered videos and record it to history."""
         logger.info(f"Created {len(video_paths)} videos")
 
         # Build result items
@@ -717,16 +1064,18 @@ class Orchestrator:
                 video_path=video_paths[i],
             ))
 
-        # Record to history
-        logger.info("Recording to history...")
-        publication = self.history.record_story_series(
-            category_id=prepared.topic.category_id,
-            subtopic=prepared.topic.subtopic,
-            photo_paths=[s["photo_path"] for s in approved_stories],
-            music_path=str(prepared.music.path),
-            texts=[s["text"] for s in approved_stories],
-            status="pending",
-        )
+        # Record to history (previews are not publications)
+        publication = None
+        if record_history:
+            logger.info("Recording to history...")
+            publication = self.history.record_story_series(
+                category_id=prepared.topic.category_id,
+                subtopic=prepared.topic.subtopic,
+                photo_paths=[s["photo_path"] for s in approved_stories],
+                music_path=str(prepared.music.path),
+                texts=[s["text"] for s in approved_stories],
+                status="pending",
+            )
 
         result = GeneratedStorySeriesResult(
             topic=prepared.topic,
@@ -735,11 +1084,114 @@ class Orchestrator:
             music=prepared.music,
             publication=publication,
             success=True,
+            reel_path=reel_path if reel_path and reel_path.exists() else None,
         )
 
         logger.info(f"=== Rendered {len(series_items)} stories ===")
         return result
 
+    def start_prerender(self, prepared: PreparedStorySeriesResult, content_id: str) -> bool:
+        """
+        Start rendering a series in the background while it is in moderation.
+
+        Every prepared story is rendered with its original text by a
+        low-priority composer (one story at a time, raised FFmpeg
+        niceness) into the render cache. When moderation finishes,
+        unchanged stories are cache hits, edited stories only need the
+        text overlay pass (layered renders) and deleted ones are dropped.
+        Must be called from the bot's event loop.
+
+        Args:
+            prepared: Series sent for moderation
+            content_id: Moderation id of the series (cancel_prerender key)
+
+        Returns:
+            True if a background render was started
+        """
+        if not self.prerender:
+            return False
+
+        self.cancel_prerender(content_id)
+        task = asyncio.create_task(self._prerender_series(prepared, content_id))
+        self._prerenders[content_id] = task
+        logger.info(f"Pre-rendering {prepared.story_count} stories for {content_id} in background")
+        return True
+
+    def cancel_prerender(self, content_id: str) -> None:
+        """Cancel the background render of a series (e.g. rejected in moderation)."""
+        task = self._prerenders.pop(content_id, None)
+        if task:
+            task.cancel()
+
+    async def _stop_prerender(self, content_id: str) -> None:
+        """Cancel the background render of a series and wait until its FFmpeg is gone."""
+        task = self._prerenders.pop(content_id, None)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _stop_prerender_sync(self, content_id: str) -> None:
+        """
+        _stop_prerender for blocking callers.
+
+        Pre-renders run on the bot's event loop. From another thread the
+        stop is awaited there; called on that loop itself (a blocking
+        render inside a callback) the task can only be cancelled, and
+        its FFmpeg is killed once the loop runs again.
+        """
+        task = self._prerenders.get(content_id)
+        if not task:
+            return
+        loop = task.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop or loop.is_closed():
+            self.cancel_prerender(content_id)
+            return
+        asyncio.run_coroutine_threadsafe(self._stop_prerender(content_id), loop).result()
+
+    async def _prerender_series(self, prepared: PreparedStorySeriesResult, content_id: str) -> None:
+        """Background render of all prepared stories; only the cache entries are kept."""
+        work_dir = self.video_composer.output_dir / ".prerender" / content_id
+        composer = self.video_composer.background(output_dir=work_dir)
+        stories = [
+            {"order": ps.order, "text": ps.text, "photo_path": str(ps.photo.path)}
+            for ps in prepared.stories
+        ]
+        _, series_args = self._series_render_args(prepared, stories)
+        # Stories only; the reel is joined from the cached stories after approval
+        series_args.pop("reel_path", None)
+
+        start = asyncio.get_running_loop().time()
+        try:
+            await composer.compose_story_series_async(**series_args)
+            elapsed = asyncio.get_running_loop().time() - start
+            logger.info(f"Pre-render of {content_id} complete ({elapsed:.1f}s)")
+        except asyncio.CancelledError:
+            logger.info(f"Pre-render of {content_id} cancelled")
+            raise
+        except Exception as e:
+            logger.warning(f"Pre-render of {content_id} failed: {e}")
+        finally:
+            if self._prerenders.get(content_id) is asyncio.current_task():
+                del self._prerenders[content_id]
+            # Outputs are in the render cache (hard links); drop the copies
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    @staticmethod
+    def _series_seed(prepared: PreparedStorySeriesResult) -> str:
+        """
+        Stable seed for a prepared series.
+
+        Re-finishing or retrying the same series then makes the same random
+        choices per story, so unchanged stories come from the render cache.
+        The preparation time keeps two series with the same subtopic and
+        track apart (different durations, effects and text positions).
+        """
+        return f"{prepared.topic.subtopic}|{prepared.music.path.name}|{prepared.created_at.isoformat()}"
+
     def _generate_content(
         self,
         content_type: str,
@@ -947,6 +1399,18 @@ class Orchestrator:
             "topics": self.topic_selector.get_stats(),
             "media": self.media_manager.get_stats(),
             "history": self.history.get_stats(),
+            "fonts": self.video_composer.fonts.get_stats(),
+            "cpu": self.cpu_budget.get_stats(),
+            "media_probe": self.media_probe.get_stats(),
+            "ffmpeg": {
+                "version": self.ffmpeg.version,
+                "ffmpeg_path": self.ffmpeg.ffmpeg_path,
+                "ffprobe_path": self.ffmpeg.ffprobe_path,
+                "encoders": len(self.ffmpeg.encoders),
+                "filters": len(self.ffmpeg.filters),
+                "motion_engine": self.video_composer.config.motion_engine,
+            },
+            "render_queue": self.render_queue.get_stats() if self.render_queue else None,
         }
 
     def close(self):
@@ -260,6 +260,9 @@ def create_default_scheduler(
                 logger.error("Failed to send series to Telegram for moderation")
                 return False
 
+            # Render in the background while the moderator reviews
+            orchestrator.start_prerender(result, content_id)
+
         return True
 
     async def auto_approve_callback() -> bool:
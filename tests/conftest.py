@@ -0,0 +1,46 @@
+"""Shared fixtures. Tests import the app as `src.*` from the project root."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.modules.ffmpeg_capabilities import FFmpegCapabilities  # noqa: E402
+from src.modules.video_composer import VideoComposer, VideoConfig  # noqa: E402
+
+
+@pytest.fixture
+def make_composer(tmp_path):
+    """Build VideoComposers that never look for or run FFmpeg."""
+
+    def make(config: VideoConfig = None, music_duration: float = 120.0) -> VideoComposer:
+        composer = VideoComposer(
+            output_dir=tmp_path / "output",
+            config=config,
+            capabilities=FFmpegCapabilities(ffmpeg_path="ffmpeg"),
+        )
+        composer._get_media_duration = lambda path: music_duration
+        return composer
+
+    return make
+
+
+@pytest.fixture
+def photos(tmp_path):
+    """Three distinct photo files (contents only matter for hashing)."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"photo_{i}.jpg"
+        path.write_bytes(f"photo {i}".encode() * 100)
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def music(tmp_path):
+    path = tmp_path / "track.mp3"
+    path.write_bytes(b"music" * 1000)
+    return path
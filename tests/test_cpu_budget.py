@@ -0,0 +1,63 @@
+"""CPU budget: core split between slots, background slots, FIFO waits."""
+
+import threading
+import time
+
+import pytest
+
+from src.modules.cpu_budget import CpuBudget
+
+
+def test_cores_split_between_slots():
+    budget = CpuBudget(max_jobs=2, total_cores=5)
+    threads = [s.threads for s in budget._slots if s.priority == "foreground"]
+    assert threads == [3, 2]  # Remainder to the first slot
+
+
+def test_more_slots_than_cores():
+    budget = CpuBudget(max_jobs=4, total_cores=2)
+    assert [s.threads for s in budget._slots if s.priority == "foreground"] == [1, 1, 1, 1]
+
+
+def test_background_slots_do_not_take_foreground_ones():
+    budget = CpuBudget(max_jobs=1, total_cores=4, background_jobs=1)
+    with budget.acquire("background") as background:
+        assert background.priority == "background"
+        with budget.acquire() as foreground:
+            assert foreground.priority == "foreground"
+            assert foreground.threads == background.threads == 4
+            stats = budget.get_stats()
+            assert (stats["active"], stats["background_active"]) == (1, 1)
+    assert budget.get_stats()["active"] == 0
+
+
+def test_unknown_priority():
+    budget = CpuBudget()
+    with pytest.raises(ValueError):
+        with budget.acquire("urgent"):
+            pass
+
+
+def test_waiters_are_served_in_arrival_order():
+    budget = CpuBudget(max_jobs=1, total_cores=1)
+    order = []
+
+    def job(name):
+        with budget.acquire():
+            order.append(name)
+
+    with budget.acquire():
+        workers = []
+        for name in ("first", "second", "third"):
+            worker = threading.Thread(target=job, args=(name,))
+            worker.start()
+            workers.append(worker)
+            while budget.get_stats()["waits_by_priority"]["foreground"]["waiting"] < len(workers):
+                time.sleep(0.001)
+    for worker in workers:
+        worker.join(5)
+
+    assert order == ["first", "second", "third"]
+    waits = budget.get_stats()["waits_by_priority"]
+    assert waits["foreground"]["waits"] == 3
+    assert waits["background"]["waits"] == 0
@@ -0,0 +1,43 @@
+"""Parsing of FFmpeg "-progress" output."""
+
+from src.modules.ffmpeg_progress import ProgressParser
+
+BLOCK = """frame=75
+fps=24.5
+bitrate=1200.0kbits/s
+total_size=524288
+out_time_us=3000000
+speed=1.5x
+progress=continue
+"""
+
+
+def test_update_per_block():
+    parser = ProgressParser("story_1.mp4", duration=6.0)
+    updates = [parser.feed(line) for line in BLOCK.splitlines()]
+
+    assert updates[:-1] == [None] * (len(updates) - 1)
+    update = updates[-1]
+    assert (update.frame, update.fps, update.speed) == (75, 24.5, 1.5)
+    assert (update.out_time, update.total_size) == (3.0, 524288)
+    assert update.fraction == 0.5
+    assert not update.done
+
+
+def test_final_block_and_unknown_values():
+    parser = ProgressParser("story_1.mp4")
+    first = [parser.feed(line) for line in BLOCK.splitlines()][-1]
+    for line in ("speed=N/A", "out_time_us=-9223372036854775807", "progress=end"):
+        last = parser.feed(line)
+
+    assert last.done
+    assert last.speed is None
+    assert last.out_time == 3.0  # Negative placeholder ignored
+    assert last.fraction is None  # No duration given
+    assert first.speed == 1.5  # Earlier updates are snapshots
+
+
+def test_ignores_noise():
+    parser = ProgressParser("story_1.mp4")
+    assert parser.feed("") is None
+    assert parser.feed("not a key value line") is None
@@ -0,0 +1,53 @@
+"""Decode sizes and fitting of photos to the story frame."""
+
+import pytest
+from PIL import Image
+
+from src.modules.image_loader import fit_image, load_image, required_size
+
+STORY = (1080, 1920)
+
+
+@pytest.mark.parametrize("image_size, fit, expected", [
+    ((4000, 3000), "cover", (2560, 1920)),  # Height limits the scale
+    ((4000, 3000), "contain", (1080, 810)),
+    ((4000, 3000), "stretch", (1080, 1920)),
+    ((800, 600), "cover", (800, 600)),  # Never upscaled
+])
+def test_required_size(image_size, fit, expected):
+    assert required_size(image_size, STORY, fit) == expected
+
+
+def test_unknown_fit_mode():
+    with pytest.raises(ValueError):
+        required_size((100, 100), STORY, "zoom")
+
+
+@pytest.mark.parametrize("fit, expected", [
+    ("cover", STORY),
+    ("contain", (1080, 810)),
+    ("stretch", STORY),
+])
+def test_fit_image(fit, expected):
+    img = Image.new("RGB", (4000, 3000))
+    assert fit_image(img, STORY, fit).size == expected
+
+
+def test_load_image_decodes_near_target(tmp_path):
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (8000, 6000), "white").save(path)
+
+    img = load_image(path, STORY)
+    needed = required_size((8000, 6000), STORY)
+    assert needed[0] <= img.size[0] < 8000
+    assert needed[1] <= img.size[1] < 6000
+    assert fit_image(img, STORY).size == STORY
+
+
+def test_load_image_applies_exif_orientation(tmp_path):
+    path = tmp_path / "rotated.jpg"
+    exif = Image.Exif()
+    exif[274] = 6  # Rotated 90 degrees: stored landscape, displayed portrait
+    Image.new("RGB", (400, 300)).save(path, exif=exif)
+
+    assert load_image(path).size == (300, 400)
@@ -0,0 +1,38 @@
+"""Merging index files written by several processes."""
+
+import json
+
+from src.modules.json_index import save_json_index
+
+
+def test_merge_with_stored_entries(tmp_path):
+    path = tmp_path / "index.json"
+    path.write_text(json.dumps({"a": {"n": 1}, "b": {"n": 2}}))
+
+    merged = save_json_index(path, {"b": {"n": 5}, "c": {"n": 3}})
+
+    assert merged == {"a": {"n": 1}, "b": {"n": 5}, "c": {"n": 3}}
+    assert json.loads(path.read_text()) == merged
+
+
+def test_merge_callback_and_drop(tmp_path):
+    path = tmp_path / "index.json"
+    path.write_text(json.dumps({"a": {"hits": 2}, "old": {"hits": 1}}))
+
+    merged = save_json_index(
+        path,
+        {"a": {"hits": 3}},
+        merge=lambda stored, own: {"hits": stored["hits"] + own["hits"]},
+        drop=lambda key: key == "old",
+    )
+
+    assert merged == {"a": {"hits": 5}}
+
+
+def test_unreadable_index_is_replaced(tmp_path):
+    path = tmp_path / "sub" / "index.json"
+    path.parent.mkdir()
+    path.write_text("{broken")
+
+    assert save_json_index(path, {"a": {}}) == {"a": {}}
+    assert not [p for p in path.parent.iterdir() if p.name.endswith(".tmp")]
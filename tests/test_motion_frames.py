@@ -0,0 +1,45 @@
+"""Motion effect expressions evaluated by the frames engine."""
+
+import pytest
+
+from src.modules.motion_frames import _eval_expr, compute_crop_windows
+from src.modules.video_composer import MOTION_EFFECTS
+
+VARIABLES = {"on": 3, "iw": 1.0, "ih": 1.0, "zoom": 1.1}
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("1.15", 1.15),
+    ("min(zoom+0.01,1.2)", 1.11),
+    ("max(1.2-on*0.2/150,1.0)", 1.2 - 3 * 0.2 / 150),
+    ("iw/2-(iw/zoom/2)", 0.5 - 0.5 / 1.1),
+    ("-on+4", 1.0),
+])
+def test_expressions(expr, expected):
+    assert _eval_expr(expr, VARIABLES) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("expr", [
+    "__import__('os')",
+    "(1).real",
+    "on**2",
+    "[1][0]",
+    "{total_frames}",  # Unformatted template
+    "abs(on)",
+    "unknown + 1",
+])
+def test_rejects_anything_else(expr):
+    with pytest.raises(ValueError):
+        _eval_expr(expr, VARIABLES)
+
+
+@pytest.mark.parametrize("effect", [e for e in MOTION_EFFECTS if not e.is_static], ids=lambda e: e.name)
+def test_windows_stay_inside_image(effect):
+    exprs = [expr.format(zoom_speed=0.002, total_frames=150) for expr in (effect.z_expr, effect.x_expr, effect.y_expr)]
+    windows = compute_crop_windows(*exprs, total_frames=150)
+
+    assert len(windows) == 150
+    for x, y, w, h in windows:
+        assert 0 <= x <= 1 - w + 1e-9
+        assert 0 <= y <= 1 - h + 1e-9
+        assert w == pytest.approx(h)
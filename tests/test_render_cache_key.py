@@ -0,0 +1,70 @@
+"""Render cache keys: stable for identical renders, distinct otherwise."""
+
+from dataclasses import replace
+
+from src.modules.video_composer import VideoConfig
+
+
+def _job(composer, photos, music, **changes):
+    stories = [{"photo_path": str(photos[0]), "text": "Batumi"}]
+    job = composer._plan_story_series(stories, music, story_duration=6.0, seed="key")[0]
+    return replace(job, **changes)
+
+
+def test_key_is_stable_across_composers(make_composer, photos, music):
+    first = make_composer()
+    second = make_composer()
+    job = _job(first, photos, music)
+
+    key = first._render_cache_key(job, music)
+    assert key == first._render_cache_key(job, music)
+    assert key == second._render_cache_key(job, music)
+    # Output name and position in the series are not part of the render
+    moved = replace(job, index=5, output_path=job.output_path.with_name("other.mp4"))
+    assert first._render_cache_key(moved, music) == key
+
+
+def test_key_ignores_worker_settings(make_composer, photos, music):
+    base = make_composer(VideoConfig())
+    tuned = make_composer(VideoConfig(render_workers=4, niceness=10))
+    job = _job(base, photos, music)
+
+    assert base._render_cache_key(job, music) == tuned._render_cache_key(job, music)
+
+
+def test_key_changes_with_inputs(make_composer, photos, music):
+    composer = make_composer()
+    job = _job(composer, photos, music)
+    key = composer._render_cache_key(job, music)
+
+    variants = [
+        replace(job, text="Tbilisi"),
+        replace(job, photo_path=photos[1]),
+        replace(job, duration=job.duration + 0.5),
+        replace(job, music_offset=job.music_offset + 1.0),
+    ]
+    keys = {composer._render_cache_key(variant, music) for variant in variants}
+    assert key not in keys
+    assert len(keys) == len(variants)
+
+    other_config = make_composer(VideoConfig(crf=30))
+    assert other_config._render_cache_key(job, music) != key
+
+
+def test_key_follows_file_contents(make_composer, photos, music):
+    composer = make_composer()
+    job = _job(composer, photos, music)
+    key = composer._render_cache_key(job, music)
+
+    photos[0].write_bytes(b"edited photo")
+    assert composer._render_cache_key(job, music) != key
+
+
+def test_base_layer_ignores_text(make_composer, photos, music):
+    composer = make_composer()
+    job = _job(composer, photos, music)
+    retexted = replace(job, text="Tbilisi")
+
+    base = composer._render_cache_key(job, music, layer="base")
+    assert base == composer._render_cache_key(retexted, music, layer="base")
+    assert base != composer._render_cache_key(job, music)
@@ -0,0 +1,119 @@
+"""Render queue state machine: leases, retries with backoff, delivery."""
+
+import time
+
+import pytest
+
+from src.modules.render_queue import RenderQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return RenderQueue(tmp_path / "queue.db", lease_seconds=60, max_attempts=3, retry_delay=30)
+
+
+def test_job_lifecycle(queue):
+    job_id = queue.enqueue("series-1", {"stories": [1, 2]})
+    assert queue.get(job_id).status == "queued"
+
+    job = queue.claim("worker-a")
+    assert (job.id, job.status, job.attempts) == (job_id, "running", 1)
+    assert job.payload == {"stories": [1, 2]}
+    assert queue.claim("worker-b") is None  # Leased
+
+    assert queue.heartbeat(job_id, "worker-a")
+    assert not queue.heartbeat(job_id, "worker-b")
+    assert queue.complete(job_id, "worker-a", {"videos": ["a.mp4"]})
+
+    assert [j.id for j in queue.finished()] == [job_id]
+    assert queue.get(job_id).result == {"videos": ["a.mp4"]}
+
+    assert queue.start_delivery(job_id)
+    assert not queue.start_delivery(job_id)  # Taken once only
+    assert queue.finished() == []
+    queue.mark_delivered(job_id)
+
+    stats = queue.get_stats()
+    assert stats["delivered"] == 1
+    assert sum(stats.values()) == 1
+
+
+def test_claims_oldest_first(queue):
+    first = queue.enqueue("series-1", {})
+    second = queue.enqueue("series-2", {})
+    assert queue.claim("worker-a").id == first
+    assert queue.claim("worker-b").id == second
+
+
+def _available_at(queue, job_id):
+    with queue._connect() as conn:
+        return conn.execute("SELECT available_at FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+
+
+def test_failed_attempt_backs_off(queue):
+    job_id = queue.enqueue("series-1", {})
+    queue.claim("worker-a")
+
+    before = time.time()
+    queue.fail(job_id, "worker-a", "ffmpeg exited with 1")
+
+    job = queue.get(job_id)
+    assert (job.status, job.attempts, job.error) == ("queued", 1, "ffmpeg exited with 1")
+    assert queue.claim("worker-a") is None  # Still in its retry delay
+    assert before + 30 <= _available_at(queue, job_id) <= time.time() + 30
+
+    # Skip the delay: the next failure waits twice as long
+    with queue._transaction() as conn:
+        conn.execute("UPDATE jobs SET available_at = 0 WHERE id = ?", (job_id,))
+    assert queue.claim("worker-a").attempts == 2
+    before = time.time()
+    queue.fail(job_id, "worker-a", "again")
+    assert before + 60 <= _available_at(queue, job_id) <= time.time() + 60
+
+
+def test_attempts_run_out(tmp_path):
+    queue = RenderQueue(tmp_path / "queue.db", max_attempts=2, retry_delay=0)
+    job_id = queue.enqueue("series-1", {})
+
+    assert queue.claim("worker-a").attempts == 1
+    queue.fail(job_id, "worker-a", "first")
+    assert queue.claim("worker-a").attempts == 2
+    queue.fail(job_id, "worker-a", "second")
+
+    job = queue.get(job_id)
+    assert (job.status, job.error) == ("failed", "second")
+    assert queue.claim("worker-a") is None
+    assert [j.id for j in queue.finished()] == [job_id]
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = RenderQueue(tmp_path / "queue.db", lease_seconds=-1, max_attempts=3)
+    job_id = queue.enqueue("series-1", {})
+    queue.claim("worker-a")
+
+    # worker-a stopped renewing (crashed): the job goes to worker-b
+    job = queue.claim("worker-b")
+    assert (job.id, job.attempts) == (job_id, 2)
+
+    # The old worker can neither renew, finish nor fail it any more
+    assert not queue.heartbeat(job_id, "worker-a")
+    assert not queue.complete(job_id, "worker-a", {"videos": []})
+    queue.fail(job_id, "worker-a", "late failure")
+    assert queue.get(job_id).error is None
+
+
+def test_expired_last_attempt_fails(tmp_path):
+    queue = RenderQueue(tmp_path / "queue.db", lease_seconds=-1, max_attempts=1)
+    job_id = queue.enqueue("series-1", {})
+    queue.claim("worker-a")
+
+    assert queue.claim("worker-b") is None
+    job = queue.get(job_id)
+    assert (job.status, job.error) == ("failed", "lease expired")
+
+
+def test_stats_cover_every_status(queue):
+    queue.enqueue("series-1", {})
+    stats = queue.get_stats()
+    assert stats["queued"] == 1
+    assert set(stats) == {"queued", "running", "done", "failed", "delivering", "delivered"}
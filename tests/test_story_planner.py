@@ -0,0 +1,53 @@
+"""Series planning: per-story seeding and music offsets."""
+
+import pytest
+
+
+def _stories(photos):
+    return [{"photo_path": str(path), "text": f"Story {i}"} for i, path in enumerate(photos)]
+
+
+def test_music_offsets_are_contiguous(make_composer, photos, music):
+    composer = make_composer(music_duration=120.0)
+    jobs = composer._plan_story_series(_stories(photos), music, seed="series-1")
+
+    assert [job.index for job in jobs] == [0, 1, 2]
+    offset = 0.0
+    for job in jobs:
+        assert 5.0 <= job.duration <= 8.0
+        assert job.music_offset == pytest.approx(offset)
+        offset += job.duration
+
+
+def test_seeded_plan_is_reproducible(make_composer, photos, music):
+    composer = make_composer()
+    first = composer._plan_story_series(_stories(photos), music, seed="series-1")
+    second = composer._plan_story_series(_stories(photos), music, seed="series-1")
+
+    assert [job.duration for job in first] == [job.duration for job in second]
+    assert [job.effect.name for job in first] == [job.effect.name for job in second]
+    assert [job.text_config for job in first] == [job.text_config for job in second]
+    # Output files are new per run, so a re-plan never overwrites a render
+    assert first[0].output_path != second[0].output_path
+
+
+def test_seed_is_per_photo(make_composer, photos, music):
+    composer = make_composer()
+    full = composer._plan_story_series(_stories(photos), music, seed="series-1")
+    # Deleting the first story keeps the choices of the others
+    rest = composer._plan_story_series(_stories(photos)[1:], music, seed="series-1")
+
+    assert [job.duration for job in rest] == [job.duration for job in full[1:]]
+    assert [job.text_config for job in rest] == [job.text_config for job in full[1:]]
+    assert rest[0].music_offset == 0.0
+    assert rest[1].music_offset == pytest.approx(rest[0].duration)
+
+
+def test_fixed_duration_and_music_wrap(make_composer, photos, music):
+    composer = make_composer(music_duration=10.0)
+    jobs = composer._plan_story_series(_stories(photos), music, story_duration=6.0)
+
+    assert [job.duration for job in jobs] == [6.0, 6.0, 6.0]
+    # Offsets past the end of the track loop back to its start
+    assert [job.music_offset for job in jobs] == pytest.approx([0.0, 6.0, 2.0])
+    assert all(job.music_offset < 10.0 for job in jobs)